@@ -50,4 +50,23 @@ curl -fsS -X POST \
 }
 JSON
 
+# Autocomplete suggestions (completion suggester), fed by the indexer worker.
+SUGGEST_TEMPLATE_NAME="narralytica-suggest-v1"
+SUGGEST_INDEX_NAME="${OPENSEARCH_SUGGEST_INDEX:-narralytica-suggest-v1}"
+SUGGEST_TEMPLATE_FILE="infra/opensearch/templates/narralytica-suggest-v1.template.json"
+
+echo "[opensearch] install template: ${SUGGEST_TEMPLATE_NAME}"
+curl -fsS -X PUT \
+  "${OPENSEARCH_URL}/_index_template/${SUGGEST_TEMPLATE_NAME}" \
+  -H "Content-Type: application/json" \
+  --data-binary @"${SUGGEST_TEMPLATE_FILE}" \
+  >/dev/null
+
+if curl -sS -o /dev/null -w "%{http_code}" "${OPENSEARCH_URL}/${SUGGEST_INDEX_NAME}" | grep -q "^200$"; then
+  echo "[opensearch] index exists: ${SUGGEST_INDEX_NAME}"
+else
+  echo "[opensearch] create index: ${SUGGEST_INDEX_NAME}"
+  curl -fsS -X PUT "${OPENSEARCH_URL}/${SUGGEST_INDEX_NAME}" >/dev/null
+fi
+
 echo "[opensearch] done ✅"
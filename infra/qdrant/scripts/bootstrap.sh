@@ -5,6 +5,8 @@ QDRANT_URL="${QDRANT_URL:-http://localhost:6333}"
 
 COLLECTION="narralytica-segments-v1"
 COLLECTION_FILE="infra/qdrant/collections/${COLLECTION}.collection.json"
+# Stable name pointing at the live collection; moved by scripts/promote.sh.
+ALIAS="${QDRANT_SEGMENTS_ALIAS:-narralytica-segments}"
 
 echo "[qdrant] url=${QDRANT_URL}"
 
@@ -30,4 +32,15 @@ fi
 
 echo "[qdrant] verify collection..."
 curl -fsS "${QDRANT_URL}/collections/${COLLECTION}" >/dev/null
+if curl -fsS "${QDRANT_URL}/aliases" | grep -q "\"alias_name\":\"${ALIAS}\""; then
+  echo "[qdrant] alias exists: ${ALIAS}"
+else
+  echo "[qdrant] create alias: ${ALIAS} -> ${COLLECTION}"
+  curl -fsS -X POST \
+    "${QDRANT_URL}/collections/aliases" \
+    -H "Content-Type: application/json" \
+    --data "{\"actions\":[{\"create_alias\":{\"collection_name\":\"${COLLECTION}\",\"alias_name\":\"${ALIAS}\"}}]}" \
+    >/dev/null
+fi
+
 echo "[qdrant] done ✅"
@@ -0,0 +1,22 @@
+#!/usr/bin/env bash
+set -euo pipefail
+
+# Point the segments alias at another collection (embedding-model upgrade).
+# Delete + create run in one actions call, so Qdrant swaps them atomically.
+#
+#   bash infra/qdrant/scripts/promote.sh narralytica-segments-v2
+
+QDRANT_URL="${QDRANT_URL:-http://localhost:6333}"
+ALIAS="${QDRANT_SEGMENTS_ALIAS:-narralytica-segments}"
+COLLECTION="${1:?usage: promote.sh <collection>}"
+
+curl -fsS "${QDRANT_URL}/collections/${COLLECTION}" >/dev/null
+
+echo "[qdrant] alias ${ALIAS} -> ${COLLECTION}"
+curl -fsS -X POST \
+  "${QDRANT_URL}/collections/aliases" \
+  -H "Content-Type: application/json" \
+  --data "{\"actions\":[{\"delete_alias\":{\"alias_name\":\"${ALIAS}\"}},{\"create_alias\":{\"collection_name\":\"${COLLECTION}\",\"alias_name\":\"${ALIAS}\"}}]}" \
+  >/dev/null
+
+echo "[qdrant] done ✅"
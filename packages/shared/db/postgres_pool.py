@@ -0,0 +1,175 @@
+"""
+Process-wide psycopg connection pools (sync and async), one per DSN.
+
+Used by the API's psycopg repositories and by the workers, so a statement
+borrows an open connection instead of paying connection setup (TCP, TLS,
+auth, pgbouncer slot) every time.
+
+    with get_pool(dsn).connection() as conn:   # commit on success, else rollback
+        conn.execute(...)
+
+    async with (await get_async_pool(dsn)).connection() as conn:
+        await conn.execute(...)
+
+Sizing and lifetimes come from DB_POOL_* environment variables (see
+PoolConfig.from_env); every service reads the same names.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import os
+import threading
+import weakref
+from dataclasses import dataclass
+
+from psycopg_pool import AsyncConnectionPool, ConnectionPool
+
+
+def _env_float(name: str, default: float) -> float:
+    raw = (os.environ.get(name) or "").strip()
+    if not raw:
+        return default
+    try:
+        return float(raw)
+    except ValueError:
+        return default
+
+
+def _env_bool(name: str, default: bool) -> bool:
+    raw = (os.environ.get(name) or "").strip().lower()
+    if not raw:
+        return default
+    return raw in ("1", "true", "yes", "on")
+
+
+def normalize_dsn(url: str) -> str:
+    """SQLAlchemy-style URLs (postgresql+psycopg://) -> libpq DSN."""
+    if url.startswith("postgresql+psycopg://"):
+        return "postgresql://" + url[len("postgresql+psycopg://") :]
+    return url
+
+
+@dataclass(frozen=True)
+class PoolConfig:
+    min_size: int = 1
+    max_size: int = 10
+    # Seconds a caller waits for a free connection before PoolTimeout.
+    timeout_s: float = 10.0
+    # Connections are replaced after this long (server-side memory, DNS and
+    # pgbouncer rebalancing) and closed after idling this long above min_size.
+    max_lifetime_s: float = 1800.0
+    max_idle_s: float = 300.0
+    # Round-trip check on every checkout. Off by default: broken connections
+    # are already discarded when returned, so this only helps after long
+    # idle periods behind aggressive proxies.
+    check_on_checkout: bool = False
+    # libpq `options` for every connection, e.g. "-c statement_timeout=5000".
+    options: str | None = None
+
+    def connect_kwargs(self) -> dict:
+        return {"options": self.options} if self.options else {}
+
+    @classmethod
+    def from_env(cls) -> PoolConfig:
+        d = cls()
+        min_size = int(_env_float("DB_POOL_MIN_SIZE", d.min_size))
+        return cls(
+            min_size=max(0, min_size),
+            max_size=max(1, min_size, int(_env_float("DB_POOL_MAX_SIZE", d.max_size))),
+            timeout_s=_env_float("DB_POOL_TIMEOUT_S", d.timeout_s),
+            max_lifetime_s=_env_float("DB_POOL_MAX_LIFETIME_S", d.max_lifetime_s),
+            max_idle_s=_env_float("DB_POOL_MAX_IDLE_S", d.max_idle_s),
+            check_on_checkout=_env_bool("DB_POOL_CHECK", d.check_on_checkout),
+        )
+
+
+_pools: dict[str, ConnectionPool] = {}
+_async_pools: weakref.WeakKeyDictionary[
+    asyncio.AbstractEventLoop, dict[str, AsyncConnectionPool]
+] = weakref.WeakKeyDictionary()
+_lock = threading.Lock()
+
+
+def get_pool(dsn: str, config: PoolConfig | None = None) -> ConnectionPool:
+    """Shared sync pool for `dsn` (created and opened on first use)."""
+    dsn = normalize_dsn(dsn)
+    pool = _pools.get(dsn)
+    if pool is not None:
+        return pool
+    with _lock:
+        pool = _pools.get(dsn)
+        if pool is None:
+            cfg = config or PoolConfig.from_env()
+            pool = ConnectionPool(
+                dsn,
+                min_size=cfg.min_size,
+                max_size=cfg.max_size,
+                timeout=cfg.timeout_s,
+                max_lifetime=cfg.max_lifetime_s,
+                max_idle=cfg.max_idle_s,
+                check=ConnectionPool.check_connection
+                if cfg.check_on_checkout
+                else None,
+                name=f"narralytica-{len(_pools)}",
+                kwargs=cfg.connect_kwargs(),
+                open=False,
+            )
+            # wait=False: the first statement does not wait for min_size
+            # connections; a down database surfaces on use, not at import.
+            pool.open(wait=False)
+            _pools[dsn] = pool
+        return pool
+
+
+async def get_async_pool(
+    dsn: str, config: PoolConfig | None = None
+) -> AsyncConnectionPool:
+    """
+    Shared async pool for `dsn` on the running event loop (async pools and
+    their connections belong to one loop).
+    """
+    dsn = normalize_dsn(dsn)
+    loop = asyncio.get_running_loop()
+    with _lock:
+        pool = _async_pools.setdefault(loop, {}).get(dsn)
+    if pool is not None:
+        return pool
+
+    cfg = config or PoolConfig.from_env()
+    pool = AsyncConnectionPool(
+        dsn,
+        min_size=cfg.min_size,
+        max_size=cfg.max_size,
+        timeout=cfg.timeout_s,
+        max_lifetime=cfg.max_lifetime_s,
+        max_idle=cfg.max_idle_s,
+        check=AsyncConnectionPool.check_connection if cfg.check_on_checkout else None,
+        kwargs=cfg.connect_kwargs(),
+        open=False,
+    )
+    await pool.open(wait=False)
+    # Only publish opened pools; a concurrent first use may have won the race.
+    with _lock:
+        winner = _async_pools.setdefault(loop, {}).setdefault(dsn, pool)
+    if winner is not pool:
+        await pool.close()
+    return winner
+
+
+def close_pools() -> None:
+    """Close the sync pools (process shutdown, tests)."""
+    with _lock:
+        pools = list(_pools.values())
+        _pools.clear()
+    for pool in pools:
+        pool.close()
+
+
+async def close_async_pools() -> None:
+    """Close the async pools of the running loop."""
+    loop = asyncio.get_running_loop()
+    with _lock:
+        pools = list(_async_pools.pop(loop, {}).values())
+    for pool in pools:
+        await pool.close()
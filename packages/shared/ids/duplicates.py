@@ -0,0 +1,146 @@
+"""
+Duplicate-transcript lookup over the MinHash LSH band keys stored on segment
+docs (`minhash_bands`, `minhash`; see minhash.py).
+
+Meant to run before expensive per-transcript work (embeddings, enrichment):
+a re-upload of already indexed speech is found with one candidate query plus
+one fetch per candidate transcript, and its artifacts can be reused instead.
+
+Backend-agnostic: `search` is any callable that runs an OpenSearch `_search`
+body against the segments index and returns the response JSON.
+"""
+
+from __future__ import annotations
+
+from collections import Counter
+from collections.abc import Callable
+from dataclasses import dataclass
+from typing import Any
+
+from .minhash import estimate_jaccard, lsh_band_keys, minhash_signature, words
+
+SearchFn = Callable[[dict[str, Any]], dict[str, Any]]
+
+MIN_WORDS = 8
+MAX_PROBE_SEGMENTS = 200
+MAX_CANDIDATES = 5
+MAX_CANDIDATE_SEGMENTS = 10000
+SEGMENT_THRESHOLD = 0.8
+TRANSCRIPT_COVERAGE = 0.8
+
+
+@dataclass(frozen=True)
+class DuplicateTranscript:
+    transcript_id: str
+    video_id: str | None
+    # Share of the probed segments with a near-identical segment in it.
+    coverage: float
+
+
+class MinHashLSH:
+    """In-memory LSH index: band key -> signatures, for candidate verification."""
+
+    def __init__(self) -> None:
+        self._buckets: dict[str, list[list[int]]] = {}
+
+    def add(self, signature: list[int]) -> None:
+        for key in lsh_band_keys(signature):
+            self._buckets.setdefault(key, []).append(signature)
+
+    def best_match(self, signature: list[int]) -> float:
+        """Highest estimated Jaccard among signatures sharing a band."""
+        best = 0.0
+        for key in lsh_band_keys(signature):
+            for other in self._buckets.get(key, ()):
+                best = max(best, estimate_jaccard(signature, other))
+        return best
+
+
+def _probe_signatures(texts: list[str]) -> list[list[int]]:
+    """
+    Signatures of an evenly spaced sample of the transcript's segments. Very
+    short segments ("yeah", "thank you") match everywhere and are skipped.
+    """
+    usable = [t for t in texts if len(words(t)) >= MIN_WORDS]
+    if len(usable) > MAX_PROBE_SEGMENTS:
+        step = len(usable) / MAX_PROBE_SEGMENTS
+        usable = [usable[int(i * step)] for i in range(MAX_PROBE_SEGMENTS)]
+    return [s for s in map(minhash_signature, usable) if s]
+
+
+def find_duplicate_transcripts(
+    texts: list[str],
+    search: SearchFn,
+    *,
+    exclude_transcript_id: str | None = None,
+    coverage: float = TRANSCRIPT_COVERAGE,
+    threshold: float = SEGMENT_THRESHOLD,
+) -> list[DuplicateTranscript]:
+    """
+    Indexed transcripts that contain (near-)identical copies of at least
+    `coverage` of the given transcript's segments, best first.
+    """
+    probes = _probe_signatures(texts)
+    if not probes:
+        return []
+
+    keys = sorted({k for sig in probes for k in lsh_band_keys(sig)})
+    must_not = (
+        [{"term": {"transcript_id": exclude_transcript_id}}]
+        if exclude_transcript_id
+        else []
+    )
+    data = search(
+        {
+            "size": 0,
+            "query": {
+                "bool": {
+                    "filter": [{"terms": {"minhash_bands": keys}}],
+                    "must_not": must_not,
+                }
+            },
+            "aggs": {
+                "transcripts": {
+                    "terms": {"field": "transcript_id", "size": MAX_CANDIDATES}
+                }
+            },
+        }
+    )
+    buckets = ((data.get("aggregations") or {}).get("transcripts") or {}).get(
+        "buckets"
+    ) or []
+    # A transcript with fewer band-matching segments than `coverage` needs
+    # cannot qualify; skip fetching it.
+    candidates = [
+        str(b["key"])
+        for b in buckets
+        if b.get("key") and int(b.get("doc_count") or 0) >= coverage * len(probes)
+    ]
+
+    out: list[DuplicateTranscript] = []
+    for tid in candidates:
+        data = search(
+            {
+                "size": MAX_CANDIDATE_SEGMENTS,
+                "_source": ["minhash", "video_id"],
+                "query": {"bool": {"filter": [{"term": {"transcript_id": tid}}]}},
+            }
+        )
+        lsh = MinHashLSH()
+        video_ids: Counter[str] = Counter()
+        for h in (data.get("hits") or {}).get("hits") or []:
+            src = h.get("_source") or {}
+            sig = src.get("minhash")
+            if isinstance(sig, list) and sig:
+                lsh.add([int(v) for v in sig])
+            if src.get("video_id"):
+                video_ids[str(src["video_id"])] += 1
+
+        matched = sum(lsh.best_match(sig) >= threshold for sig in probes)
+        share = matched / len(probes)
+        if share >= coverage:
+            video_id = video_ids.most_common(1)[0][0] if video_ids else None
+            out.append(DuplicateTranscript(tid, video_id, round(share, 4)))
+
+    out.sort(key=lambda d: (-d.coverage, d.transcript_id))
+    return out
@@ -0,0 +1,93 @@
+"""
+MinHash signatures and LSH band keys for near-duplicate text.
+
+Stable across processes and services (salted blake2b, no process-seeded
+hashing): signatures written by the indexer can be compared with ones
+computed later by any other worker.
+"""
+
+from __future__ import annotations
+
+import string
+import struct
+from collections.abc import Iterable
+from hashlib import blake2b
+
+NUM_PERM = 64
+BANDS = 16
+ROWS = NUM_PERM // BANDS
+SHINGLE_WORDS = 3
+
+# Each salted 64-byte blake2b digest yields 16 independent 32-bit hash values,
+# so 4 digests per shingle give all NUM_PERM hash functions.
+_VALUES_PER_DIGEST = 16
+_SALTS = [f"nrl-minhash-{i}".encode() for i in range(NUM_PERM // _VALUES_PER_DIGEST)]
+_UNPACK = struct.Struct(f">{_VALUES_PER_DIGEST}I").unpack
+
+# Punctuation -> space, then str.split: several times faster than a \w+
+# regex. The API's search-time dedup (services/api/src/search/hybrid/dedup.py)
+# shingles through the same functions, so both always agree on what a
+# shingle is.
+_PUNCT = str.maketrans(dict.fromkeys(string.punctuation + "‘’“”«»…–—¿¡", " "))
+
+
+def words(text: str) -> list[str]:
+    return (text or "").casefold().translate(_PUNCT).split()
+
+
+def word_shingles(text: str) -> Iterable[tuple[str, ...]]:
+    """
+    3-word shingles of `text` as word tuples (casefolded, punctuation
+    ignored); shorter texts are a single shingle. May repeat shingles.
+    """
+    w = words(text)
+    if len(w) < SHINGLE_WORDS:
+        return [tuple(w)] if w else []
+    return zip(*(w[i:] for i in range(SHINGLE_WORDS)), strict=False)
+
+
+def shingles(text: str) -> set[bytes]:
+    """Distinct shingles of `text`, encoded for stable hashing."""
+    return {" ".join(g).encode("utf-8") for g in word_shingles(text)}
+
+
+def _hash_values(shingle: bytes) -> tuple[int, ...]:
+    out: tuple[int, ...] = ()
+    for salt in _SALTS:
+        out += _UNPACK(blake2b(shingle, digest_size=64, salt=salt).digest())
+    return out
+
+
+def minhash_signature(text: str) -> list[int] | None:
+    """
+    NUM_PERM 32-bit MinHash values of the shingle set, or None for empty text.
+    The fraction of equal positions between two signatures estimates the
+    Jaccard similarity of the shingle sets.
+    """
+    sh = shingles(text)
+    if not sh:
+        return None
+    # Column-wise min over all shingles' hash values, in C.
+    return list(map(min, zip(*map(_hash_values, sh), strict=True)))
+
+
+def lsh_band_keys(signature: list[int]) -> list[str]:
+    """
+    One key per band of ROWS signature values ("<band>:<hex>"). Two segments
+    share at least one key with probability 1 - (1 - J^ROWS)^BANDS: ~1.0 at
+    Jaccard 0.8, ~0.12 at 0.3.
+    """
+    out: list[str] = []
+    for b in range(BANDS):
+        rows = signature[b * ROWS : (b + 1) * ROWS]
+        digest = blake2b(
+            b"".join(v.to_bytes(4, "big") for v in rows), digest_size=8
+        ).hexdigest()
+        out.append(f"{b:02d}:{digest}")
+    return out
+
+
+def estimate_jaccard(a: list[int], b: list[int]) -> float:
+    if not a or len(a) != len(b):
+        return 0.0
+    return sum(x == y for x, y in zip(a, b, strict=True)) / len(a)
@@ -0,0 +1,22 @@
+"""api key rate limit tier
+
+Revision ID: 0003_api_key_rate_limit_tier
+Revises: 0002_api_keys
+Create Date: 2026-10-19
+"""
+
+import sqlalchemy as sa
+from alembic import op
+
+revision = "0003_api_key_rate_limit_tier"
+down_revision = "0002_api_keys"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column("api_keys", sa.Column("rate_limit_tier", sa.String(), nullable=True))
+
+
+def downgrade() -> None:
+    op.drop_column("api_keys", "rate_limit_tier")
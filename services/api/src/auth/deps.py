@@ -1,27 +1,18 @@
 from __future__ import annotations
 
-from datetime import UTC, datetime
-
 from fastapi import Depends
 from fastapi.security import HTTPAuthorizationCredentials, HTTPBearer
-from sqlalchemy import select, update
-from sqlalchemy.engine import Connection
 
 from ..config import settings
-from ..db.engine import get_conn
-from ..db.schema import api_keys
+from ..db.aio import read_conn
 from .api_keys import hash_api_key
 from .errors import forbidden, unauthorized
+from .key_cache import VerifiedKey, get_api_key_cache, get_last_used_writer
 
 bearer_scheme = HTTPBearer(auto_error=False)
 
 # Ruff (B008) compliance: avoid calling Depends(...) in function defaults
 CREDS_DEP = Depends(bearer_scheme)
-CONN_DEP = Depends(get_conn)
-
-
-def _now_utc() -> datetime:
-    return datetime.now(UTC)
 
 
 def _extract_bearer_token(creds: HTTPAuthorizationCredentials | None) -> str:
@@ -35,10 +26,37 @@ def _extract_bearer_token(creds: HTTPAuthorizationCredentials | None) -> str:
     return token
 
 
-def require_api_key(
+_LOAD_KEY_SQL = """
+    SELECT id, name, status, scopes, rate_limit_tier
+    FROM api_keys
+    WHERE key_hash = %s
+"""
+
+
+async def load_active_key(key_hash: str) -> VerifiedKey | None:
+    async with read_conn() as conn, conn.cursor() as cur:
+        await cur.execute(_LOAD_KEY_SQL, (key_hash,))
+        row = await cur.fetchone()
+    if not row:
+        return None
+    key_id, name, status, scopes, rate_limit_tier = row
+    if status != "active":
+        return None
+    return VerifiedKey(
+        id=key_id, name=name, scopes=scopes, rate_limit_tier=rate_limit_tier
+    )
+
+
+async def require_api_key(
     creds: HTTPAuthorizationCredentials | None = CREDS_DEP,
-    conn: Connection = CONN_DEP,
 ) -> dict:
+    """
+    Verify the bearer API key.
+
+    Cache hits (see key_cache.py) touch neither the database nor a pooled
+    connection; misses are one read-only query on the async pool.
+    `last_used_at` is written behind in batches.
+    """
     token = _extract_bearer_token(creds)
 
     pepper = settings.api_key_pepper
@@ -47,35 +65,21 @@ def require_api_key(
 
     key_hash = hash_api_key(token, pepper)
 
-    row = (
-        conn.execute(select(api_keys).where(api_keys.c.key_hash == key_hash))
-        .mappings()
-        .first()
-    )
-
-    if not row:
-        raise forbidden("Invalid or revoked API key")
-
-    if row["status"] != "active":
-        raise forbidden("Invalid or revoked API key")
-
-    # best-effort update
-    try:
-        conn.execute(
-            update(api_keys)
-            .where(api_keys.c.id == row["id"])
-            .values(last_used_at=_now_utc())
-        )
-    except Exception:
-        pass
-
-    from ..middleware.rate_limit import enforce_rate_limit
+    cache = get_api_key_cache()
+    key = await cache.get(key_hash)
+    if key is None:
+        key = await load_active_key(key_hash)
+        if key is None:
+            raise forbidden("Invalid or revoked API key")
+        cache.set(key_hash, key)
 
-    rl_headers = enforce_rate_limit(row["id"])
+    get_last_used_writer().touch(key.id)
 
+    # Per-key limits (rate_limit_tier) are enforced by RateLimitMiddleware,
+    # which reads the tier from the key cache (and loads it on a miss).
     return {
-        "api_key_id": row["id"],
-        "name": row["name"],
-        "scopes": row.get("scopes"),
-        "rate_limit_headers": rl_headers,
+        "api_key_id": key.id,
+        "name": key.name,
+        "scopes": key.scopes,
+        "rate_limit_tier": key.rate_limit_tier,
     }
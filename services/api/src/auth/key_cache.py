@@ -0,0 +1,294 @@
+from __future__ import annotations
+
+import asyncio
+import threading
+import time
+from collections.abc import Callable
+from dataclasses import dataclass
+from datetime import UTC, datetime
+from typing import Any
+
+from prometheus_client import Counter
+from sqlalchemy import bindparam, update
+from sqlalchemy.engine import Engine
+
+from ..config import settings
+from ..db.schema import api_keys
+from ..services.redis_client import get_async_redis, redis_available
+from ..services.ttl_cache import TTLCache
+
+REVOCATION_VERSION_KEY = "api_keys:version"
+
+API_KEY_CACHE_EVENTS = Counter(
+    "narralytica_api_key_cache_total",
+    "API key verification cache lookups by result (hit, miss, invalidated)",
+    ["result"],
+)
+
+
+@dataclass(frozen=True)
+class VerifiedKey:
+    id: str
+    name: str
+    scopes: Any = None
+    rate_limit_tier: str | None = None
+
+
+class RevocationVersion:
+    """
+    Cluster-wide revocation counter (a Redis integer).
+
+    Whoever revokes or deletes a key calls `bump()`; every API process polls
+    the counter at most every `check_interval_s` and drops its verified-key
+    cache when it moved. Without Redis the counter is process-local, so only
+    the TTL bounds how long another process keeps accepting a revoked key.
+
+    Nothing in this repo revokes or deletes api_keys rows yet (keys are
+    managed with SQL). Until it does, whoever changes a row must also bump
+    the counter (`ApiKeyCache.invalidate(key_hash)` from Python, or
+    `INCR api_keys:version` in Redis); otherwise the key keeps working for
+    up to API_KEY_CACHE_TTL_S.
+
+    Reads go through the shared asyncio client (services/redis_client.py),
+    so a slow Redis delays only the request doing the check, never the loop.
+    """
+
+    def __init__(
+        self,
+        redis_url: str | None,
+        *,
+        check_interval_s: float,
+        clock: Callable[[], float] = time.monotonic,
+        timeout_s: float = 0.25,
+        client: Any = None,
+    ) -> None:
+        self.check_interval_s = float(check_interval_s)
+        self.timeout_s = float(timeout_s)
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._local = 0
+        self._seen: int | None = None
+        self._checked_at = float("-inf")
+        self._redis_url = redis_url if redis_available() else None
+        # Injected client (tests); otherwise the per-loop pooled client.
+        self._client = client
+
+    def _redis(self) -> Any:
+        if self._client is not None:
+            return self._client
+        if self._redis_url:
+            return get_async_redis(self._redis_url)
+        return None
+
+    async def _read(self) -> int | None:
+        r = self._redis()
+        if r is None:
+            return self._local
+        try:
+            raw = await asyncio.wait_for(
+                r.get(REVOCATION_VERSION_KEY), timeout=self.timeout_s
+            )
+            return int(raw or 0)
+        except Exception:
+            # Redis unreachable: keep the current cache (TTL still applies).
+            return None
+
+    async def bump(self) -> None:
+        with self._lock:
+            self._local += 1
+        r = self._redis()
+        if r is not None:
+            try:
+                await asyncio.wait_for(
+                    r.incr(REVOCATION_VERSION_KEY), timeout=self.timeout_s
+                )
+            except Exception:
+                pass
+
+    async def changed(self) -> bool:
+        """True once per observed change of the counter (rate-limited reads)."""
+        now = self._clock()
+        with self._lock:
+            if now - self._checked_at < self.check_interval_s:
+                return False
+            self._checked_at = now
+        current = await self._read()
+        if current is None:
+            return False
+        with self._lock:
+            moved = self._seen is not None and current != self._seen
+            self._seen = current
+        return moved
+
+
+class ApiKeyCache:
+    """
+    Verified API keys by key hash, so an authenticated request normally costs
+    a dict lookup instead of a SELECT.
+
+    Only active keys are cached. A revoked key stops working after at most
+    `ttl_s`, or after the revocation check interval when revocations go
+    through `RevocationVersion.bump()`.
+
+    The rate-limit tier of each cached key is also kept in a separate map
+    for `tier_ttl_s`, which revocation clears leave alone: the limiter runs
+    before require_api_key, so it must know a key's tier even when the
+    verified entry is gone. Tiers only pick a limit, never grant access.
+    """
+
+    def __init__(
+        self,
+        *,
+        ttl_s: float,
+        max_entries: int,
+        revocations: RevocationVersion,
+        tier_ttl_s: float = 3600,
+    ) -> None:
+        self.revocations = revocations
+        self._cache: TTLCache[str, VerifiedKey] = TTLCache(
+            max_entries=max_entries, ttl_s=ttl_s
+        )
+        self._tiers: TTLCache[str, str] = TTLCache(
+            max_entries=max_entries, ttl_s=tier_ttl_s
+        )
+
+    async def get(self, key_hash: str) -> VerifiedKey | None:
+        if await self.revocations.changed():
+            self._cache.clear()
+            API_KEY_CACHE_EVENTS.labels(result="invalidated").inc()
+        hit = self._cache.get(key_hash)
+        API_KEY_CACHE_EVENTS.labels(result="hit" if hit else "miss").inc()
+        return hit
+
+    def peek(self, key_hash: str) -> VerifiedKey | None:
+        """Cache-only read (no revocation check, no metrics)."""
+        return self._cache.get(key_hash)
+
+    def peek_tier(self, key_hash: str) -> str | None:
+        """Known tier of a key ("" = no tier), or None if not seen lately."""
+        key = self._cache.get(key_hash)
+        if key is not None:
+            return key.rate_limit_tier or ""
+        return self._tiers.get(key_hash)
+
+    def set(self, key_hash: str, key: VerifiedKey) -> None:
+        self._cache.set(key_hash, key)
+        self._tiers.set(key_hash, key.rate_limit_tier or "")
+
+    async def invalidate(self, key_hash: str | None = None) -> None:
+        """Drop one key (or all) here and tell the other processes."""
+        if key_hash is None:
+            self._cache.clear()
+        else:
+            self._cache.pop(key_hash)
+        await self.revocations.bump()
+
+
+class LastUsedWriter:
+    """
+    Write-behind for `api_keys.last_used_at`.
+
+    Requests only record "key X used now" in memory; a daemon thread writes
+    the latest timestamp per key every `flush_interval_s` in one executemany
+    UPDATE. The column is informational, so a crash may lose the last few
+    seconds of it.
+    """
+
+    def __init__(
+        self,
+        engine_factory: Callable[[], Engine],
+        *,
+        flush_interval_s: float,
+    ) -> None:
+        self.flush_interval_s = float(flush_interval_s)
+        self._engine_factory = engine_factory
+        self._lock = threading.Lock()
+        self._pending: dict[str, datetime] = {}
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+
+    def touch(self, key_id: str) -> None:
+        with self._lock:
+            self._pending[key_id] = datetime.now(UTC)
+            if self._thread is None:
+                self._thread = threading.Thread(
+                    target=self._loop, name="api-key-last-used", daemon=True
+                )
+                self._thread.start()
+
+    def flush(self) -> int:
+        with self._lock:
+            pending, self._pending = self._pending, {}
+        if not pending:
+            return 0
+        stmt = (
+            update(api_keys)
+            .where(api_keys.c.id == bindparam("key_id"))
+            .values(last_used_at=bindparam("used_at"))
+        )
+        rows = [{"key_id": k, "used_at": v} for k, v in pending.items()]
+        try:
+            with self._engine_factory().begin() as conn:
+                conn.execute(stmt, rows)
+        except Exception:
+            # best-effort, as before: keep the newest timestamps for next time
+            with self._lock:
+                for k, v in pending.items():
+                    if k not in self._pending or self._pending[k] < v:
+                        self._pending[k] = v
+            return 0
+        return len(rows)
+
+    def _loop(self) -> None:
+        while not self._stop.wait(self.flush_interval_s):
+            self.flush()
+
+    def stop(self) -> None:
+        self._stop.set()
+        self.flush()
+
+
+_cache: ApiKeyCache | None = None
+_writer: LastUsedWriter | None = None
+_lock = threading.Lock()
+
+
+def get_api_key_cache() -> ApiKeyCache:
+    global _cache
+    if _cache is not None:
+        return _cache
+    with _lock:
+        if _cache is None:
+            _cache = ApiKeyCache(
+                ttl_s=settings.api_key_cache_ttl_s,
+                max_entries=settings.api_key_cache_max_entries,
+                revocations=RevocationVersion(
+                    settings.redis_url,
+                    check_interval_s=settings.api_key_revocation_check_s,
+                ),
+                tier_ttl_s=settings.api_key_tier_cache_ttl_s,
+            )
+        return _cache
+
+
+def get_last_used_writer() -> LastUsedWriter:
+    global _writer
+    if _writer is not None:
+        return _writer
+    with _lock:
+        if _writer is None:
+            from ..db.engine import get_engine
+
+            _writer = LastUsedWriter(
+                get_engine, flush_interval_s=settings.api_key_last_used_flush_s
+            )
+        return _writer
+
+
+def reset_api_key_state() -> None:
+    """Flush pending writes and drop the cache/writer (shutdown, tests)."""
+    global _cache, _writer
+    with _lock:
+        writer, _writer, _cache = _writer, None, None
+    if writer is not None:
+        writer.stop()
@@ -21,6 +21,16 @@ def _env_int(name: str, default: int) -> int:
         return default
 
 
+def _env_float(name: str, default: float) -> float:
+    v = os.environ.get(name)
+    if v is None:
+        return default
+    try:
+        return float(v)
+    except Exception:
+        return default
+
+
 @dataclass(frozen=True)
 class Settings:
     """
@@ -42,6 +52,21 @@ class Settings:
     # ----------------------------
     database_url: str | None = os.environ.get("DATABASE_URL") or None
     api_database_url: str | None = os.environ.get("API_DATABASE_URL") or None
+    # SQLAlchemy engine pool (per API process): pool_size kept open, up to
+    # max_overflow more under load, callers wait pool_timeout for a slot.
+    # Connections older than recycle_s are replaced on checkout.
+    db_pool_size: int = _env_int("DB_ENGINE_POOL_SIZE", 5)
+    db_max_overflow: int = _env_int("DB_ENGINE_MAX_OVERFLOW", 10)
+    db_pool_timeout_s: float = _env_float("DB_ENGINE_POOL_TIMEOUT_S", 10.0)
+    db_pool_recycle_s: int = _env_int("DB_ENGINE_POOL_RECYCLE_S", 1800)
+    # Ping on every checkout (one extra round-trip). Off: stale connections
+    # are dropped on the first disconnect error (the pool is invalidated).
+    db_pool_pre_ping: bool = _env_bool("DB_ENGINE_PRE_PING", False)
+    # statement_timeout for API sessions; 0 = server default.
+    db_statement_timeout_ms: int = _env_int("DB_STATEMENT_TIMEOUT_MS", 0)
+    # SET LOCAL statement_timeout for the heavy list reads (COUNT + OFFSET
+    # pages of segments/speakers); 0 = use the session setting above.
+    db_read_statement_timeout_ms: int = _env_int("DB_READ_STATEMENT_TIMEOUT_MS", 0)
 
     # ----------------------------
     # OpenSearch
@@ -56,6 +81,22 @@ class Settings:
     # ----------------------------
     redis_url: str | None = os.environ.get("REDIS_URL") or None
 
+    # ----------------------------
+    # API keys
+    # ----------------------------
+    api_key_pepper: str | None = os.environ.get("API_KEY_PEPPER") or None
+    # Verified keys are cached in-process; revocations propagate through a
+    # Redis counter polled every API_KEY_REVOCATION_CHECK_S (TTL bounds it
+    # without Redis). last_used_at is written behind in batches.
+    api_key_cache_ttl_s: int = _env_int("API_KEY_CACHE_TTL_S", 60)
+    api_key_cache_max_entries: int = _env_int("API_KEY_CACHE_MAX_ENTRIES", 10000)
+    api_key_revocation_check_s: int = _env_int("API_KEY_REVOCATION_CHECK_S", 2)
+    # Rate-limit tier per key hash, kept after the verified entry expires or
+    # is dropped by a revocation so the limiter doesn't fall back to the
+    # default limit on every cache miss.
+    api_key_tier_cache_ttl_s: int = _env_int("API_KEY_TIER_CACHE_TTL_S", 3600)
+    api_key_last_used_flush_s: int = _env_int("API_KEY_LAST_USED_FLUSH_S", 5)
+
     # ----------------------------
     # Rate limit
     # ----------------------------
@@ -63,6 +104,37 @@ class Settings:
     rate_limit_limit: int = _env_int("RATE_LIMIT_LIMIT", 60)
     rate_limit_window_seconds: int = _env_int("RATE_LIMIT_WINDOW_SECONDS", 60)
     rate_limit_path_prefix: str = os.environ.get("RATE_LIMIT_PATH_PREFIX", "/api/")
+    # Per-key limits: api_keys.rate_limit_tier -> limit per window,
+    # e.g. "free:60,pro:600". Keys without a (known) tier get RATE_LIMIT_LIMIT.
+    rate_limit_tiers: str = os.environ.get("RATE_LIMIT_TIERS", "")
+    # Share of a key's remaining quota granted locally between Redis calls
+    # (0 = every request goes to Redis), and how long a Redis answer is reused.
+    rate_limit_local_share: float = _env_float("RATE_LIMIT_LOCAL_SHARE", 0.0)
+    rate_limit_local_sync_s: float = _env_float("RATE_LIMIT_LOCAL_SYNC_S", 1.0)
+    # Without Redis: most buckets (clients) tracked in memory per process.
+    rate_limit_memory_max_keys: int = _env_int("RATE_LIMIT_MEMORY_MAX_KEYS", 100000)
+    # Redis calls slower than this are answered by the local limiter, which
+    # then serves all checks for RATE_LIMIT_FALLBACK_COOLDOWN_S.
+    rate_limit_redis_timeout_ms: int = _env_int("RATE_LIMIT_REDIS_TIMEOUT_MS", 50)
+    rate_limit_fallback_cooldown_s: float = _env_float(
+        "RATE_LIMIT_FALLBACK_COOLDOWN_S", 5.0
+    )
+
+    # ----------------------------
+    # Search result hydration (video/speaker blocks)
+    # ----------------------------
+    search_lookup_cache_ttl_s: int = _env_int("SEARCH_LOOKUP_CACHE_TTL_S", 300)
+    search_lookup_cache_max_entries: int = _env_int(
+        "SEARCH_LOOKUP_CACHE_MAX_ENTRIES", 10000
+    )
+
+    # ----------------------------
+    # Search context (neighbouring segments per hit)
+    # ----------------------------
+    segment_context_cache_ttl_s: int = _env_int("SEGMENT_CONTEXT_CACHE_TTL_S", 600)
+    segment_context_cache_max_entries: int = _env_int(
+        "SEGMENT_CONTEXT_CACHE_MAX_ENTRIES", 50000
+    )
 
     @property
     def db_url(self) -> str | None:
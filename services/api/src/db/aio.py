@@ -0,0 +1,74 @@
+from __future__ import annotations
+
+from collections.abc import AsyncIterator, Awaitable, Callable
+from contextlib import asynccontextmanager
+from contextvars import ContextVar
+from dataclasses import replace
+
+import psycopg
+from packages.shared.db.postgres_pool import PoolConfig, get_async_pool
+
+from ..config import settings
+
+
+def _pool_config() -> PoolConfig:
+    cfg = PoolConfig.from_env()
+    timeout_ms = settings.db_statement_timeout_ms
+    if timeout_ms > 0:
+        cfg = replace(cfg, options=f"-c statement_timeout={timeout_ms}")
+    return cfg
+
+
+# Per-request statement_timeout for read_conn (0 = session setting).
+_read_timeout_ms: ContextVar[int] = ContextVar("read_timeout_ms", default=0)
+
+
+def statement_timeout(timeout_ms: int) -> Callable[[], Awaitable[None]]:
+    """
+    Route dependency: reads made by this request run with
+    `SET LOCAL statement_timeout = timeout_ms` (0 = no override).
+
+        @router.get("", dependencies=[Depends(statement_timeout(2000))])
+    """
+
+    # async so it runs in the request's context (sync dependencies run in a
+    # worker thread on a copy of it, and the value would never be seen).
+    async def dependency() -> None:
+        _read_timeout_ms.set(int(timeout_ms))
+
+    return dependency
+
+
+@asynccontextmanager
+async def read_conn(
+    database_url: str | None = None,
+) -> AsyncIterator[psycopg.AsyncConnection]:
+    """
+    Pooled async connection inside one READ ONLY transaction, for GET routes.
+
+    Reads await the socket on the event loop instead of holding a threadpool
+    slot. READ ONLY goes out with the BEGIN psycopg sends anyway (no extra
+    round-trip) and makes an accidental write fail instead of commit. A
+    timeout from `statement_timeout()` is SET LOCAL, so it ends with the
+    transaction and never leaks to the next user of the connection.
+
+        async with read_conn() as conn, conn.cursor() as cur:
+            await cur.execute(...)
+    """
+    url = database_url or settings.db_url
+    if not url:
+        raise RuntimeError("DATABASE_URL not configured")
+    timeout_ms = _read_timeout_ms.get()
+    pool = await get_async_pool(url, _pool_config())
+    async with pool.connection() as conn:
+        await conn.set_read_only(True)
+        try:
+            async with conn.transaction():
+                if timeout_ms > 0:
+                    await conn.execute(f"SET LOCAL statement_timeout = {timeout_ms}")
+                yield conn
+        finally:
+            # Pooled connections are shared with writers: never hand one back
+            # still read-only. A broken connection is discarded by the pool.
+            if not conn.broken:
+                await conn.set_read_only(None)
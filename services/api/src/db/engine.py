@@ -1,13 +1,85 @@
 from __future__ import annotations
 
-from collections.abc import Iterator
+import threading
+import time
+from collections.abc import Callable, Iterator
 
-from sqlalchemy import create_engine
+from prometheus_client import Counter, Gauge, Histogram
+from sqlalchemy import create_engine, event, text
 from sqlalchemy.engine import Connection, Engine
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from sqlalchemy.pool import QueuePool
 
 from ..config import settings
 
+DB_POOL_CONNECTIONS = Gauge(
+    "narralytica_db_pool_connections",
+    "API SQLAlchemy pool connections by state (checked_out, idle, overflow)",
+    ["state"],
+)
+DB_POOL_WAIT = Histogram(
+    "narralytica_db_pool_wait_seconds",
+    "Time spent waiting for a pooled connection (includes opening new ones)",
+    buckets=(0.0005, 0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 5.0),
+)
+DB_POOL_TIMEOUTS = Counter(
+    "narralytica_db_pool_timeouts_total",
+    "Checkouts that gave up after DB_ENGINE_POOL_TIMEOUT_S",
+)
+DB_POOL_INVALIDATIONS = Counter(
+    "narralytica_db_pool_invalidations_total",
+    "Pool invalidations after a connection-level error",
+)
+
+
+class TimedQueuePool(QueuePool):
+    """QueuePool that records checkout wait time and timeouts."""
+
+    def _do_get(self):  # type: ignore[override]
+        start = time.perf_counter()
+        try:
+            return super()._do_get()
+        except PoolTimeoutError:
+            DB_POOL_TIMEOUTS.inc()
+            raise
+        finally:
+            DB_POOL_WAIT.observe(time.perf_counter() - start)
+
+
+def _is_server_disconnect(exc: BaseException) -> bool:
+    """
+    Errors after which the connection (and its siblings) can't be trusted:
+    SQLSTATE class 08 (connection exception) and 57P01-57P03 (admin/crash
+    shutdown, cannot connect now), e.g. after a failover or pgbouncer restart.
+    """
+    sqlstate = getattr(exc, "sqlstate", None) or ""
+    return sqlstate.startswith("08") or sqlstate in ("57P01", "57P02", "57P03")
+
+
+def _install_events(engine: Engine) -> None:
+    @event.listens_for(engine, "handle_error")
+    def _on_error(ctx) -> None:  # noqa: ANN001
+        # Without pre-ping, a dead connection is only noticed when a statement
+        # fails. Flagging it as a disconnect makes SQLAlchemy invalidate the
+        # whole pool, so the next checkouts reconnect instead of each failing
+        # once on another stale connection.
+        if not ctx.is_disconnect and _is_server_disconnect(ctx.original_exception):
+            ctx.is_disconnect = True
+        if ctx.is_disconnect:
+            DB_POOL_INVALIDATIONS.inc()
+
+
+def _connect_args() -> dict:
+    # Opt-in statement_timeout for every session, set at connect time so it
+    # costs no round-trip per request.
+    timeout_ms = settings.db_statement_timeout_ms
+    if timeout_ms > 0:
+        return {"options": f"-c statement_timeout={timeout_ms}"}
+    return {}
+
+
 _engine: Engine | None = None
+_lock = threading.Lock()
 
 
 def get_engine() -> Engine:
@@ -22,15 +94,77 @@ def get_engine() -> Engine:
             "Fallback supported: API_DATABASE_URL."
         )
 
-    _engine = create_engine(
-        database_url,
-        pool_pre_ping=True,
-        future=True,
-    )
-    return _engine
+    with _lock:
+        if _engine is None:
+            engine = create_engine(
+                database_url,
+                poolclass=TimedQueuePool,
+                pool_size=settings.db_pool_size,
+                max_overflow=settings.db_max_overflow,
+                pool_timeout=settings.db_pool_timeout_s,
+                pool_recycle=settings.db_pool_recycle_s,
+                # Off by default: it costs a round-trip on every checkout.
+                # Stale connections are recycled after pool_recycle and the
+                # pool is invalidated on the first disconnect error instead.
+                pool_pre_ping=settings.db_pool_pre_ping,
+                connect_args=_connect_args(),
+                future=True,
+            )
+            _install_events(engine)
+            _engine = engine
+        return _engine
+
+
+def dispose_engine() -> None:
+    """Close pooled connections and drop the engine (shutdown, tests)."""
+    global _engine
+    with _lock:
+        engine, _engine = _engine, None
+    if engine is not None:
+        engine.dispose()
+
+
+def _pool_stat(read: Callable[[QueuePool], int]) -> Callable[[], float]:
+    def value() -> float:
+        engine = _engine
+        if engine is None or not isinstance(engine.pool, QueuePool):
+            return 0.0
+        return float(max(0, read(engine.pool)))
+
+    return value
+
+
+DB_POOL_CONNECTIONS.labels(state="checked_out").set_function(
+    _pool_stat(lambda p: p.checkedout())
+)
+DB_POOL_CONNECTIONS.labels(state="idle").set_function(
+    _pool_stat(lambda p: p.checkedin())
+)
+DB_POOL_CONNECTIONS.labels(state="overflow").set_function(
+    _pool_stat(lambda p: p.overflow())
+)
 
 
 def get_conn() -> Iterator[Connection]:
     engine = get_engine()
     with engine.begin() as conn:
         yield conn
+
+
+def get_conn_with_timeout(
+    statement_timeout_ms: int,
+) -> Callable[[], Iterator[Connection]]:
+    """
+    Like get_conn, with `SET LOCAL statement_timeout` for the request's
+    transaction only; the pooled connection keeps its session setting.
+
+        conn: Connection = Depends(get_conn_with_timeout(2000))
+    """
+    stmt = text(f"SET LOCAL statement_timeout = {int(statement_timeout_ms)}")
+
+    def dependency() -> Iterator[Connection]:
+        with get_engine().begin() as conn:
+            conn.execute(stmt)
+            yield conn
+
+    return dependency
@@ -52,6 +52,8 @@ api_keys = Table(
     Column("key_hash", String, nullable=False, unique=True),
     Column("status", String, nullable=False),  # active/revoked
     Column("scopes", JSON, nullable=True),  # optional v1
+    # RATE_LIMIT_TIERS name; NULL = default RATE_LIMIT_LIMIT
+    Column("rate_limit_tier", String, nullable=True),
     Column(
         "created_at", DateTime(timezone=True), server_default=func.now(), nullable=False
     ),
@@ -1,15 +1,38 @@
 from __future__ import annotations
 
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI
 
 from .config import settings
 from .middleware import RateLimitMiddleware
+from .middleware.rate_limit import parse_tiers
+
+
+@asynccontextmanager
+async def _lifespan(app: FastAPI) -> AsyncIterator[None]:
+    yield
+    from packages.shared.db.postgres_pool import close_async_pools, close_pools
+
+    from .auth.key_cache import reset_api_key_state
+    from .db.engine import dispose_engine
+    from .services.redis_client import close_async_redis
+
+    # Flush write-behind API key usage (last_used_at), close Redis and
+    # Postgres pools.
+    reset_api_key_state()
+    await close_async_redis()
+    close_pools()
+    await close_async_pools()
+    dispose_engine()
 
 
 def create_app() -> FastAPI:
     app = FastAPI(
         title="Narralytica API",
         version="v1",
+        lifespan=_lifespan,
     )
 
     # ------------------------------------------------------------------
@@ -22,15 +45,26 @@ def create_app() -> FastAPI:
         window_seconds=settings.rate_limit_window_seconds,
         redis_url=settings.redis_url,
         path_prefix=settings.rate_limit_path_prefix,
+        tiers=parse_tiers(settings.rate_limit_tiers),
+        api_key_pepper=settings.api_key_pepper,
+        local_share=settings.rate_limit_local_share,
+        local_sync_s=settings.rate_limit_local_sync_s,
+        memory_max_keys=settings.rate_limit_memory_max_keys,
+        redis_timeout_s=settings.rate_limit_redis_timeout_ms / 1000,
+        fallback_cooldown_s=settings.rate_limit_fallback_cooldown_s,
     )
 
     # ------------------------------------------------------------------
     # API Routers (single entrypoint)
     # ------------------------------------------------------------------
+    from .routes.metrics import router as metrics_router
     from .routes.v1 import router as v1_router
 
     app.include_router(v1_router)
 
+    # Unversioned operational surface (Prometheus scrape).
+    app.include_router(metrics_router)
+
     return app
 
 
@@ -1,16 +1,33 @@
 from __future__ import annotations
 
+import asyncio
+import hashlib
+import math
+import threading
 import time
+from collections import OrderedDict
 from dataclasses import dataclass
 
-from starlette.middleware.base import BaseHTTPMiddleware
+from prometheus_client import Counter
+from starlette.datastructures import MutableHeaders
 from starlette.requests import Request
 from starlette.responses import Response
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from ..auth.api_keys import hash_api_key
+from ..services.redis_client import get_async_redis, redis_available
+from ..services.ttl_cache import TTLCache
 
 try:
-    import redis  # type: ignore
+    from redis.exceptions import NoScriptError  # type: ignore
 except Exception:  # pragma: no cover
-    redis = None
+    NoScriptError = Exception  # noqa: N816
+
+RATE_LIMIT_FALLBACKS = Counter(
+    "narralytica_rate_limit_fallback_total",
+    "Rate-limit checks answered by the local store because Redis was slow or down",
+    ["reason"],
+)
 
 
 @dataclass(frozen=True)
@@ -22,12 +39,12 @@ class RateLimitResult:
     retry_after: int
 
 
-def _now() -> float:
-    return time.time()
+# Float slack for GCRA comparisons (limit * interval == window exactly).
+_EPS = 1e-9
 
 
-def _window_reset_epoch(now: float, window_seconds: int) -> int:
-    return int(now // window_seconds) * window_seconds + window_seconds
+def _now() -> float:
+    return time.time()
 
 
 def _extract_client_ip(request: Request) -> str:
@@ -52,115 +69,432 @@ def _extract_api_key(request: Request) -> str | None:
     return None
 
 
-class InMemoryStore:
+def parse_tiers(raw: str | None) -> dict[str, int]:
+    """`"free:60,pro:600"` -> {"free": 60, "pro": 600}; bad entries are skipped."""
+    out: dict[str, int] = {}
+    for part in (raw or "").split(","):
+        name, _, limit = part.partition(":")
+        name = name.strip()
+        try:
+            n = int(limit)
+        except ValueError:
+            continue
+        if name and n > 0:
+            out[name] = n
+    return out
+
+
+def _result(
+    allowed: bool, used_s: float, *, limit: int, window_seconds: int, now: float
+) -> RateLimitResult:
+    """
+    Headers from a GCRA outcome. `used_s` is how far the key's theoretical
+    arrival time is ahead of now: a full window means the quota is exhausted,
+    and it drains at one request per `window_seconds / limit`.
+    """
+    interval = window_seconds / limit
+    remaining = int((window_seconds - used_s) / interval + _EPS) if allowed else 0
+    retry_after = 0 if allowed else math.ceil(used_s + interval - window_seconds)
+    return RateLimitResult(
+        allowed=allowed,
+        limit=limit,
+        remaining=max(0, min(limit, remaining)),
+        reset_epoch=math.ceil(now + used_s),
+        retry_after=max(0, retry_after),
+    )
+
+
+def gcra(
+    tat: float | None,
+    now: float,
+    *,
+    limit: int,
+    window_seconds: int,
+    debt: int = 0,
+) -> tuple[bool, float]:
+    """
+    Generic cell rate algorithm over a stored theoretical arrival time.
+
+    Allows `limit` requests per `window_seconds` with a burst of at most
+    `limit`, but spreads the refill evenly: unlike fixed windows, a client
+    cannot get 2x the limit across a window boundary. `debt` requests that
+    were already served (local pre-check) are charged unconditionally.
+
+    Returns (allowed, new tat).
+    """
+    interval = window_seconds / limit
+    base = max(tat if tat is not None else now, now) + interval * debt
+    new_tat = base + interval
+    if new_tat - window_seconds > now + _EPS:
+        return False, base
+    return True, new_tat
+
+
+class _Shard:
+    __slots__ = ("lock", "tats", "ops")
+
     def __init__(self) -> None:
-        self._buckets: dict[str, tuple[int, int]] = {}
+        self.lock = threading.Lock()
+        # key -> tat, least recently used first
+        self.tats: OrderedDict[str, float] = OrderedDict()
+        self.ops = 0
 
-    def incr(self, key: str, window_seconds: int) -> tuple[int, int]:
-        now = _now()
-        reset = _window_reset_epoch(now, window_seconds)
-        cur = self._buckets.get(key)
 
-        if not cur or cur[0] != reset:
-            self._buckets[key] = (reset, 1)
-            return reset, 1
+class InMemoryStore:
+    """
+    Process-local GCRA state for pods running without Redis.
+
+    - bounded: at most `max_keys` buckets; past that the least recently used
+      bucket is dropped (that client starts again with a full quota)
+    - a bucket whose tat is in the past carries no information (quota fully
+      refilled), so it is treated as absent when read, and every
+      `sweep_every` operations a shard drops all of them
+    - keys are spread over `shards` independently locked shards, so
+      concurrent requests rarely contend on one lock
+    """
+
+    def __init__(
+        self,
+        *,
+        max_keys: int = 100000,
+        shards: int = 16,
+        sweep_every: int = 1024,
+    ) -> None:
+        self._shards = [_Shard() for _ in range(max(1, int(shards)))]
+        self._per_shard = max(1, int(max_keys) // len(self._shards))
+        self._sweep_every = max(1, int(sweep_every))
+
+    def __len__(self) -> int:
+        return sum(len(sh.tats) for sh in self._shards)
+
+    def acquire(
+        self, key: str, *, limit: int, window_seconds: int, debt: int = 0
+    ) -> tuple[bool, float]:
+        shard = self._shards[hash(key) % len(self._shards)]
+        with shard.lock:
+            now = _now()
+            tats = shard.tats
+            tat = tats.get(key)
+            if tat is not None and tat <= now:
+                tat = None
+            allowed, tat = gcra(
+                tat,
+                now,
+                limit=limit,
+                window_seconds=window_seconds,
+                debt=debt,
+            )
+            tats[key] = tat
+            tats.move_to_end(key)
+
+            shard.ops += 1
+            if shard.ops >= self._sweep_every:
+                shard.ops = 0
+                self._sweep_locked(tats, now)
+            # O(1) per request even when a scan keeps the shard full.
+            while len(tats) > self._per_shard:
+                tats.popitem(last=False)
+        return allowed, tat - now
 
-        self._buckets[key] = (reset, cur[1] + 1)
-        return reset, cur[1] + 1
+    @staticmethod
+    def _sweep_locked(tats: OrderedDict[str, float], now: float) -> None:
+        expired = [k for k, t in tats.items() if t <= now]
+        for k in expired:
+            del tats[k]
+
+    def sweep(self) -> int:
+        """Drop refilled buckets in every shard; returns how many were dropped."""
+        before = len(self)
+        now = _now()
+        for shard in self._shards:
+            with shard.lock:
+                self._sweep_locked(shard.tats, now)
+        return before - len(self)
+
+
+# Same algorithm as gcra(), atomically and on Redis time (no clock skew
+# between API pods). Times are integer milliseconds.
+GCRA_LUA = """
+local interval = tonumber(ARGV[1])
+local window = tonumber(ARGV[2])
+local debt = tonumber(ARGV[3])
+local t = redis.call('TIME')
+local now = tonumber(t[1]) * 1000 + math.floor(tonumber(t[2]) / 1000)
+local tat = tonumber(redis.call('GET', KEYS[1]) or now)
+if tat < now then tat = now end
+tat = tat + interval * debt
+local new_tat = tat + interval
+if new_tat - window > now then
+  if debt > 0 then
+    redis.call('SET', KEYS[1], tat, 'PX', tat - now)
+  end
+  return {0, tat - now}
+end
+redis.call('SET', KEYS[1], new_tat, 'PX', new_tat - now)
+return {1, new_tat - now}
+"""
+
+
+_GCRA_SHA = hashlib.sha1(GCRA_LUA.encode()).hexdigest()
 
 
 class RedisStore:
+    """
+    Async GCRA store on the shared pooled Redis client (services/redis_client):
+    one EVALSHA per call, awaited, so a slow Redis never blocks the loop.
+    """
+
     def __init__(self, url: str) -> None:
-        if redis is None:
+        if not redis_available():
             raise RuntimeError("redis package not installed")
-        self._r = redis.Redis.from_url(url, decode_responses=True)
+        self.url = url
+
+    async def acquire(
+        self, key: str, *, limit: int, window_seconds: int, debt: int = 0
+    ) -> tuple[bool, float]:
+        r = get_async_redis(self.url)
+        window_ms = window_seconds * 1000
+        args = (max(1, window_ms // limit), window_ms, debt)
+        redis_key = f"rl:gcra:{key}"
+        try:
+            allowed, used_ms = await r.evalsha(_GCRA_SHA, 1, redis_key, *args)
+        except NoScriptError:
+            allowed, used_ms = await r.eval(GCRA_LUA, 1, redis_key, *args)
+        return bool(int(allowed)), int(used_ms) / 1000.0
+
+
+class FallbackStore:
+    """
+    Uses `primary` (Redis) unless it is slow or failing.
+
+    A call that takes longer than `timeout_s` or raises is answered by the
+    process-local `fallback` instead, and for the next `cooldown_s` every
+    call goes straight to `fallback`. Limits then apply per pod rather than
+    cluster-wide, which is better than adding Redis latency to every request
+    or failing them.
+    """
 
-    def incr(self, key: str, window_seconds: int) -> tuple[int, int]:
-        now = _now()
-        reset = _window_reset_epoch(now, window_seconds)
-        redis_key = f"rl:{reset}:{key}"
+    def __init__(
+        self, primary, fallback, *, timeout_s: float, cooldown_s: float
+    ) -> None:
+        self.primary = primary
+        self.fallback = fallback
+        self.timeout_s = float(timeout_s)
+        self.cooldown_s = float(cooldown_s)
+        self._degraded_until = 0.0
+
+    async def acquire(
+        self, key: str, *, limit: int, window_seconds: int, debt: int = 0
+    ) -> tuple[bool, float]:
+        kwargs = {"limit": limit, "window_seconds": window_seconds, "debt": debt}
+        if time.monotonic() >= self._degraded_until:
+            try:
+                return await asyncio.wait_for(
+                    self.primary.acquire(key, **kwargs), timeout=self.timeout_s
+                )
+            except TimeoutError:
+                RATE_LIMIT_FALLBACKS.labels(reason="slow").inc()
+            except Exception:
+                RATE_LIMIT_FALLBACKS.labels(reason="error").inc()
+            self._degraded_until = time.monotonic() + self.cooldown_s
+        return self.fallback.acquire(key, **kwargs)
 
-        pipe = self._r.pipeline()
-        pipe.incr(redis_key, 1)
-        pipe.expireat(redis_key, reset)
-        out = pipe.execute()
 
-        count = int(out[0])
-        return reset, count
+class LocalPrecheckStore:
+    """
+    Skips the shared store for keys that are far under their quota.
 
+    After each shared-store call the remaining quota is remembered for
+    `sync_s`. Until then, up to `share` of it is granted locally and counted
+    as debt, which the next shared-store call charges. With N pods a key can
+    overshoot by at most (N - 1) * share of its remaining quota for `sync_s`,
+    which is why only keys well under quota are served locally.
+    """
+
+    # Unsynced debt is kept this long (or until LRU eviction) for the next call.
+    DEBT_TTL_S = 300.0
+
+    def __init__(
+        self, inner, *, share: float, sync_s: float, max_keys: int = 100000
+    ) -> None:
+        self.inner = inner
+        self.share = min(1.0, max(0.0, float(share)))
+        self.sync_s = float(sync_s)
+        self._lock = threading.Lock()
+        # key -> (synced_at, allowance, debt, used_s at sync)
+        self._local: TTLCache[str, tuple[float, int, int, float]] = TTLCache(
+            max_entries=max_keys, ttl_s=self.DEBT_TTL_S
+        )
+
+    async def acquire(
+        self, key: str, *, limit: int, window_seconds: int, debt: int = 0
+    ) -> tuple[bool, float]:
+        now = _now()
+        with self._lock:
+            cached = self._local.get(key)
+            if cached is not None:
+                synced_at, allowance, pending, used_s = cached
+                if pending < allowance and now - synced_at < self.sync_s:
+                    pending += 1
+                    self._local.set(key, (synced_at, allowance, pending, used_s))
+                    interval = window_seconds / limit
+                    drained = max(0.0, used_s - (now - synced_at))
+                    return True, drained + interval * pending
+                self._local.pop(key)
+                debt += pending
+
+        allowed, used_s = await self.inner.acquire(
+            key, limit=limit, window_seconds=window_seconds, debt=debt
+        )
+        remaining = (window_seconds - used_s) / (window_seconds / limit)
+        allowance = int(remaining * self.share)
+        if allowed and allowance > 0:
+            with self._lock:
+                self._local.set(key, (now, allowance, 0, used_s))
+        return allowed, used_s
+
+
+class RateLimitMiddleware:
+    """
+    Pure ASGI middleware (no BaseHTTPMiddleware): no extra task or response
+    buffering per request, and streaming responses pass straight through.
+    Rate-limit headers are added to the `http.response.start` message.
+    """
 
-class RateLimitMiddleware(BaseHTTPMiddleware):
     def __init__(
         self,
-        app,
+        app: ASGIApp,
         *,
         enabled: bool,
         limit: int,
         window_seconds: int,
         redis_url: str | None = None,
         path_prefix: str = "/api/",
+        tiers: dict[str, int] | None = None,
+        api_key_pepper: str | None = None,
+        local_share: float = 0.0,
+        local_sync_s: float = 1.0,
+        memory_max_keys: int = 100000,
+        redis_timeout_s: float = 0.05,
+        fallback_cooldown_s: float = 5.0,
     ) -> None:
-        super().__init__(app)
+        self.app = app
         self.enabled = bool(enabled)
         self.limit = int(limit)
         self.window_seconds = int(window_seconds)
         self.path_prefix = path_prefix.rstrip("/") + "/"
+        self.tiers = dict(tiers or {})
+        self.api_key_pepper = api_key_pepper
 
         # Prefer Redis if configured AND redis package is available.
         # Otherwise fall back to in-memory (dev/tests).
-        self._store = InMemoryStore()
-        if redis_url and redis is not None:
-            try:
-                self._store = RedisStore(redis_url)
-            except Exception:
-                # Fail open to in-memory rather than crashing app/tests
-                self._store = InMemoryStore()
-
-    def _should_apply(self, request: Request) -> bool:
+        self._local = InMemoryStore(max_keys=memory_max_keys)
+        self._shared = None
+        if redis_url and redis_available():
+            shared = FallbackStore(
+                RedisStore(redis_url),
+                self._local,
+                timeout_s=redis_timeout_s,
+                cooldown_s=fallback_cooldown_s,
+            )
+            self._shared = (
+                LocalPrecheckStore(shared, share=local_share, sync_s=local_sync_s)
+                if local_share > 0
+                else shared
+            )
+
+    def _should_apply(self, path: str) -> bool:
         if not self.enabled:
             return False
-        return request.url.path.startswith(self.path_prefix)
+        return path.startswith(self.path_prefix)
 
-    def _bucket_key(self, request: Request) -> str:
+    async def _bucket(self, request: Request) -> tuple[str, int]:
+        """
+        (bucket key, limit). API keys are bucketed by their hash and get the
+        limit of their tier.
+        """
         api_key = _extract_api_key(request)
-        if api_key:
-            return f"key:{api_key}"
-        return f"ip:{_extract_client_ip(request)}"
-
-    def _check(self, request: Request) -> RateLimitResult:
-        key = self._bucket_key(request)
-        reset, count = self._store.incr(key, self.window_seconds)
-
-        remaining = max(0, self.limit - count)
-        allowed = count <= self.limit
-        retry_after = max(0, int(reset - _now()))
-
-        return RateLimitResult(
-            allowed=allowed,
-            limit=self.limit,
-            remaining=remaining if allowed else 0,
-            reset_epoch=int(reset),
-            retry_after=retry_after,
+        if not api_key:
+            return f"ip:{_extract_client_ip(request)}", self.limit
+        if not self.api_key_pepper:
+            return f"key:{api_key}", self.limit
+        key_hash = hash_api_key(api_key, self.api_key_pepper)
+        return f"key:{key_hash}", await self._key_limit(key_hash)
+
+    async def _key_limit(self, key_hash: str) -> int:
+        """
+        The tier normally comes from the key cache. On a miss (first request
+        on this process, or the tier entry expired) the key is loaded once
+        here; the verified entry is cached so require_api_key doesn't query
+        again. Unknown keys and database errors get the default limit.
+        """
+        if not self.tiers:
+            return self.limit
+
+        from ..auth.deps import load_active_key
+        from ..auth.key_cache import get_api_key_cache
+
+        cache = get_api_key_cache()
+        tier = cache.peek_tier(key_hash)
+        if tier is None:
+            try:
+                key = await load_active_key(key_hash)
+            except Exception:
+                return self.limit
+            if key is None:
+                return self.limit
+            cache.set(key_hash, key)
+            tier = key.rate_limit_tier or ""
+        return self.tiers.get(tier, self.limit)
+
+    async def _check(self, request: Request) -> RateLimitResult:
+        key, limit = await self._bucket(request)
+        if self._shared is not None:
+            allowed, used_s = await self._shared.acquire(
+                key, limit=limit, window_seconds=self.window_seconds
+            )
+        else:
+            allowed, used_s = self._local.acquire(
+                key, limit=limit, window_seconds=self.window_seconds
+            )
+        return _result(
+            allowed,
+            used_s,
+            limit=limit,
+            window_seconds=self.window_seconds,
+            now=_now(),
         )
 
     @staticmethod
-    def _apply_headers(resp: Response, rl: RateLimitResult) -> None:
-        resp.headers["X-RateLimit-Limit"] = str(rl.limit)
-        resp.headers["X-RateLimit-Remaining"] = str(rl.remaining)
-        resp.headers["X-RateLimit-Reset"] = str(rl.reset_epoch)
+    def _headers(rl: RateLimitResult) -> dict[str, str]:
+        headers = {
+            "X-RateLimit-Limit": str(rl.limit),
+            "X-RateLimit-Remaining": str(rl.remaining),
+            "X-RateLimit-Reset": str(rl.reset_epoch),
+        }
         if not rl.allowed:
-            resp.headers["Retry-After"] = str(rl.retry_after)
+            headers["Retry-After"] = str(rl.retry_after)
+        return headers
 
-    async def dispatch(self, request: Request, call_next):
-        if not self._should_apply(request):
-            return await call_next(request)
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or not self._should_apply(scope["path"]):
+            await self.app(scope, receive, send)
+            return
 
-        rl = self._check(request)
+        rl = await self._check(Request(scope))
+        headers = self._headers(rl)
         if not rl.allowed:
-            resp = Response(status_code=429, content="Too Many Requests")
-            self._apply_headers(resp, rl)
-            return resp
-
-        resp = await call_next(request)
-        self._apply_headers(resp, rl)
-        return resp
+            resp = Response(
+                status_code=429, content="Too Many Requests", headers=headers
+            )
+            await resp(scope, receive, send)
+            return
+
+        async def send_with_headers(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                h = MutableHeaders(scope=message)
+                for k, v in headers.items():
+                    h[k] = v
+            await send(message)
+
+        await self.app(scope, receive, send_with_headers)
@@ -9,7 +9,11 @@ from pydantic import BaseModel, Field, HttpUrl
 
 from ..domain.ingestion_contract import IngestionJobPayload
 from ..domain.ingestion_validation import normalize_url, validate_source_fields
-from ..services.idempotency import IdempotencyStore, get_idempotency_store
+from ..services.idempotency import (
+    IdempotencyStore,
+    get_idempotency_store,
+    is_pending,
+)
 
 router = APIRouter(tags=["ingest"])
 
@@ -112,18 +116,28 @@ async def create_ingestion_job(
     actor: Actor = Depends(get_actor),  # noqa: B008
     store: IdempotencyStore = Depends(get_idempotency_store),  # noqa: B008
 ) -> IngestResponseV2:
+    idem_key: str | None = None
+    # True once this request holds the placeholder; only the owner may
+    # release it (not a replay, and not when reserve() itself failed).
+    owned = False
     try:
         validate_source_fields(request.source)
 
-        # Idempotency if external_id is provided
-        idem_key: str | None = None
+        # Idempotency if external_id is provided: the first request claims
+        # the key atomically, concurrent duplicates see it in flight.
         if request.external_id:
             idem_key = _idempotency_key(actor.api_key_id, request.external_id)
-            existing = store.get(idem_key)
+            existing = await store.reserve(idem_key)
+            if is_pending(existing):
+                raise HTTPException(
+                    status_code=status.HTTP_409_CONFLICT,
+                    detail="An ingest with this external_id is already in progress",
+                )
             if existing:
                 existing = dict(existing)
                 existing["idempotent_replay"] = True
                 return IngestResponseV2(**existing)
+            owned = True
 
         video_id = str(uuid4())
         job_id = str(uuid4())
@@ -148,14 +162,20 @@ async def create_ingestion_job(
             payload_version="2.0",
         )
 
-        if idem_key:
-            store.set(idem_key, out.model_dump())
+        if owned:
+            await store.set(idem_key, out.model_dump())
 
         return out
 
     except HTTPException:
         raise
     except Exception as e:
+        if owned:
+            try:
+                await store.release(idem_key)
+            except Exception:
+                # The placeholder expires on its own; keep the original error.
+                pass
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST, detail=str(e)
         ) from e
@@ -1,21 +1,66 @@
 from __future__ import annotations
 
+import json
+import logging
 import os
+import time
+from dataclasses import dataclass
 from hashlib import sha256
 from typing import Any, Literal
+from uuid import uuid4
 
 import requests
 from fastapi import APIRouter, HTTPException, Query
 from pydantic import BaseModel, Field, ValidationError
 
 from ..domain.search_filters import SearchFiltersV1
-from ..search.hybrid.merge import merge_results
-from ..search.opensearch.lexical_query import build_lexical_query
-from ..search.qdrant.vector_search import VectorSearchError, vector_search
+from ..search.abortable import AbortableSession
+from ..search.breaker import get_breaker
+from ..search.hedging import get_hedger
+from ..search.hybrid.dedup import DEFAULT_THRESHOLD, collapse_near_duplicates
+from ..search.hybrid.grouping import ResultGroup, group_results
+from ..search.hybrid.merge import HybridItem, merge_results
+from ..search.opensearch.lexical_query import (
+    SOURCE_EXCLUDES,
+    TYPEAHEAD_DEFAULT_LIMIT,
+    TYPEAHEAD_MAX_LIMIT,
+    build_lexical_query,
+    build_typeahead_query,
+)
+from ..search.qdrant.vector_search import (
+    VectorHit,
+    VectorQuery,
+    VectorSearchError,
+    vector_search,
+    vector_search_batch,
+)
+from ..search.query_parser import ParsedQuery, parse_query
+from ..search.snippets import make_snippet, query_terms
+from ..search.suggest import (
+    SUGGEST_DEFAULT_LIMIT,
+    SUGGEST_KINDS,
+    SUGGEST_MAX_LIMIT,
+    Suggestion,
+    build_suggest_query,
+    get_suggest_cache,
+    normalize_prefix,
+    parse_suggest_response,
+)
+from ..services.search_lookup_repo import get_search_lookup
+from ..services.segment_context_repo import ContextSegment, get_segment_context
 
 router = APIRouter(prefix="/search", tags=["search"])
 
+logger = logging.getLogger(__name__)
+
 MAX_LIMIT = 100
+MAX_BATCH_SIZE = 20
+MAX_GROUP_SIZE = 10
+MAX_CONTEXT = 5
+TYPEAHEAD_MIN_CHARS = 2
+
+GroupBy = Literal["video_id", "speaker_id"]
+OPENSEARCH_TIMEOUT_S = 10.0
 
 
 class SearchFiltersModel(BaseModel):
@@ -34,6 +79,12 @@ class SearchRequestV1(BaseModel):
     offset: int = Field(default=0, ge=0)
     mode: Literal["lexical", "semantic", "hybrid"] | None = Field(default=None)
     semantic: bool | None = Field(default=None)
+    group_by: GroupBy | None = Field(default=None)
+    group_size: int = Field(default=3, ge=1, le=MAX_GROUP_SIZE)
+    # Neighbouring segments (±context) to return with each hit.
+    context: int = Field(default=0, ge=0, le=MAX_CONTEXT)
+    # Collapse near-identical segments (re-uploads, reposted clips).
+    dedup: bool = Field(default=False)
 
 
 class PageMeta(BaseModel):
@@ -82,17 +133,85 @@ class SearchScore(BaseModel):
     vector_rank: int | None = Field(default=None, ge=1)
 
 
+class SearchContextSegment(BaseModel):
+    id: str = Field(..., min_length=1)
+    segment_index: int = Field(..., ge=0)
+    start_ms: int = Field(..., ge=0)
+    end_ms: int = Field(..., ge=0)
+    text: str
+
+
+class SearchContext(BaseModel):
+    before: list[SearchContextSegment]
+    after: list[SearchContextSegment]
+
+
 class SearchItem(BaseModel):
     segment: SearchSegment
     video: SearchVideo | None = None
     speaker: SearchSpeaker | None = None
     highlights: list[SearchHighlight] | None = None
     score: SearchScore
+    context: SearchContext | None = None
+    # With `dedup`: near-identical hits collapsed into this one.
+    duplicates: int | None = None
+
+
+class SearchGroup(BaseModel):
+    key: str | None = None
+    score: float
+    size: int = Field(..., ge=1)
 
 
 class SearchResponseV1(BaseModel):
     items: list[SearchItem]
     page: PageMeta
+    # Present when group_by is set: groups in order, each covering the next
+    # `size` entries of `items`. Pagination then counts groups, not segments.
+    groups: list[SearchGroup] | None = None
+
+
+class SearchBatchRequestV1(BaseModel):
+    requests: list[SearchRequestV1] = Field(
+        ..., min_length=1, max_length=MAX_BATCH_SIZE
+    )
+
+
+class SearchBatchError(BaseModel):
+    status: int
+    detail: str
+
+
+class SearchBatchResultV1(BaseModel):
+    response: SearchResponseV1 | None = None
+    error: SearchBatchError | None = None
+
+
+class SearchBatchResponseV1(BaseModel):
+    results: list[SearchBatchResultV1]
+
+
+class SearchTypeaheadItem(BaseModel):
+    segment_id: str
+    video_id: str | None = None
+    speaker_id: str | None = None
+    start_ms: int | None = None
+    end_ms: int | None = None
+    highlight: str | None = None
+
+
+class SearchTypeaheadResponseV1(BaseModel):
+    items: list[SearchTypeaheadItem]
+
+
+class SearchSuggestion(BaseModel):
+    text: str
+    kind: str
+    score: float
+
+
+class SearchSuggestResponseV1(BaseModel):
+    items: list[SearchSuggestion]
 
 
 def _opensearch_url() -> str:
@@ -111,6 +230,10 @@ def _segments_index() -> str:
     return idx
 
 
+def _suggest_index() -> str:
+    return os.environ.get("OPENSEARCH_SUGGEST_INDEX") or "narralytica-suggest-v1"
+
+
 def _os_auth() -> tuple[str, str] | None:
     user = os.environ.get("OPENSEARCH_USERNAME")
     pwd = os.environ.get("OPENSEARCH_PASSWORD")
@@ -123,9 +246,15 @@ def _query_fingerprint(q: str) -> str:
     return sha256(q.encode()).hexdigest()[:12]
 
 
-def _parse_filters(filters: SearchFiltersModel | None) -> SearchFiltersV1:
+def _parse_filters(
+    filters: SearchFiltersModel | None, operators: dict[str, str] | None = None
+) -> SearchFiltersV1:
     try:
         raw = (filters.model_dump(exclude_none=True) if filters else {}) or {}
+        # Query-language operators (speaker:, lang:) fill unset filters only;
+        # explicit request filters win.
+        for k, v in (operators or {}).items():
+            raw.setdefault(k, v)
         return SearchFiltersV1.model_validate(raw)
     except (ValidationError, ValueError) as e:
         raise HTTPException(status_code=400, detail=str(e)) from e
@@ -248,41 +377,129 @@ def _segment_from_source(segment_id: str, src: dict[str, Any]) -> SearchSegment:
     )
 
 
-def _opensearch_search(
-    body: dict[str, Any],
-) -> tuple[
-    list[dict[str, Any]],
-    dict[str, dict],
-    dict[str, Any],
-    dict[str, list[SearchHighlight]],
-]:
-    url = f"{_opensearch_url()}/{_segments_index()}/_search"
+def _opensearch_post(
+    url: str,
+    body: dict[str, Any] | None = None,
+    *,
+    error_label: str,
+    ndjson: list[dict[str, Any]] | None = None,
+) -> dict[str, Any]:
+    """
+    POST to OpenSearch through the backend circuit breaker, optionally hedged
+    (OPENSEARCH_HEDGE_ENABLED) against slow shards.
+
+    `ndjson` sends newline-delimited JSON instead of `body` (e.g. _msearch).
+
+    - breaker open      -> 503 immediately, no network call
+    - 4xx               -> 400 (client/query error, does not trip the breaker)
+    - network/5xx error -> 503 (counted as a breaker failure)
+    """
+    breaker = get_breaker("opensearch")
+    if not breaker.allow():
+        raise HTTPException(
+            status_code=503, detail="OpenSearch unavailable: circuit open"
+        )
+
     auth = _os_auth()
+    timeout_s = breaker.timeout_s(OPENSEARCH_TIMEOUT_S)
+    hedger = get_hedger("opensearch", "OPENSEARCH")
+    # Same custom preference => same shard copies. The hedge uses another
+    # preference string, which hashes to a (usually) different copy; it is not
+    # guaranteed to avoid the copy serving the slow primary.
+    preference = uuid4().hex if hedger.config.enabled else None
+
+    payload: bytes | None = None
+    headers: dict[str, str] | None = None
+    if ndjson is not None:
+        lines = [json.dumps(x, ensure_ascii=False) for x in ndjson]
+        payload = ("\n".join(lines) + "\n").encode("utf-8")
+        headers = {"Content-Type": "application/x-ndjson"}
+
+    # One session per attempt so the losing one can be aborted (see call()).
+    sessions = (
+        [AbortableSession(), AbortableSession()]
+        if hedger.config.enabled
+        else [requests.Session()]
+    )
 
-    try:
-        with requests.Session() as session:
+    def attempt(n: int) -> requests.Response:
+        params = {"preference": f"{preference}-{n}"} if preference else None
+        with sessions[n] as session:
             session.trust_env = False
-            r = session.post(url, json=body, timeout=10, auth=auth)
+            if payload is not None:
+                return session.post(
+                    url,
+                    data=payload,
+                    headers=headers,
+                    params=params,
+                    timeout=timeout_s,
+                    auth=auth,
+                )
+            return session.post(
+                url, json=body, params=params, timeout=timeout_s, auth=auth
+            )
+
+    start = time.perf_counter()
+    try:
+        r = hedger.call(
+            attempt,
+            # 5xx never wins: wait for the other attempt instead.
+            accept=lambda resp: resp.status_code < 500,
+            cancel=lambda n: sessions[n].abort(),
+        )
         if 400 <= r.status_code < 500:
+            breaker.record_success(time.perf_counter() - start)
             raise HTTPException(
-                status_code=400, detail=f"OpenSearch query error: {r.text}"
+                status_code=400, detail=f"OpenSearch {error_label} error: {r.text}"
             )
         r.raise_for_status()
         data = r.json()
     except HTTPException:
         raise
-    except requests.RequestException as e:
+    except (requests.RequestException, ValueError) as e:
+        breaker.record_failure()
         raise HTTPException(
             status_code=503, detail=f"OpenSearch unavailable: {e}"
         ) from e
 
+    breaker.record_success(time.perf_counter() - start)
+    return data if isinstance(data, dict) else {}
+
+
+LexicalResult = tuple[
+    list[dict[str, Any]],
+    dict[str, dict],
+    dict[str, Any],
+    dict[str, list[SearchHighlight]],
+]
+
+
+def _expand_collapsed(hits: list[dict[str, Any]]) -> list[dict[str, Any]]:
+    """
+    Flatten collapsed hits: each group's `inner_hits.top` (which includes the
+    group's top hit) replaces the collapsed hit itself.
+    """
+    out: list[dict[str, Any]] = []
+    for h in hits:
+        if not isinstance(h, dict):
+            continue
+        inner = (((h.get("inner_hits") or {}).get("top") or {}).get("hits")) or {}
+        inner_hits = inner.get("hits") if isinstance(inner, dict) else None
+        if isinstance(inner_hits, list) and inner_hits:
+            out.extend(x for x in inner_hits if isinstance(x, dict))
+        else:
+            out.append(h)
+    return out
+
+
+def _parse_search_hits(data: dict[str, Any]) -> LexicalResult:
     hits = (((data or {}).get("hits") or {}).get("hits")) or []
     lexical: list[dict[str, Any]] = []
     sources: dict[str, dict] = {}
     lexical_scores: dict[str, Any] = {}
     highlights: dict[str, list[SearchHighlight]] = {}
 
-    for h in hits:
+    for h in _expand_collapsed(hits):
         sid = h.get("_id")
         if not sid:
             continue
@@ -306,28 +523,60 @@ def _opensearch_search(
     return lexical, sources, lexical_scores, highlights
 
 
+def _opensearch_search(body: dict[str, Any]) -> LexicalResult:
+    url = f"{_opensearch_url()}/{_segments_index()}/_search"
+    data = _opensearch_post(url, body, error_label="query")
+    return _parse_search_hits(data)
+
+
+def _opensearch_msearch(
+    bodies: list[dict[str, Any]],
+) -> list[LexicalResult | HTTPException]:
+    """
+    Run several searches in one `_msearch` round-trip.
+
+    Per-search failures are returned in place (as HTTPException) so one bad
+    query does not fail the whole batch.
+    """
+    if not bodies:
+        return []
+    url = f"{_opensearch_url()}/{_segments_index()}/_msearch"
+    lines: list[dict[str, Any]] = []
+    for b in bodies:
+        lines.append({})
+        lines.append(b)
+    data = _opensearch_post(url, error_label="msearch", ndjson=lines)
+
+    responses = data.get("responses")
+    if not isinstance(responses, list) or len(responses) != len(bodies):
+        raise HTTPException(
+            status_code=503, detail="OpenSearch unavailable: invalid msearch response"
+        )
+
+    out: list[LexicalResult | HTTPException] = []
+    for resp in responses:
+        if not isinstance(resp, dict):
+            out.append(HTTPException(status_code=503, detail="OpenSearch error"))
+            continue
+        if resp.get("error"):
+            status = int(resp.get("status") or 500)
+            out.append(
+                HTTPException(
+                    status_code=400 if 400 <= status < 500 else 503,
+                    detail=f"OpenSearch query error: {resp['error']}",
+                )
+            )
+            continue
+        out.append(_parse_search_hits(resp))
+    return out
+
+
 def _opensearch_mget(ids: list[str]) -> dict[str, dict]:
     if not ids:
         return {}
     url = f"{_opensearch_url()}/{_segments_index()}/_mget"
-    auth = _os_auth()
-
-    try:
-        with requests.Session() as session:
-            session.trust_env = False
-            r = session.post(url, json={"ids": ids}, timeout=10, auth=auth)
-        if 400 <= r.status_code < 500:
-            raise HTTPException(
-                status_code=400, detail=f"OpenSearch mget error: {r.text}"
-            )
-        r.raise_for_status()
-        data = r.json()
-    except HTTPException:
-        raise
-    except requests.RequestException as e:
-        raise HTTPException(
-            status_code=503, detail=f"OpenSearch unavailable: {e}"
-        ) from e
+    body = {"docs": [{"_id": i, "_source": {"excludes": SOURCE_EXCLUDES}} for i in ids]}
+    data = _opensearch_post(url, body, error_label="mget")
 
     docs = data.get("docs")
     if not isinstance(docs, list):
@@ -346,71 +595,238 @@ def _opensearch_mget(ids: list[str]) -> dict[str, dict]:
     return out
 
 
-def _run_search(req: SearchRequestV1) -> SearchResponseV1:
-    query_text = (req.query or "").strip()
+@dataclass(frozen=True)
+class _SearchPlan:
+    req: SearchRequestV1
+    query_text: str
+    mode: Literal["lexical", "semantic", "hybrid"]
+    filters: SearchFiltersV1
+    fetch_n: int
+    lexical_body: dict[str, Any]
+    group_by: GroupBy | None = None
+    group_size: int = 1
+    parsed: ParsedQuery = ParsedQuery()
+
+    @property
+    def wants_vector(self) -> bool:
+        return self.mode in ("semantic", "hybrid")
+
+
+@dataclass
+class _SearchOutcome:
+    plan: _SearchPlan
+    lexical: LexicalResult
+    merged: list[HybridItem]
+    page: list[HybridItem]
+    vector_scores: dict[str, float]
+    groups: list[ResultGroup] | None = None
+    total: int | None = None
+    duplicates: dict[str, int] | None = None
+
+
+def _plan_search(req: SearchRequestV1) -> _SearchPlan:
+    parsed = parse_query((req.query or "").strip())
+    # What the user is looking for, without operators: drives mode selection,
+    # embeddings and local highlighting.
+    query_text = parsed.positive_text
     mode = _parse_mode(req, query_text)
 
-    f = _parse_filters(req.filters)
+    f = _parse_filters(req.filters, parsed.filters())
     fetch_n = min(MAX_LIMIT, req.limit + req.offset)
 
+    if mode in ("semantic", "hybrid") and not query_text:
+        raise HTTPException(status_code=400, detail="semantic search requires a query")
+
     lexical_body = build_lexical_query(
-        query=query_text or None,
+        query=parsed.text or None,
         filters={"__compiled__": f.to_opensearch_filters()},
         limit=fetch_n,
         offset=0,
+        collapse_field=req.group_by,
+        group_size=req.group_size,
+        phrases=parsed.phrases,
+        exclude=parsed.excluded,
     )
 
-    lexical_hits, sources, lexical_scores, highlights = _opensearch_search(lexical_body)
+    return _SearchPlan(
+        req=req,
+        query_text=query_text,
+        mode=mode,
+        filters=f,
+        fetch_n=fetch_n,
+        lexical_body=lexical_body,
+        group_by=req.group_by,
+        group_size=req.group_size,
+        parsed=parsed,
+    )
 
-    vector_hits: list[dict[str, Any]] = []
-    vector_scores: dict[str, float] = {}
 
-    if mode in ("semantic", "hybrid"):
-        if not query_text:
-            raise HTTPException(
-                status_code=400, detail="semantic search requires a query"
-            )
-        try:
-            v = vector_search(
-                query_text=query_text,
-                filters=f.model_dump(exclude_none=True),
-                top_k=fetch_n,
-            )
-            vector_hits = [{"segment_id": x.segment_id, "score": x.score} for x in v]
-            for x in v:
-                vector_scores[str(x.segment_id)] = float(x.score)
-        except VectorSearchError:
-            vector_hits = []
+def _needs_vector_text(plan: _SearchPlan) -> bool:
+    return plan.parsed.has_text_operators or plan.req.dedup
 
-    if mode == "semantic":
+
+def _load_vector_sources(
+    runs: list[tuple[_SearchPlan, LexicalResult, list[VectorHit]]],
+) -> None:
+    """
+    Fetch sources of vector-only hits for plans that need their text before
+    fusion (query-language operators, dedup). One shared `_mget`; the sources
+    are recorded in each lexical result, so the page build does not fetch
+    them again.
+    """
+    need = [
+        x.segment_id
+        for plan, lexical, vector in runs
+        if _needs_vector_text(plan)
+        for x in vector
+        if x.segment_id not in lexical[1]
+    ]
+    if not need:
+        return
+    fetched = _opensearch_mget(list(dict.fromkeys(need)))
+    for plan, lexical, vector in runs:
+        if _needs_vector_text(plan):
+            for x in vector:
+                src = fetched.get(x.segment_id)
+                if src is not None:
+                    lexical[1].setdefault(x.segment_id, src)
+
+
+def _apply_text_operators(
+    runs: list[tuple[_SearchPlan, LexicalResult, list[VectorHit]]],
+) -> list[list[VectorHit]]:
+    """
+    Enforce phrases/exclusions on vector hits, which Qdrant cannot check (the
+    payload carries no text). Expects `_load_vector_sources` to have run.
+    """
+    out: list[list[VectorHit]] = []
+    for plan, lexical, vector in runs:
+        if not plan.parsed.has_text_operators:
+            out.append(vector)
+            continue
+        sources = lexical[1]
+        out.append(
+            [
+                x
+                for x in vector
+                if x.segment_id in sources
+                and plan.parsed.matches_text(
+                    str(sources[x.segment_id].get("text") or "")
+                )
+            ]
+        )
+    return out
+
+
+def _dedup_threshold() -> float:
+    raw = (os.environ.get("SEARCH_DEDUP_THRESHOLD") or "").strip()
+    try:
+        return float(raw) if raw else DEFAULT_THRESHOLD
+    except ValueError:
+        return DEFAULT_THRESHOLD
+
+
+def _group_keys(
+    group_by: str, lexical: LexicalResult, vector: list[VectorHit]
+) -> dict[str, str | None]:
+    keys: dict[str, str | None] = {}
+    for x in vector:
+        if x.group_key is not None:
+            keys[str(x.segment_id)] = x.group_key
+    for sid, src in lexical[1].items():
+        v = src.get(group_by)
+        if v is not None:
+            keys[sid] = str(v)
+    return keys
+
+
+def _merge_page(
+    plan: _SearchPlan, lexical: LexicalResult, vector: list[VectorHit]
+) -> _SearchOutcome:
+    lexical_hits = lexical[0]
+    vector_hits = [{"segment_id": x.segment_id, "score": x.score} for x in vector]
+    vector_scores = {str(x.segment_id): float(x.score) for x in vector}
+
+    if plan.mode == "semantic":
         merged = merge_results(lexical=[], vector=vector_hits)
-    elif mode == "lexical":
+    elif plan.mode == "lexical":
         merged = merge_results(lexical=lexical_hits, vector=[])
     else:
         merged = merge_results(lexical=lexical_hits, vector=vector_hits)
 
+    duplicates: dict[str, int] | None = None
+    if plan.req.dedup:
+        texts = {sid: str(src.get("text") or "") for sid, src in lexical[1].items()}
+        merged, duplicates = collapse_near_duplicates(
+            merged, texts, threshold=_dedup_threshold()
+        )
+
+    req = plan.req
+    if plan.group_by:
+        groups = group_results(
+            merged,
+            group_keys=_group_keys(plan.group_by, lexical, vector),
+            group_size=plan.group_size,
+        )
+        page_groups = groups[req.offset : req.offset + req.limit]
+        return _SearchOutcome(
+            plan=plan,
+            lexical=lexical,
+            merged=merged,
+            page=[it for g in page_groups for it in g.items],
+            vector_scores=vector_scores,
+            groups=page_groups,
+            total=len(groups),
+            duplicates=duplicates,
+        )
+
     page = merged[req.offset : req.offset + req.limit]
-    page_ids = [x.segment_id for x in page]
+    return _SearchOutcome(
+        plan=plan,
+        lexical=lexical,
+        merged=merged,
+        page=page,
+        vector_scores=vector_scores,
+        total=len(merged),
+        duplicates=duplicates,
+    )
+
 
-    missing_ids = [sid for sid in page_ids if sid not in sources]
-    if missing_ids:
-        sources.update(_opensearch_mget(missing_ids))
+def _missing_source_ids(outcome: _SearchOutcome) -> list[str]:
+    sources = outcome.lexical[1]
+    return [x.segment_id for x in outcome.page if x.segment_id not in sources]
+
+
+def _build_response(
+    outcome: _SearchOutcome, extra_sources: dict[str, dict]
+) -> SearchResponseV1:
+    _, sources, lexical_scores, highlights = outcome.lexical
+    req = outcome.plan.req
+    terms = query_terms(outcome.plan.query_text)
 
     items: list[SearchItem] = []
-    for x in page:
-        src = sources.get(x.segment_id) or {}
+    for x in outcome.page:
+        src = sources.get(x.segment_id) or extra_sources.get(x.segment_id) or {}
         segment = _segment_from_source(x.segment_id, src)
 
+        item_highlights = highlights.get(x.segment_id)
+        if not item_highlights and terms:
+            # Vector-only hits (and indexes without a highlighter) get a
+            # local snippet so every hit shows why it matched.
+            snippet = make_snippet(segment.text, terms)
+            if snippet:
+                item_highlights = [SearchHighlight(field="text", text=snippet)]
+
         lex = lexical_scores.get(x.segment_id)
         lex_score = float(lex) if isinstance(lex, (int, float)) else None
-        vec_score = vector_scores.get(x.segment_id)
+        vec_score = outcome.vector_scores.get(x.segment_id)
 
         items.append(
             SearchItem(
                 segment=segment,
                 video=None,
                 speaker=None,
-                highlights=highlights.get(x.segment_id),
+                highlights=item_highlights,
                 score=SearchScore(
                     combined=float(x.score),
                     lexical=lex_score,
@@ -418,26 +834,341 @@ def _run_search(req: SearchRequestV1) -> SearchResponseV1:
                     lexical_rank=x.lexical_rank,
                     vector_rank=x.vector_rank,
                 ),
+                duplicates=(
+                    outcome.duplicates.get(x.segment_id, 0)
+                    if outcome.duplicates is not None
+                    else None
+                ),
             )
         )
 
-    # Deterministic response ordering: stable tie-breaks when scores collide.
-    items.sort(
-        key=lambda it: (
-            -float(it.score.combined),
-            str(it.segment.video_id),
-            int(it.segment.start_ms),
-            str(it.segment.id),
+    groups: list[SearchGroup] | None = None
+    if outcome.groups is not None:
+        # Grouped pages keep group order (already deterministic).
+        groups = [
+            SearchGroup(key=g.key, score=float(g.score), size=len(g.items))
+            for g in outcome.groups
+        ]
+    else:
+        # Deterministic response ordering: stable tie-breaks when scores collide.
+        items.sort(
+            key=lambda it: (
+                -float(it.score.combined),
+                str(it.segment.video_id),
+                int(it.segment.start_ms),
+                str(it.segment.id),
+            )
         )
-    )
 
-    total: int | None = len(merged)
     return SearchResponseV1(
         items=items,
-        page=PageMeta(limit=req.limit, offset=req.offset, total=total),
+        page=PageMeta(limit=req.limit, offset=req.offset, total=outcome.total),
+        groups=groups,
     )
 
 
+def _hydrate_entities(responses: list[SearchResponseV1]) -> None:
+    """
+    Fill `video` / `speaker` blocks for every item with one cached, batched
+    Postgres lookup. Best effort: search results are still served (with null
+    blocks) when the database is not configured or unavailable.
+    """
+    lookup = get_search_lookup()
+    if lookup is None:
+        return
+
+    items = [it for r in responses for it in r.items]
+    video_ids = [it.segment.video_id for it in items]
+    speaker_ids = [it.segment.speaker_id for it in items if it.segment.speaker_id]
+    if not video_ids and not speaker_ids:
+        return
+
+    try:
+        videos, speakers = lookup.resolve(video_ids=video_ids, speaker_ids=speaker_ids)
+    except Exception as e:
+        logger.warning("search_hydration_failed", extra={"error": str(e)})
+        return
+
+    for it in items:
+        v = videos.get(it.segment.video_id)
+        if v is not None:
+            it.video = SearchVideo(
+                id=v.video_id,
+                title=v.title,
+                source=v.source,
+                published_at=v.published_at,
+            )
+        sp = speakers.get(it.segment.speaker_id) if it.segment.speaker_id else None
+        if sp is not None:
+            it.speaker = SearchSpeaker(id=sp.speaker_id, name=sp.name)
+
+
+def _context_segment(s: ContextSegment) -> SearchContextSegment:
+    return SearchContextSegment(
+        id=s.segment_id,
+        segment_index=s.segment_index,
+        start_ms=s.start_ms,
+        end_ms=s.end_ms,
+        text=s.text,
+    )
+
+
+def _attach_context(pairs: list[tuple[SearchResponseV1, int]]) -> None:
+    """
+    Fill `context` with ±N neighbouring segments for every hit of every
+    (response, N) pair, with one cached, batched Postgres lookup. Hits without
+    transcript_id/segment_index are skipped. Best effort, like hydration.
+    """
+    wanted = [(r, n) for r, n in pairs if n > 0 and r.items]
+    if not wanted:
+        return
+    ctx = get_segment_context()
+    if ctx is None:
+        return
+
+    hits = [
+        (it, n)
+        for r, n in wanted
+        for it in r.items
+        if it.segment.transcript_id and it.segment.segment_index is not None
+    ]
+    keys = [
+        (str(it.segment.transcript_id), int(it.segment.segment_index or 0))
+        for it, _ in hits
+    ]
+    try:
+        # One lookup at the widest window; narrower requests are trimmed.
+        found = ctx.neighbors(keys, max(n for _, n in wanted))
+        for (it, n), key in zip(hits, keys, strict=True):
+            before, after = found.get(key, ([], []))
+            before = [s for s in before if s.segment_index >= key[1] - n]
+            after = [s for s in after if s.segment_index <= key[1] + n]
+            it.context = SearchContext(
+                before=[_context_segment(s) for s in before],
+                after=[_context_segment(s) for s in after],
+            )
+    except Exception as e:
+        logger.warning("search_context_failed", extra={"error": str(e)})
+
+
+def _run_search(req: SearchRequestV1) -> SearchResponseV1:
+    plan = _plan_search(req)
+
+    lexical = _opensearch_search(plan.lexical_body)
+
+    vector: list[VectorHit] = []
+    if plan.wants_vector:
+        try:
+            vector = vector_search(
+                query_text=plan.query_text,
+                filters=plan.filters.model_dump(exclude_none=True),
+                top_k=plan.fetch_n,
+                group_by=plan.group_by,
+                group_size=plan.group_size,
+            )
+        except VectorSearchError:
+            vector = []
+
+    if vector and _needs_vector_text(plan):
+        _load_vector_sources([(plan, lexical, vector)])
+        (vector,) = _apply_text_operators([(plan, lexical, vector)])
+
+    outcome = _merge_page(plan, lexical, vector)
+    extra = _opensearch_mget(_missing_source_ids(outcome))
+    resp = _build_response(outcome, extra)
+    _hydrate_entities([resp])
+    _attach_context([(resp, req.context)])
+    return resp
+
+
+def _error_result(e: HTTPException) -> SearchBatchResultV1:
+    return SearchBatchResultV1(
+        error=SearchBatchError(status=e.status_code, detail=str(e.detail))
+    )
+
+
+def _run_search_batch(batch: SearchBatchRequestV1) -> SearchBatchResponseV1:
+    """
+    Execute N searches with three backend round-trips instead of ~3N:
+    one `_msearch`, one batched embeddings call and one Qdrant
+    `points/search/batch` (plus one shared `_mget` if vector-only hits need
+    sources). Each item carries either a response or its own error.
+    """
+    results: list[SearchBatchResultV1 | None] = [None] * len(batch.requests)
+
+    plans: list[tuple[int, _SearchPlan]] = []
+    for i, req in enumerate(batch.requests):
+        try:
+            plans.append((i, _plan_search(req)))
+        except HTTPException as e:
+            results[i] = _error_result(e)
+
+    lexical_results = _opensearch_msearch([p.lexical_body for _, p in plans])
+
+    vector_plans = [(i, p) for i, p in plans if p.wants_vector]
+    vector_by_index: dict[int, list[VectorHit]] = {}
+    if vector_plans:
+        try:
+            batched = vector_search_batch(
+                [
+                    VectorQuery(
+                        query_text=p.query_text,
+                        filters=p.filters.model_dump(exclude_none=True),
+                        top_k=p.fetch_n,
+                        group_by=p.group_by,
+                        group_size=p.group_size,
+                    )
+                    for _, p in vector_plans
+                ]
+            )
+            for (i, _), hits in zip(vector_plans, batched, strict=True):
+                vector_by_index[i] = hits
+        except VectorSearchError:
+            # Same degradation as single search: fall back to lexical-only.
+            vector_by_index = {}
+
+    runs: list[tuple[int, _SearchPlan, LexicalResult, list[VectorHit]]] = []
+    for (i, plan), lexical in zip(plans, lexical_results, strict=True):
+        if isinstance(lexical, HTTPException):
+            results[i] = _error_result(lexical)
+            continue
+        runs.append((i, plan, lexical, vector_by_index.get(i, [])))
+
+    if any(v and _needs_vector_text(p) for _, p, _, v in runs):
+        _load_vector_sources([(p, lx, v) for _, p, lx, v in runs])
+        filtered = _apply_text_operators([(p, lx, v) for _, p, lx, v in runs])
+        runs = [(i, p, lx, v) for (i, p, lx, _), v in zip(runs, filtered, strict=True)]
+
+    outcomes: list[tuple[int, _SearchOutcome]] = [
+        (i, _merge_page(plan, lexical, vector)) for i, plan, lexical, vector in runs
+    ]
+
+    missing: list[str] = []
+    for _, outcome in outcomes:
+        missing.extend(_missing_source_ids(outcome))
+    extra = _opensearch_mget(list(dict.fromkeys(missing)))
+
+    for i, outcome in outcomes:
+        try:
+            results[i] = SearchBatchResultV1(response=_build_response(outcome, extra))
+        except HTTPException as e:
+            results[i] = _error_result(e)
+
+    _hydrate_entities([r.response for r in results if r and r.response])
+    _attach_context(
+        [
+            (r.response, req.context)
+            for r, req in zip(results, batch.requests, strict=True)
+            if r and r.response
+        ]
+    )
+    return SearchBatchResponseV1(results=[r for r in results if r is not None])
+
+
+def _run_typeahead(
+    q: str, filters: SearchFiltersModel, limit: int
+) -> SearchTypeaheadResponseV1:
+    query_text = q.strip()
+    if len(query_text) < TYPEAHEAD_MIN_CHARS:
+        return SearchTypeaheadResponseV1(items=[])
+
+    f = _parse_filters(filters)
+    body = build_typeahead_query(
+        query=query_text, filters=f.to_opensearch_filters(), limit=limit
+    )
+    lexical, sources, _, _ = _opensearch_search(body)
+
+    terms = query_terms(query_text)
+    items: list[SearchTypeaheadItem] = []
+    for h in lexical:
+        sid = h["segment_id"]
+        src = sources.get(sid) or {}
+        items.append(
+            SearchTypeaheadItem(
+                segment_id=sid,
+                video_id=src.get("video_id"),
+                speaker_id=src.get("speaker_id"),
+                start_ms=src.get("start_ms"),
+                end_ms=src.get("end_ms"),
+                highlight=make_snippet(
+                    str(src.get("text") or ""), terms, max_chars=80, prefix=True
+                ),
+            )
+        )
+    return SearchTypeaheadResponseV1(items=items)
+
+
+def _opensearch_suggest(prefix: str, kinds: tuple[str, ...]) -> list[Suggestion]:
+    url = f"{_opensearch_url()}/{_suggest_index()}/_search"
+    body = build_suggest_query(prefix, kinds=kinds)
+    return parse_suggest_response(_opensearch_post(url, body, error_label="suggest"))
+
+
+def _run_suggest(q: str, kinds: tuple[str, ...], limit: int) -> SearchSuggestResponseV1:
+    prefix = normalize_prefix(q)
+    if not prefix:
+        return SearchSuggestResponseV1(items=[])
+
+    cache = get_suggest_cache()
+    items = cache.get(prefix, kinds)
+    if items is None:
+        items = _opensearch_suggest(prefix, kinds)
+        cache.set(prefix, kinds, items)
+
+    return SearchSuggestResponseV1(
+        items=[
+            SearchSuggestion(text=s.text, kind=s.kind, score=s.score)
+            for s in items[:limit]
+        ]
+    )
+
+
+@router.get("/suggest", response_model=SearchSuggestResponseV1)
+def search_suggest(
+    q: str = Query(default=""),
+    kind: str | None = Query(default=None),
+    limit: int = Query(default=SUGGEST_DEFAULT_LIMIT, ge=1, le=SUGGEST_MAX_LIMIT),
+) -> SearchSuggestResponseV1:
+    """
+    Autocomplete over frequent phrases, speaker names and video titles. Served
+    from the completion index (never the segments index) behind an in-memory
+    prefix cache. `kind` is a comma-separated subset of phrase,speaker,video.
+    """
+    kinds = SUGGEST_KINDS
+    if kind:
+        kinds = tuple(sorted({k.strip() for k in kind.split(",") if k.strip()}))
+        unknown = [k for k in kinds if k not in SUGGEST_KINDS]
+        if unknown or not kinds:
+            raise HTTPException(
+                status_code=400, detail=f"Invalid suggestion kind: {kind}"
+            )
+    return _run_suggest(q, kinds, limit)
+
+
+@router.get("/typeahead", response_model=SearchTypeaheadResponseV1)
+def search_typeahead(
+    q: str = Query(default=""),
+    language: str | None = Query(default=None),
+    video_id: str | None = Query(default=None),
+    speaker_id: str | None = Query(default=None),
+    limit: int = Query(default=TYPEAHEAD_DEFAULT_LIMIT, ge=1, le=TYPEAHEAD_MAX_LIMIT),
+) -> SearchTypeaheadResponseV1:
+    """
+    Search-as-you-type: lexical only (edge n-grams + fuzzy), no vector leg,
+    no hydration, trimmed `_source`.
+    """
+    return _run_typeahead(
+        q,
+        SearchFiltersModel(language=language, video_id=video_id, speaker_id=speaker_id),
+        limit,
+    )
+
+
+@router.post("/batch", response_model=SearchBatchResponseV1)
+def search_batch(batch: SearchBatchRequestV1) -> SearchBatchResponseV1:
+    return _run_search_batch(batch)
+
+
 @router.post("", response_model=SearchResponseV1)
 def search_post(req: SearchRequestV1) -> SearchResponseV1:
     return _run_search(req)
@@ -456,6 +1187,10 @@ def search_get(
     offset: int = Query(default=0, ge=0),
     semantic: bool | None = Query(default=None),
     mode: Literal["lexical", "semantic", "hybrid"] | None = Query(default=None),
+    group_by: Literal["video_id", "speaker_id"] | None = Query(default=None),
+    group_size: int = Query(default=3, ge=1, le=MAX_GROUP_SIZE),
+    context: int = Query(default=0, ge=0, le=MAX_CONTEXT),
+    dedup: bool = Query(default=False),
 ) -> SearchResponseV1:
     req = SearchRequestV1(
         query=q,
@@ -471,5 +1206,9 @@ def search_get(
         offset=offset,
         semantic=semantic,
         mode=mode,
+        group_by=group_by,
+        group_size=group_size,
+        context=context,
+        dedup=dedup,
     )
     return _run_search(req)
@@ -1,8 +1,10 @@
 from __future__ import annotations
 
-from fastapi import APIRouter, HTTPException, Query
+from fastapi import APIRouter, Depends, HTTPException, Query
 from pydantic import BaseModel, Field
 
+from ..config import settings
+from ..db.aio import statement_timeout
 from ..services.segments_repo import SegmentsRepo, SegmentV1, get_segments_repo
 
 MAX_LIMIT = 100
@@ -53,8 +55,12 @@ def _to_segment_response(s: SegmentV1) -> SegmentResponse:
     )
 
 
-@router.get("", response_model=SegmentsListResponse)
-def list_segments(
+@router.get(
+    "",
+    response_model=SegmentsListResponse,
+    dependencies=[Depends(statement_timeout(settings.db_read_statement_timeout_ms))],
+)
+async def list_segments(
     video_id: str | None = Query(default=None),
     speaker_id: str | None = Query(default=None),
     start_ms_gte: int | None = Query(default=None, ge=0),
@@ -73,7 +79,7 @@ def list_segments(
 
     limit = _clamp_limit(limit)
 
-    items, total = repo.list_segments(
+    items, total = await repo.list_segments(
         video_id=video_id,
         speaker_id=speaker_id,
         start_ms_gte=start_ms_gte,
@@ -89,10 +95,10 @@ def list_segments(
 
 
 @router.get("/{segment_id}", response_model=SegmentResponse)
-def get_segment(segment_id: str) -> SegmentResponse:
+async def get_segment(segment_id: str) -> SegmentResponse:
     repo: SegmentsRepo = get_segments_repo()
 
-    s = repo.get_segment(segment_id)
+    s = await repo.get_segment(segment_id)
     if not s:
         raise HTTPException(
             status_code=404,
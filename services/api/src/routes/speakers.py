@@ -2,9 +2,11 @@ from __future__ import annotations
 
 from datetime import datetime
 
-from fastapi import APIRouter, HTTPException, Query
+from fastapi import APIRouter, Depends, HTTPException, Query
 from pydantic import BaseModel, Field
 
+from ..config import settings
+from ..db.aio import statement_timeout
 from ..services.speakers_repo import SpeakersRepo, SpeakerV1, get_speakers_repo
 
 router = APIRouter(prefix="/speakers", tags=["speakers"])
@@ -45,14 +47,17 @@ def _to_response(s: SpeakerV1) -> SpeakerResponse:
     )
 
 
-@router.get("")
-def list_speakers(
+@router.get(
+    "",
+    dependencies=[Depends(statement_timeout(settings.db_read_statement_timeout_ms))],
+)
+async def list_speakers(
     video_id: str | None = Query(default=None),
     limit: int = Query(default=20, ge=1, le=MAX_LIMIT),
     offset: int = Query(default=0, ge=0),
 ) -> SpeakersListResponse:
     repo: SpeakersRepo = get_speakers_repo()
-    items, total = repo.list_speakers(
+    items, total = await repo.list_speakers(
         video_id=video_id,
         limit=limit,
         offset=offset,
@@ -64,11 +69,11 @@ def list_speakers(
 
 
 @router.get("/{speaker_id}")
-def get_speaker(
+async def get_speaker(
     speaker_id: str,
 ) -> SpeakerResponse:
     repo: SpeakersRepo = get_speakers_repo()
-    s = repo.get_speaker(speaker_id)
+    s = await repo.get_speaker(speaker_id)
     if not s:
         raise HTTPException(
             status_code=404,
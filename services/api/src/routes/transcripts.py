@@ -46,9 +46,9 @@ def _not_found(
 
 
 @router.get("/{transcript_id}", response_model=TranscriptV1)
-def get_transcript(transcript_id: str) -> TranscriptV1:
+async def get_transcript(transcript_id: str) -> TranscriptV1:
     repo = TranscriptsRepo()
-    rec = repo.get_by_id(transcript_id)
+    rec = await repo.get_by_id(transcript_id)
     if not rec:
         raise _not_found(transcript_id=transcript_id)
 
@@ -67,13 +67,13 @@ def get_transcript(transcript_id: str) -> TranscriptV1:
 
 
 @router.get("", response_model=TranscriptV1)
-def get_latest_transcript(
+async def get_latest_transcript(
     video_id: str,
     artifact_bucket: str | None = None,
     artifact_key: str | None = None,
 ) -> TranscriptV1:
     repo = TranscriptsRepo()
-    rec = repo.latest_for_video(
+    rec = await repo.latest_for_video(
         video_id=video_id,
         artifact_bucket=artifact_bucket,
         artifact_key=artifact_key,
@@ -0,0 +1,66 @@
+from __future__ import annotations
+
+import functools
+import socket
+import threading
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.connectionpool import HTTPConnectionPool, HTTPSConnectionPool
+
+
+class _TrackingMixin:
+    def __init__(self, *args, _session: AbortableSession, **kwargs) -> None:
+        super().__init__(*args, **kwargs)
+        self._abortable = _session
+
+    def _new_conn(self):
+        conn = super()._new_conn()
+        self._abortable._track(conn)
+        return conn
+
+
+class _TrackingHTTPPool(_TrackingMixin, HTTPConnectionPool):
+    pass
+
+
+class _TrackingHTTPSPool(_TrackingMixin, HTTPSConnectionPool):
+    pass
+
+
+class AbortableSession(requests.Session):
+    """
+    requests.Session whose in-flight requests another thread can abort.
+
+    `abort()` shuts down the sockets of the session's connections, so a call
+    blocked waiting for the response fails at once with ConnectionError
+    (used to drop the losing attempt of a hedged request).
+    """
+
+    def __init__(self) -> None:
+        super().__init__()
+        self._lock = threading.Lock()
+        self._conns: list = []
+        adapter = HTTPAdapter()
+        adapter.poolmanager.pool_classes_by_scheme = {
+            "http": functools.partial(_TrackingHTTPPool, _session=self),
+            "https": functools.partial(_TrackingHTTPSPool, _session=self),
+        }
+        self.mount("http://", adapter)
+        self.mount("https://", adapter)
+
+    def _track(self, conn) -> None:
+        with self._lock:
+            self._conns.append(conn)
+
+    def abort(self) -> None:
+        with self._lock:
+            conns = list(self._conns)
+        for conn in conns:
+            sock = getattr(conn, "sock", None)
+            if sock is None:
+                continue
+            try:
+                sock.shutdown(socket.SHUT_RDWR)
+            except OSError:
+                pass
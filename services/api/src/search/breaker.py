@@ -0,0 +1,259 @@
+from __future__ import annotations
+
+import os
+import threading
+import time
+from collections import deque
+from collections.abc import Callable
+from dataclasses import dataclass
+from typing import Literal
+
+from prometheus_client import Counter, Gauge
+
+BreakerState = Literal["closed", "open", "half_open"]
+
+_STATE_VALUE: dict[BreakerState, int] = {"closed": 0, "half_open": 1, "open": 2}
+
+BREAKER_STATE = Gauge(
+    "narralytica_search_breaker_state",
+    "Search backend circuit breaker state (0=closed, 1=half_open, 2=open)",
+    ["backend"],
+)
+BREAKER_CALLS = Counter(
+    "narralytica_search_breaker_calls_total",
+    "Search backend calls seen by the circuit breaker",
+    ["backend", "outcome"],
+)
+BREAKER_TIMEOUT = Gauge(
+    "narralytica_search_breaker_timeout_seconds",
+    "Current adaptive request timeout per search backend",
+    ["backend"],
+)
+
+
+class CircuitOpenError(RuntimeError):
+    def __init__(self, backend: str) -> None:
+        super().__init__(f"{backend} circuit open")
+        self.backend = backend
+
+
+def _env_float(name: str, default: float) -> float:
+    raw = (os.environ.get(name) or "").strip()
+    if not raw:
+        return default
+    try:
+        return float(raw)
+    except ValueError:
+        return default
+
+
+def _env_bool(name: str, default: bool) -> bool:
+    v = os.environ.get(name)
+    if v is None:
+        return default
+    return v.strip().lower() in ("1", "true", "yes", "on")
+
+
+@dataclass(frozen=True)
+class BreakerConfig:
+    enabled: bool = True
+    window_s: float = 30.0
+    min_calls: int = 20
+    error_rate: float = 0.5
+    slow_call_s: float = 2.0
+    slow_call_rate: float = 0.5
+    open_s: float = 10.0
+    half_open_calls: int = 3
+    timeout_multiplier: float = 4.0
+    timeout_min_s: float = 0.25
+
+
+def load_breaker_config() -> BreakerConfig:
+    d = BreakerConfig()
+    return BreakerConfig(
+        enabled=_env_bool("SEARCH_BREAKER_ENABLED", d.enabled),
+        window_s=_env_float("SEARCH_BREAKER_WINDOW_S", d.window_s),
+        min_calls=int(_env_float("SEARCH_BREAKER_MIN_CALLS", d.min_calls)),
+        error_rate=_env_float("SEARCH_BREAKER_ERROR_RATE", d.error_rate),
+        slow_call_s=_env_float("SEARCH_BREAKER_SLOW_CALL_MS", 2000) / 1000.0,
+        slow_call_rate=_env_float("SEARCH_BREAKER_SLOW_CALL_RATE", d.slow_call_rate),
+        open_s=_env_float("SEARCH_BREAKER_OPEN_S", d.open_s),
+        half_open_calls=int(
+            _env_float("SEARCH_BREAKER_HALF_OPEN_CALLS", d.half_open_calls)
+        ),
+        timeout_multiplier=_env_float(
+            "SEARCH_TIMEOUT_MULTIPLIER", d.timeout_multiplier
+        ),
+        timeout_min_s=_env_float("SEARCH_TIMEOUT_MIN_MS", 250) / 1000.0,
+    )
+
+
+@dataclass(frozen=True)
+class _Outcome:
+    at: float
+    ok: bool
+    slow: bool
+
+
+class CircuitBreaker:
+    """
+    Per-backend circuit breaker with adaptive timeouts.
+
+    - closed: calls flow; outcomes are kept over a rolling `window_s`.
+      The breaker opens once `min_calls` outcomes are in the window and
+      either the error rate or the slow-call rate crosses its threshold.
+    - open: calls are rejected without touching the network for `open_s`.
+    - half_open: up to `half_open_calls` probes are let through; all of them
+      succeeding closes the breaker, any failure re-opens it.
+
+    Timeouts adapt to the backend: `timeout_s(ceiling)` returns the recent
+    p99 latency times `timeout_multiplier`, clamped to [timeout_min_s, ceiling].
+    """
+
+    def __init__(
+        self,
+        backend: str,
+        config: BreakerConfig | None = None,
+        *,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.backend = backend
+        self.config = config or load_breaker_config()
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._outcomes: deque[_Outcome] = deque()
+        self._latencies: deque[float] = deque(maxlen=256)
+        self._state: BreakerState = "closed"
+        self._opened_at = 0.0
+        self._probes_in_flight = 0
+        self._probe_successes = 0
+        BREAKER_STATE.labels(backend=backend).set(_STATE_VALUE["closed"])
+
+    @property
+    def state(self) -> BreakerState:
+        with self._lock:
+            self._maybe_half_open()
+            return self._state
+
+    def _set_state(self, state: BreakerState) -> None:
+        self._state = state
+        BREAKER_STATE.labels(backend=self.backend).set(_STATE_VALUE[state])
+        if state != "closed":
+            self._opened_at = self._clock()
+            self._outcomes.clear()
+        self._probes_in_flight = 0
+        self._probe_successes = 0
+
+    def _maybe_half_open(self) -> None:
+        # Also re-arms a half-open breaker whose probes never reported back
+        # (e.g. the caller bailed out between allow() and record_*()).
+        if self._state == "closed":
+            return
+        if self._clock() - self._opened_at >= self.config.open_s:
+            self._set_state("half_open")
+
+    def _evict(self, now: float) -> None:
+        horizon = now - self.config.window_s
+        while self._outcomes and self._outcomes[0].at < horizon:
+            self._outcomes.popleft()
+
+    def allow(self) -> bool:
+        """Return True if a call may proceed (reserving a probe if half-open)."""
+        if not self.config.enabled:
+            return True
+        with self._lock:
+            self._maybe_half_open()
+            if self._state == "closed":
+                return True
+            if (
+                self._state == "half_open"
+                and self._probes_in_flight < self.config.half_open_calls
+            ):
+                self._probes_in_flight += 1
+                return True
+        BREAKER_CALLS.labels(backend=self.backend, outcome="rejected").inc()
+        return False
+
+    def record_success(self, latency_s: float) -> None:
+        slow = latency_s >= self.config.slow_call_s
+        BREAKER_CALLS.labels(
+            backend=self.backend, outcome="slow" if slow else "success"
+        ).inc()
+        with self._lock:
+            self._latencies.append(latency_s)
+            if self._state == "half_open":
+                if slow:
+                    self._set_state("open")
+                    return
+                self._probe_successes += 1
+                if self._probe_successes >= self.config.half_open_calls:
+                    self._set_state("closed")
+                return
+            self._record(ok=True, slow=slow)
+
+    def record_failure(self) -> None:
+        BREAKER_CALLS.labels(backend=self.backend, outcome="failure").inc()
+        with self._lock:
+            if self._state == "half_open":
+                self._set_state("open")
+                return
+            self._record(ok=False, slow=False)
+
+    def _record(self, *, ok: bool, slow: bool) -> None:
+        if self._state != "closed":
+            return
+        now = self._clock()
+        self._outcomes.append(_Outcome(at=now, ok=ok, slow=slow))
+        self._evict(now)
+
+        n = len(self._outcomes)
+        if n < self.config.min_calls:
+            return
+        errors = sum(1 for o in self._outcomes if not o.ok)
+        slows = sum(1 for o in self._outcomes if o.slow)
+        if (
+            errors / n >= self.config.error_rate
+            or slows / n >= self.config.slow_call_rate
+        ):
+            self._set_state("open")
+
+    def latency_quantile(self, q: float) -> float | None:
+        """Observed latency quantile over recent successful calls, if known."""
+        with self._lock:
+            if len(self._latencies) < self.config.min_calls:
+                return None
+            ordered = sorted(self._latencies)
+        idx = min(len(ordered) - 1, max(0, int(q * len(ordered))))
+        return ordered[idx]
+
+    def timeout_s(self, ceiling_s: float) -> float:
+        p99 = self.latency_quantile(0.99)
+        if p99 is None:
+            out = ceiling_s
+        else:
+            out = p99 * self.config.timeout_multiplier
+            out = max(self.config.timeout_min_s, min(out, ceiling_s))
+        BREAKER_TIMEOUT.labels(backend=self.backend).set(out)
+        return out
+
+
+_registry: dict[str, CircuitBreaker] = {}
+_registry_lock = threading.Lock()
+
+
+def get_breaker(backend: str) -> CircuitBreaker:
+    b = _registry.get(backend)
+    if b is not None:
+        return b
+    with _registry_lock:
+        b = _registry.get(backend)
+        if b is None:
+            b = CircuitBreaker(backend)
+            _registry[backend] = b
+        return b
+
+
+def reset_breakers() -> None:
+    """Drop all breakers (tests / config reload)."""
+    with _registry_lock:
+        _registry.clear()
@@ -0,0 +1,293 @@
+from __future__ import annotations
+
+import heapq
+import itertools
+import os
+import threading
+import time
+from collections import deque
+from collections.abc import Callable
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import TypeVar
+
+from prometheus_client import Counter
+
+T = TypeVar("T")
+
+HEDGE_EVENTS = Counter(
+    "narralytica_search_hedge_events_total",
+    "Hedged request events per backend",
+    ["backend", "event"],
+)
+
+
+def _env_float(name: str, default: float) -> float:
+    raw = (os.environ.get(name) or "").strip()
+    if not raw:
+        return default
+    try:
+        return float(raw)
+    except ValueError:
+        return default
+
+
+def _env_bool(name: str, default: bool) -> bool:
+    v = os.environ.get(name)
+    if v is None:
+        return default
+    return v.strip().lower() in ("1", "true", "yes", "on")
+
+
+@dataclass(frozen=True)
+class HedgeConfig:
+    enabled: bool = False
+    quantile: float = 0.95
+    max_rate: float = 0.05
+    burst: float = 10.0
+    min_samples: int = 50
+    min_delay_s: float = 0.005
+    max_workers: int = 16
+
+
+def load_hedge_config(prefix: str) -> HedgeConfig:
+    d = HedgeConfig()
+    return HedgeConfig(
+        enabled=_env_bool(f"{prefix}_HEDGE_ENABLED", d.enabled),
+        quantile=_env_float(f"{prefix}_HEDGE_QUANTILE", d.quantile),
+        max_rate=_env_float(f"{prefix}_HEDGE_MAX_RATE", d.max_rate),
+        burst=_env_float(f"{prefix}_HEDGE_BURST", d.burst),
+        min_samples=int(_env_float(f"{prefix}_HEDGE_MIN_SAMPLES", d.min_samples)),
+        min_delay_s=_env_float(f"{prefix}_HEDGE_MIN_DELAY_MS", 5) / 1000.0,
+        max_workers=int(_env_float(f"{prefix}_HEDGE_MAX_WORKERS", d.max_workers)),
+    )
+
+
+class HedgePolicy:
+    """
+    Decides when (and whether) to send a backup request.
+
+    - delay: observed `quantile` of primary-attempt latencies; no hedging until
+      `min_samples` latencies have been seen.
+    - budget: token bucket where every request earns `max_rate` tokens (capped
+      at `burst`) and every hedge spends one, so hedges stay under
+      `max_rate` of traffic even when the backend is uniformly slow.
+
+    Only primary attempts feed the latency window: if winners were recorded,
+    hedging would drag the observed p95 down and hedge ever more eagerly.
+    """
+
+    def __init__(self, backend: str, config: HedgeConfig) -> None:
+        self.backend = backend
+        self.config = config
+        self._lock = threading.Lock()
+        self._latencies: deque[float] = deque(maxlen=512)
+        self._tokens = 0.0
+
+    def record_primary_latency(self, latency_s: float) -> None:
+        with self._lock:
+            self._latencies.append(latency_s)
+
+    def delay_s(self) -> float | None:
+        with self._lock:
+            if len(self._latencies) < self.config.min_samples:
+                return None
+            ordered = sorted(self._latencies)
+        idx = min(len(ordered) - 1, int(self.config.quantile * len(ordered)))
+        return max(self.config.min_delay_s, ordered[idx])
+
+    def note_request(self) -> None:
+        with self._lock:
+            self._tokens = min(self.config.burst, self._tokens + self.config.max_rate)
+
+    def try_acquire(self) -> bool:
+        with self._lock:
+            if self._tokens < 1.0:
+                return False
+            self._tokens -= 1.0
+            return True
+
+
+class _Timer:
+    """One daemon thread running delayed callbacks (hedge sends)."""
+
+    def __init__(self, name: str) -> None:
+        self._name = name
+        self._cv = threading.Condition()
+        self._heap: list[list] = []
+        self._seq = itertools.count()
+        self._thread: threading.Thread | None = None
+
+    def schedule(self, delay_s: float, fn: Callable[[], None]) -> list:
+        """Returns a handle for `cancel`."""
+        entry = [time.monotonic() + delay_s, next(self._seq), fn]
+        with self._cv:
+            heapq.heappush(self._heap, entry)
+            if self._thread is None:
+                self._thread = threading.Thread(
+                    target=self._run, name=self._name, daemon=True
+                )
+                self._thread.start()
+            self._cv.notify()
+        return entry
+
+    @staticmethod
+    def cancel(entry: list) -> None:
+        entry[2] = None
+
+    def _run(self) -> None:
+        while True:
+            with self._cv:
+                while not self._heap:
+                    self._cv.wait()
+                wait_s = self._heap[0][0] - time.monotonic()
+                if wait_s > 0:
+                    self._cv.wait(wait_s)
+                    continue
+                fn = heapq.heappop(self._heap)[2]
+            if fn is not None:
+                fn()
+
+
+class Hedger:
+    """
+    Runs a call with at most one hedge, returning the first acceptable result.
+
+    The primary attempt runs on the calling thread; only hedges go to the
+    executor (`max_workers` caps concurrent hedges, not backend reads), so the
+    hedge delay is measured from when the primary actually started.
+    """
+
+    def __init__(self, backend: str, config: HedgeConfig) -> None:
+        self.backend = backend
+        self.config = config
+        self.policy = HedgePolicy(backend, config)
+        self._executor: ThreadPoolExecutor | None = None
+        self._executor_lock = threading.Lock()
+        self._timer = _Timer(f"hedge-timer-{backend}")
+
+    def _pool(self) -> ThreadPoolExecutor:
+        if self._executor is None:
+            with self._executor_lock:
+                if self._executor is None:
+                    self._executor = ThreadPoolExecutor(
+                        max_workers=max(1, self.config.max_workers),
+                        thread_name_prefix=f"hedge-{self.backend}",
+                    )
+        return self._executor
+
+    def call(
+        self,
+        fn: Callable[[int], T],
+        *,
+        accept: Callable[[T], bool] | None = None,
+        cancel: Callable[[int], None] | None = None,
+    ) -> T:
+        """
+        `fn(attempt)` performs one attempt; attempt 0 is the primary and
+        attempt 1 the hedge (callers use it to pick another shard copy).
+
+        `accept(result)` decides whether a returned result may win (e.g. not
+        a 5xx); `cancel(attempt)` aborts the losing attempt so the calling
+        thread is released as soon as the hedge wins. Without `cancel`, a
+        winning hedge is returned once the primary finishes.
+        """
+        if not self.config.enabled:
+            return fn(0)
+
+        self.policy.note_request()
+        delay = self.policy.delay_s()
+        if delay is None:
+            return self._timed_primary(fn)
+
+        ok = accept or (lambda _: True)
+        lock = threading.Lock()
+        primary_done = False
+        hedge: Future[T] | None = None
+        hedge_won: list[T] = []
+
+        def run_hedge() -> T:
+            out = fn(1)
+            with lock:
+                won = not primary_done and ok(out)
+                if won:
+                    hedge_won.append(out)
+            if won and cancel is not None:
+                cancel(0)
+            return out
+
+        def send_hedge() -> None:
+            nonlocal hedge
+            with lock:
+                if primary_done:
+                    return
+                if not self.policy.try_acquire():
+                    HEDGE_EVENTS.labels(
+                        backend=self.backend, event="budget_exhausted"
+                    ).inc()
+                    return
+                hedge = self._pool().submit(run_hedge)
+            HEDGE_EVENTS.labels(backend=self.backend, event="sent").inc()
+
+        timer = self._timer.schedule(delay, send_hedge)
+        start = time.perf_counter()
+        out: T | None = None
+        err: Exception | None = None
+        try:
+            out = fn(0)
+        except Exception as e:
+            err = e
+        # Lower bound when the primary was aborted; still the best signal.
+        self.policy.record_primary_latency(time.perf_counter() - start)
+        with lock:
+            primary_done = True
+            self._timer.cancel(timer)
+            pending = hedge
+
+        if hedge_won:
+            HEDGE_EVENTS.labels(backend=self.backend, event="won").inc()
+            return hedge_won[0]
+        if pending is not None:
+            if err is None and ok(out):
+                if cancel is not None:
+                    cancel(1)
+            else:
+                try:
+                    alt = pending.result()
+                except Exception:
+                    pass
+                else:
+                    if ok(alt):
+                        HEDGE_EVENTS.labels(backend=self.backend, event="won").inc()
+                        return alt
+        if err is not None:
+            raise err
+        return out  # type: ignore[return-value]
+
+    def _timed_primary(self, fn: Callable[[int], T]) -> T:
+        start = time.perf_counter()
+        out = fn(0)
+        self.policy.record_primary_latency(time.perf_counter() - start)
+        return out
+
+
+_hedgers: dict[str, Hedger] = {}
+_hedgers_lock = threading.Lock()
+
+
+def get_hedger(backend: str, env_prefix: str) -> Hedger:
+    h = _hedgers.get(backend)
+    if h is not None:
+        return h
+    with _hedgers_lock:
+        h = _hedgers.get(backend)
+        if h is None:
+            h = Hedger(backend, load_hedge_config(env_prefix))
+            _hedgers[backend] = h
+        return h
+
+
+def reset_hedgers() -> None:
+    """Drop all hedgers (tests / config reload)."""
+    with _hedgers_lock:
+        _hedgers.clear()
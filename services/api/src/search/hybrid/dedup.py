@@ -0,0 +1,90 @@
+from __future__ import annotations
+
+from heapq import nsmallest
+
+from packages.shared.ids.minhash import word_shingles
+
+from .merge import HybridItem
+
+DEFAULT_THRESHOLD = 0.8
+SKETCH_SIZE = 4
+
+
+def shingle_hashes(text: str) -> frozenset[int]:
+    """
+    Hashed 3-word shingles of `text`, tokenized exactly like the stored
+    MinHash signatures (packages/shared/ids/minhash.py).
+
+    Shingles are word tuples hashed with the builtin `hash` (which reuses
+    each word's cached string hash) via map, so the per-shingle work stays
+    in C. The hash is process-salted: only compared within one process, never
+    stored.
+    """
+    return frozenset(map(hash, word_shingles(text)))
+
+
+def jaccard(a: frozenset[int], b: frozenset[int]) -> float:
+    if not a or not b:
+        return 0.0
+    inter = len(a & b)
+    return inter / (len(a) + len(b) - inter)
+
+
+def collapse_near_duplicates(
+    merged: list[HybridItem],
+    texts: dict[str, str],
+    *,
+    threshold: float = DEFAULT_THRESHOLD,
+) -> tuple[list[HybridItem], dict[str, int]]:
+    """
+    Keep one representative per cluster of near-identical segments
+    (re-uploads, reposted clips).
+
+    Greedy, in rank order: a hit is dropped when its shingle Jaccard
+    similarity to an already kept hit reaches `threshold`, so the
+    representative is always the best-ranked copy. Hits without text are kept
+    as they are.
+
+    Candidates come from a bottom-k sketch (the SKETCH_SIZE smallest shingle
+    hashes): two sets with Jaccard >= 0.8 share their overall minimum with
+    probability >= 0.8, so sharing none of the bottom 4 is rare. Only those
+    pairs get an exact comparison; unrelated hits cost a few dict lookups.
+
+    Returns (kept, duplicates per kept segment_id).
+    """
+    kept: list[HybridItem] = []
+    reps: list[tuple[str, frozenset[int]]] = []
+    by_sketch: dict[int, list[int]] = {}
+    duplicates: dict[str, int] = {}
+
+    for it in merged:
+        text = texts.get(it.segment_id)
+        if not text:
+            kept.append(it)
+            continue
+
+        sh = shingle_hashes(text)
+        sketch = nsmallest(SKETCH_SIZE, sh)
+
+        dup_of = None
+        seen: set[int] = set()
+        for h in sketch:
+            for r in by_sketch.get(h, ()):
+                if r in seen:
+                    continue
+                seen.add(r)
+                if jaccard(sh, reps[r][1]) >= threshold:
+                    dup_of = reps[r][0]
+                    break
+            if dup_of is not None:
+                break
+
+        if dup_of is None:
+            kept.append(it)
+            for h in sketch:
+                by_sketch.setdefault(h, []).append(len(reps))
+            reps.append((it.segment_id, sh))
+        else:
+            duplicates[dup_of] = duplicates.get(dup_of, 0) + 1
+
+    return kept, duplicates
@@ -0,0 +1,47 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+
+from .merge import HybridItem
+
+
+@dataclass(frozen=True)
+class ResultGroup:
+    key: str | None
+    score: float
+    items: list[HybridItem]
+
+
+def group_results(
+    merged: list[HybridItem],
+    *,
+    group_keys: dict[str, str | None],
+    group_size: int,
+) -> list[ResultGroup]:
+    """
+    Collapse merged hits into groups (e.g. per video or per speaker).
+
+    - a group's score is its best member's combined score
+    - each group keeps its `group_size` best members
+    - segments without a key are kept as singleton groups rather than being
+      lumped together under a fake "null" key
+
+    Determinism: groups sort by (-score, key), members by (-score, segment_id).
+    """
+    buckets: dict[str, list[HybridItem]] = {}
+    keys: dict[str, str | None] = {}
+
+    for it in merged:
+        key = group_keys.get(it.segment_id)
+        bucket_id = f"k:{key}" if key is not None else f"s:{it.segment_id}"
+        buckets.setdefault(bucket_id, []).append(it)
+        keys[bucket_id] = key
+
+    out: list[ResultGroup] = []
+    for bucket_id, members in buckets.items():
+        members.sort(key=lambda x: (-x.score, x.segment_id))
+        top = members[: max(1, group_size)]
+        out.append(ResultGroup(key=keys[bucket_id], score=top[0].score, items=top))
+
+    out.sort(key=lambda g: (-g.score, g.key or "", g.items[0].segment_id))
+    return out
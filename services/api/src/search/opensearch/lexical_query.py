@@ -5,6 +5,14 @@ from typing import Any
 MAX_LIMIT = 100
 DEFAULT_LIMIT = 20
 
+# Index-only fields (duplicate detection) never needed to render a hit.
+SOURCE_EXCLUDES = ["minhash", "minhash_bands"]
+
+TYPEAHEAD_MAX_LIMIT = 20
+TYPEAHEAD_DEFAULT_LIMIT = 8
+# Just enough to render a suggestion row; keeps fetch/parse time down.
+TYPEAHEAD_SOURCE = ["video_id", "speaker_id", "start_ms", "end_ms", "text"]
+
 
 def clamp_limit(limit: int | None) -> int:
     if limit is None:
@@ -18,11 +26,26 @@ def build_lexical_query(
     filters: dict | None,
     limit: int | None,
     offset: int | None,
+    collapse_field: str | None = None,
+    group_size: int | None = None,
+    phrases: list[str] | tuple[str, ...] | None = None,
+    exclude: list[str] | tuple[str, ...] | None = None,
 ) -> dict[str, Any]:
+    """
+    Build the OpenSearch segments query.
+
+    `phrases` must each appear verbatim (match_phrase); `exclude` words or
+    phrases must not appear (must_not).
+
+    With `collapse_field`, hits are collapsed per field value (one top hit per
+    group, `size` counts groups) and the best `group_size` segments of each
+    group come back as `inner_hits.top`.
+    """
     size = clamp_limit(limit)
     from_ = max(0, int(offset or 0))
 
     must: list[dict] = []
+    must_not: list[dict] = []
     filter_clauses: list[dict] = []
 
     if query and query.strip():
@@ -37,6 +60,11 @@ def build_lexical_query(
             }
         )
 
+    for p in phrases or ():
+        must.append({"match_phrase": {"text": p}})
+    for x in exclude or ():
+        must_not.append({"match_phrase": {"text": x}})
+
     if filters:
         compiled = filters.get("__compiled__")
         if isinstance(compiled, list):
@@ -59,13 +87,15 @@ def build_lexical_query(
             if date_range:
                 filter_clauses.append({"range": {"created_at": date_range}})
 
-    if must or filter_clauses:
+    if must or must_not or filter_clauses:
         query_block = {
             "bool": {
                 "must": must if must else [{"match_all": {}}],
                 "filter": filter_clauses,
             }
         }
+        if must_not:
+            query_block["bool"]["must_not"] = must_not
     else:
         query_block = {"match_all": {}}
 
@@ -74,13 +104,85 @@ def build_lexical_query(
     # do not have a mapped "id" field.
     # Sorting on an unmapped field makes OpenSearch return 400.
     # Use "_id" as a stable tiebreaker instead.
-    return {
+    sort = [
+        {"_score": {"order": "desc"}},
+        {"created_at": {"order": "desc"}},
+        {"_id": {"order": "asc"}},
+    ]
+    body: dict[str, Any] = {
         "from": from_,
         "size": size,
         "query": query_block,
-        "sort": [
-            {"_score": {"order": "desc"}},
-            {"created_at": {"order": "desc"}},
-            {"_id": {"order": "asc"}},
-        ],
+        "sort": sort,
+        "_source": {"excludes": SOURCE_EXCLUDES},
+    }
+
+    if collapse_field:
+        body["collapse"] = {
+            "field": collapse_field,
+            "inner_hits": {
+                "name": "top",
+                "size": max(1, int(group_size or 1)),
+                "sort": sort,
+                "_source": {"excludes": SOURCE_EXCLUDES},
+            },
+        }
+
+    return body
+
+
+def build_typeahead_query(
+    *,
+    query: str,
+    filters: list[dict] | None,
+    limit: int | None,
+) -> dict[str, Any]:
+    """
+    Search-as-you-type query over the edge-ngram `text.prefix` subfield.
+
+    The partially typed last word matches through its index-side edge n-grams
+    (no query-time prefix expansion); a fuzzy leg on `text` tolerates typos in
+    completed words. No sorting tiebreakers, highlighting or total hit count:
+    the box only needs the top few rows, fast.
+    """
+    size = max(1, min(int(limit or TYPEAHEAD_DEFAULT_LIMIT), TYPEAHEAD_MAX_LIMIT))
+
+    return {
+        "size": size,
+        "_source": TYPEAHEAD_SOURCE,
+        "track_total_hits": False,
+        "query": {
+            "bool": {
+                "must": [
+                    {
+                        "bool": {
+                            "should": [
+                                {
+                                    "match": {
+                                        "text.prefix": {
+                                            "query": query,
+                                            "operator": "and",
+                                            "boost": 2.0,
+                                        }
+                                    }
+                                },
+                                {
+                                    "match": {
+                                        "text": {
+                                            "query": query,
+                                            "operator": "and",
+                                            "fuzziness": "AUTO",
+                                            "prefix_length": 1,
+                                            "max_expansions": 20,
+                                        }
+                                    }
+                                },
+                            ],
+                            "minimum_should_match": 1,
+                        }
+                    }
+                ],
+                "filter": list(filters or []),
+            }
+        },
     }
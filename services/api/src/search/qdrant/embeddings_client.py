@@ -1,10 +1,13 @@
 from __future__ import annotations
 
 import os
-from dataclasses import dataclass
+import time
+from dataclasses import dataclass, replace
 
 import requests
 
+from ..breaker import CircuitOpenError, get_breaker
+
 
 class EmbeddingsNotConfiguredError(RuntimeError):
     pass
@@ -44,41 +47,68 @@ def load_embeddings_config() -> EmbeddingsConfig:
 
 
 def embed_text(query_text: str) -> list[float]:
-    cfg = load_embeddings_config()
     text = (query_text or "").strip()
     if not text:
         raise ValueError("query_text is empty")
-
-    payload = {"model": cfg.model, "texts": [text]}
-
-    r = requests.post(
-        f"{cfg.url}/embeddings",
-        json=payload,
-        timeout=cfg.timeout_s,
-    )
-    r.raise_for_status()
-    data = r.json()
+    return embed_texts([text])[0]
+
+
+def embed_texts(
+    texts: list[str],
+    *,
+    model: str | None = None,
+    vector_size: int | None = None,
+    breaker_name: str = "embeddings",
+) -> list[list[float]]:
+    """
+    Embed several texts in a single provider call.
+
+    Output order matches input order; duplicate texts are sent once.
+    `model`/`vector_size` override the configured model (e.g. the shadow
+    model during an embedding upgrade).
+    """
+    cfg = load_embeddings_config()
+    if model:
+        cfg = replace(cfg, model=model, vector_size=vector_size or cfg.vector_size)
+    cleaned = [(t or "").strip() for t in texts]
+    if not cleaned or any(not t for t in cleaned):
+        raise ValueError("texts must be non-empty")
+
+    unique = list(dict.fromkeys(cleaned))
+    payload = {"model": cfg.model, "texts": unique}
+
+    breaker = get_breaker(breaker_name)
+    if not breaker.allow():
+        raise CircuitOpenError(breaker_name)
+
+    start = time.perf_counter()
+    try:
+        r = requests.post(
+            f"{cfg.url}/embeddings",
+            json=payload,
+            timeout=breaker.timeout_s(cfg.timeout_s),
+        )
+        r.raise_for_status()
+        data = r.json()
+    except (requests.RequestException, ValueError):
+        breaker.record_failure()
+        raise
+    breaker.record_success(time.perf_counter() - start)
 
     vectors = data.get("vectors") or data.get("embeddings") or data.get("data")
-
-    if isinstance(vectors, list) and vectors and isinstance(vectors[0], list):
-        vec = vectors[0]
-    elif (
-        isinstance(vectors, list)
-        and vectors
-        and isinstance(vectors[0], dict)
-        and "embedding" in vectors[0]
-    ):
-        vec = vectors[0]["embedding"]
-    else:
+    if not isinstance(vectors, list) or len(vectors) != len(unique):
         raise RuntimeError("invalid embeddings response shape")
 
-    if not isinstance(vec, list):
-        raise RuntimeError("embedding vector is not a list")
-
-    if len(vec) != cfg.vector_size:
-        got = len(vec)
-        expected = cfg.vector_size
-        raise RuntimeError(f"embedding dim mismatch: got={got} expected={expected}")
-
-    return vec
+    by_text: dict[str, list[float]] = {}
+    for text, raw in zip(unique, vectors, strict=True):
+        if isinstance(raw, dict) and "embedding" in raw:
+            raw = raw["embedding"]
+        if not isinstance(raw, list):
+            raise RuntimeError("embedding vector is not a list")
+        if len(raw) != cfg.vector_size:
+            got = len(raw)
+            expected = cfg.vector_size
+            raise RuntimeError(f"embedding dim mismatch: got={got} expected={expected}")
+        by_text[text] = raw
+
+    return [by_text[t] for t in cleaned]
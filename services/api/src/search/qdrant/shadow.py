@@ -0,0 +1,155 @@
+from __future__ import annotations
+
+import logging
+import os
+import random
+import threading
+from collections.abc import Callable
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+
+from prometheus_client import Counter, Histogram
+
+logger = logging.getLogger(__name__)
+
+SHADOW_EVENTS = Counter(
+    "narralytica_search_vector_shadow_total",
+    "Shadow vector reads by outcome (ok, error, dropped)",
+    ["outcome"],
+)
+SHADOW_OVERLAP = Histogram(
+    "narralytica_search_vector_shadow_overlap_ratio",
+    "Share of primary vector hits also returned by the shadow collection",
+    buckets=(0.1, 0.2, 0.3, 0.4, 0.5, 0.6, 0.7, 0.8, 0.9, 0.95, 1.0),
+)
+VECTOR_LATENCY = Histogram(
+    "narralytica_search_vector_latency_seconds",
+    "Vector search latency (embedding + Qdrant) by role",
+    ["role"],
+    buckets=(0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5),
+)
+
+
+def _env_float(name: str, default: float) -> float:
+    raw = (os.environ.get(name) or "").strip()
+    if not raw:
+        return default
+    try:
+        return float(raw)
+    except ValueError:
+        return default
+
+
+@dataclass(frozen=True)
+class ShadowConfig:
+    """
+    Second (collection, embedding model) pair read alongside the primary one
+    during an embedding-model upgrade. Results are compared, never returned.
+    """
+
+    collection: str
+    model: str
+    vector_size: int
+    sample_rate: float = 0.1
+    max_inflight: int = 4
+
+
+def load_shadow_config() -> ShadowConfig | None:
+    collection = (os.environ.get("QDRANT_SHADOW_COLLECTION") or "").strip()
+    model = (os.environ.get("EMBEDDING_SHADOW_MODEL") or "").strip()
+    if not collection or not model:
+        return None
+    size = _env_float(
+        "EMBEDDING_SHADOW_VECTOR_SIZE", _env_float("EMBEDDING_VECTOR_SIZE", 1024)
+    )
+    return ShadowConfig(
+        collection=collection,
+        model=model,
+        vector_size=int(size),
+        sample_rate=min(1.0, max(0.0, _env_float("QDRANT_SHADOW_READ_RATE", 0.1))),
+        max_inflight=max(1, int(_env_float("QDRANT_SHADOW_MAX_INFLIGHT", 4))),
+    )
+
+
+def overlap(primary: list[str], shadow: list[str]) -> float:
+    """Share of primary ids the shadow also returned (1.0 when both empty)."""
+    if not primary:
+        return 1.0 if not shadow else 0.0
+    return len(set(primary) & set(shadow)) / len(primary)
+
+
+class ShadowReader:
+    """
+    Runs shadow reads off the request path: sampled, on a small thread pool,
+    and dropped (not queued) when `max_inflight` are already running, so a
+    slow shadow collection can never add latency or pile up work.
+    """
+
+    def __init__(self, config: ShadowConfig) -> None:
+        self.config = config
+        self._slots = threading.BoundedSemaphore(config.max_inflight)
+        self._pool = ThreadPoolExecutor(
+            max_workers=config.max_inflight, thread_name_prefix="vector-shadow"
+        )
+
+    def sampled(self) -> bool:
+        return random.random() < self.config.sample_rate
+
+    def submit(
+        self,
+        primary_ids: list[list[str]],
+        run: Callable[[], list[list[str]]],
+    ) -> None:
+        """
+        Run `run` (the shadow searches, one id list per query) and record
+        overlap with `primary_ids` plus shadow latency.
+        """
+        if not self._slots.acquire(blocking=False):
+            SHADOW_EVENTS.labels(outcome="dropped").inc()
+            return
+        try:
+            self._pool.submit(self._run, primary_ids, run)
+        except RuntimeError:
+            self._slots.release()
+            SHADOW_EVENTS.labels(outcome="dropped").inc()
+
+    def _run(
+        self, primary_ids: list[list[str]], run: Callable[[], list[list[str]]]
+    ) -> None:
+        try:
+            with VECTOR_LATENCY.labels(role="shadow").time():
+                shadow_ids = run()
+            for p, s in zip(primary_ids, shadow_ids, strict=True):
+                SHADOW_OVERLAP.observe(overlap(p, s))
+            SHADOW_EVENTS.labels(outcome="ok").inc()
+        except Exception as e:
+            SHADOW_EVENTS.labels(outcome="error").inc()
+            logger.debug("vector shadow read failed: %s", e)
+        finally:
+            self._slots.release()
+
+
+_reader: ShadowReader | None = None
+_reader_loaded = False
+_reader_lock = threading.Lock()
+
+
+def get_shadow_reader() -> ShadowReader | None:
+    """Process-wide shadow reader, or None when no shadow is configured."""
+    global _reader, _reader_loaded
+    if _reader_loaded:
+        return _reader
+    with _reader_lock:
+        if not _reader_loaded:
+            cfg = load_shadow_config()
+            _reader = ShadowReader(cfg) if cfg else None
+            _reader_loaded = True
+        return _reader
+
+
+def reset_shadow_reader() -> None:
+    """Drop the shadow reader (tests / config reload)."""
+    global _reader, _reader_loaded
+    with _reader_lock:
+        _reader = None
+        _reader_loaded = False
@@ -1,13 +1,16 @@
 from __future__ import annotations
 
 import os
+import time
 from dataclasses import dataclass
 from typing import Any
 
 import requests
 
-from .embeddings_client import EmbeddingsNotConfiguredError, embed_text
+from ..breaker import get_breaker
+from .embeddings_client import EmbeddingsNotConfiguredError, embed_text, embed_texts
 from .filters import build_qdrant_filter
+from .shadow import VECTOR_LATENCY, ShadowConfig, get_shadow_reader
 
 MAX_TOP_K = 50
 DEFAULT_TOP_K = 10
@@ -21,6 +24,16 @@ class VectorSearchError(RuntimeError):
 class VectorHit:
     segment_id: str
     score: float
+    group_key: str | None = None
+
+
+@dataclass(frozen=True)
+class VectorQuery:
+    query_text: str
+    filters: dict | None
+    top_k: int | None
+    group_by: str | None = None
+    group_size: int | None = None
 
 
 def clamp_top_k(top_k: int | None) -> int:
@@ -29,12 +42,7 @@ def clamp_top_k(top_k: int | None) -> int:
     return max(1, min(int(top_k), MAX_TOP_K))
 
 
-def vector_search(
-    *,
-    query_text: str,
-    filters: dict | None,
-    top_k: int | None,
-) -> list[VectorHit]:
+def _qdrant_target() -> tuple[str, str, float]:
     qdrant_url = (
         (os.environ.get("QDRANT_URL") or "http://localhost:6333").strip().rstrip("/")
     )
@@ -42,16 +50,10 @@ def vector_search(
         os.environ.get("QDRANT_SEGMENTS_COLLECTION") or "narralytica-segments-v1"
     ).strip()
     timeout_s = float((os.environ.get("QDRANT_TIMEOUT_S") or "10").strip() or "10")
+    return qdrant_url, collection, timeout_s
 
-    k = clamp_top_k(top_k)
-
-    try:
-        vector = embed_text(query_text)
-    except EmbeddingsNotConfiguredError as e:
-        raise VectorSearchError(str(e)) from e
-    except Exception as e:
-        raise VectorSearchError(f"embeddings error: {e}") from e
 
+def _search_body(vector: list[float], filters: dict | None, k: int) -> dict[str, Any]:
     q_filter = build_qdrant_filter(filters)
 
     body: dict[str, Any] = {
@@ -62,19 +64,10 @@ def vector_search(
     }
     if q_filter:
         body["filter"] = q_filter
+    return body
 
-    try:
-        r = requests.post(
-            f"{qdrant_url}/collections/{collection}/points/search",
-            json=body,
-            timeout=timeout_s,
-        )
-        r.raise_for_status()
-    except requests.RequestException as e:
-        raise VectorSearchError(f"qdrant query failed: {e}") from e
 
-    data = r.json()
-    result = data.get("result")
+def _parse_hits(result: Any) -> list[VectorHit]:
     if not isinstance(result, list):
         raise VectorSearchError("invalid qdrant response shape")
 
@@ -87,5 +80,231 @@ def vector_search(
         if sid is None or score is None:
             continue
         out.append(VectorHit(segment_id=str(sid), score=float(score)))
+    return out
+
+
+def _parse_groups(result: Any) -> list[VectorHit]:
+    groups = result.get("groups") if isinstance(result, dict) else None
+    if not isinstance(groups, list):
+        raise VectorSearchError("invalid qdrant groups response shape")
+
+    out: list[VectorHit] = []
+    for g in groups:
+        if not isinstance(g, dict):
+            continue
+        key = g.get("id")
+        for h in _parse_hits(g.get("hits")):
+            out.append(
+                VectorHit(
+                    segment_id=h.segment_id,
+                    score=h.score,
+                    group_key=str(key) if key is not None else None,
+                )
+            )
+    return out
+
+
+def _grouped_search(
+    vector: list[float],
+    filters: dict | None,
+    k: int,
+    *,
+    group_by: str,
+    group_size: int | None,
+    collection: str | None = None,
+    breaker_name: str = "qdrant",
+) -> list[VectorHit]:
+    """Grouped top-k: best `group_size` points for each of `k` groups."""
+    body = _search_body(vector, filters, k)
+    body["group_by"] = group_by
+    body["group_size"] = max(1, int(group_size or 1))
+    return _parse_groups(
+        _qdrant_post(
+            "points/search/groups",
+            body,
+            collection=collection,
+            breaker_name=breaker_name,
+        )
+    )
+
+
+def _qdrant_post(
+    path: str,
+    body: dict[str, Any],
+    *,
+    collection: str | None = None,
+    breaker_name: str = "qdrant",
+) -> Any:
+    qdrant_url, default_collection, timeout_s = _qdrant_target()
+    collection = collection or default_collection
+
+    breaker = get_breaker(breaker_name)
+    if not breaker.allow():
+        raise VectorSearchError(f"{breaker_name} circuit open")
+
+    start = time.perf_counter()
+    try:
+        r = requests.post(
+            f"{qdrant_url}/collections/{collection}/{path}",
+            json=body,
+            timeout=breaker.timeout_s(timeout_s),
+        )
+        r.raise_for_status()
+        data = r.json()
+    except (requests.RequestException, ValueError) as e:
+        breaker.record_failure()
+        raise VectorSearchError(f"qdrant query failed: {e}") from e
+    breaker.record_success(time.perf_counter() - start)
+
+    return data.get("result") if isinstance(data, dict) else None
+
+
+def _fail_fast_if_open() -> None:
+    # Fail fast without paying for an embedding when Qdrant is known sick.
+    if get_breaker("qdrant").state == "open":
+        raise VectorSearchError("qdrant circuit open")
+
+
+def _run_searches(
+    queries: list[VectorQuery],
+    vectors: list[list[float]],
+    *,
+    batch: bool,
+    collection: str | None = None,
+    breaker_name: str = "qdrant",
+) -> list[list[VectorHit]]:
+    """Qdrant searches for embedded queries; `batch` uses `points/search/batch`."""
+    out: list[list[VectorHit]] = [[] for _ in queries]
+
+    def post(path: str, body: dict[str, Any]) -> Any:
+        return _qdrant_post(
+            path, body, collection=collection, breaker_name=breaker_name
+        )
+
+    # Qdrant has no batch form of search/groups: grouped queries go one by one
+    # (still sharing the single embeddings call).
+    plain: list[int] = []
+    for i, (q, vec) in enumerate(zip(queries, vectors, strict=True)):
+        if q.group_by:
+            out[i] = _grouped_search(
+                vec,
+                q.filters,
+                clamp_top_k(q.top_k),
+                group_by=q.group_by,
+                group_size=q.group_size,
+                collection=collection,
+                breaker_name=breaker_name,
+            )
+        else:
+            plain.append(i)
+
+    bodies = [
+        _search_body(vectors[i], queries[i].filters, clamp_top_k(queries[i].top_k))
+        for i in plain
+    ]
+    if plain and not batch:
+        for i, body in zip(plain, bodies, strict=True):
+            out[i] = _parse_hits(post("points/search", body))
+    elif plain:
+        result = post("points/search/batch", {"searches": bodies})
+        if not isinstance(result, list) or len(result) != len(plain):
+            raise VectorSearchError("invalid qdrant batch response shape")
+        for i, r in zip(plain, result, strict=True):
+            out[i] = _parse_hits(r)
 
     return out
+
+
+def _shadow_search(
+    cfg: ShadowConfig, queries: list[VectorQuery], *, batch: bool
+) -> list[list[str]]:
+    vectors = embed_texts(
+        [q.query_text for q in queries],
+        model=cfg.model,
+        vector_size=cfg.vector_size,
+        breaker_name="embeddings_shadow",
+    )
+    results = _run_searches(
+        queries,
+        vectors,
+        batch=batch,
+        collection=cfg.collection,
+        breaker_name="qdrant_shadow",
+    )
+    return [[h.segment_id for h in hits] for hits in results]
+
+
+def _maybe_shadow(
+    queries: list[VectorQuery], results: list[list[VectorHit]], *, batch: bool
+) -> None:
+    """
+    Embedding-model upgrade: replay a sample of the queries against the
+    shadow (collection, model) in the background and record how much its top
+    hits overlap the primary ones, and how long it took.
+    """
+    reader = get_shadow_reader()
+    if reader is None or not reader.sampled():
+        return
+    primary_ids = [[h.segment_id for h in hits] for hits in results]
+    reader.submit(
+        primary_ids, lambda: _shadow_search(reader.config, queries, batch=batch)
+    )
+
+
+def _search(queries: list[VectorQuery], *, batch: bool) -> list[list[VectorHit]]:
+    _fail_fast_if_open()
+
+    with VECTOR_LATENCY.labels(role="primary").time():
+        try:
+            if batch:
+                vectors = embed_texts([q.query_text for q in queries])
+            else:
+                vectors = [embed_text(q.query_text) for q in queries]
+        except EmbeddingsNotConfiguredError as e:
+            raise VectorSearchError(str(e)) from e
+        except Exception as e:
+            raise VectorSearchError(f"embeddings error: {e}") from e
+
+        out = _run_searches(queries, vectors, batch=batch)
+
+    _maybe_shadow(queries, out, batch=batch)
+    return out
+
+
+def vector_search(
+    *,
+    query_text: str,
+    filters: dict | None,
+    top_k: int | None,
+    group_by: str | None = None,
+    group_size: int | None = None,
+) -> list[VectorHit]:
+    """
+    Vector search over segments.
+
+    With `group_by` (a payload field such as video_id), `top_k` counts groups
+    and up to `group_size` hits per group are returned, each tagged with its
+    `group_key`.
+
+    With a shadow collection configured (QDRANT_SHADOW_COLLECTION +
+    EMBEDDING_SHADOW_MODEL), a sample of queries is replayed against it in the
+    background for comparison; results always come from the primary.
+    """
+    query = VectorQuery(
+        query_text=query_text,
+        filters=filters,
+        top_k=top_k,
+        group_by=group_by,
+        group_size=group_size,
+    )
+    return _search([query], batch=False)[0]
+
+
+def vector_search_batch(queries: list[VectorQuery]) -> list[list[VectorHit]]:
+    """
+    Run several vector searches with one embeddings call and one Qdrant
+    `points/search/batch` call. Results are returned in input order.
+    """
+    if not queries:
+        return []
+    return _search(queries, batch=True)
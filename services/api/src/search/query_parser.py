@@ -0,0 +1,112 @@
+from __future__ import annotations
+
+import re
+from dataclasses import dataclass
+from functools import lru_cache
+
+# Field operators -> SearchFiltersV1 keys.
+FIELD_OPERATORS = {
+    "speaker": "speaker_id",
+    "lang": "language",
+    "language": "language",
+}
+
+# -?  field:?  ("phrase" | word)
+_CLAUSE_RE = re.compile(r'(-?)(?:([A-Za-z_]+):)?(?:"([^"]*)"?|(\S+))')
+_WORD_RE = re.compile(r"\w+", re.UNICODE)
+
+
+@dataclass(frozen=True)
+class ParsedQuery:
+    """
+    A user query split into its parts:
+
+    - terms:    bare words, all required (multi_match, operator=and)
+    - phrases:  "quoted phrases", each required verbatim (match_phrase)
+    - excluded: -word / -"phrase", none may appear (must_not)
+    - fields:   speaker:<id> / lang:<code> as (filter key, value) pairs
+    """
+
+    terms: tuple[str, ...] = ()
+    phrases: tuple[str, ...] = ()
+    excluded: tuple[str, ...] = ()
+    fields: tuple[tuple[str, str], ...] = ()
+
+    @property
+    def text(self) -> str:
+        """Bare terms, for the lexical multi_match."""
+        return " ".join(self.terms)
+
+    @property
+    def positive_text(self) -> str:
+        """Everything the user asked for (terms and phrases), for embeddings."""
+        return " ".join((*self.terms, *self.phrases))
+
+    @property
+    def has_text_operators(self) -> bool:
+        return bool(self.phrases or self.excluded)
+
+    def filters(self) -> dict[str, str]:
+        return dict(self.fields)
+
+    def matches_text(self, text: str) -> bool:
+        """Phrase/exclusion check for hits that did not come from OpenSearch."""
+        words = " ".join(_WORD_RE.findall((text or "").casefold()))
+        padded = f" {words} "
+
+        def has(s: str) -> bool:
+            w = " ".join(_WORD_RE.findall(s.casefold()))
+            return bool(w) and f" {w} " in padded
+
+        return all(has(p) for p in self.phrases) and not any(
+            has(x) for x in self.excluded
+        )
+
+
+@lru_cache(maxsize=4096)
+def parse_query(raw: str) -> ParsedQuery:
+    """
+    Parse the search query language:
+
+        climate "carbon tax" -opinion -"op ed" speaker:spk_1 lang:en
+
+    Unknown `field:` prefixes are kept as plain text; negated field operators
+    are ignored. An unterminated quote runs to the end of the query. Cached:
+    the same queries come back constantly (pagination, retries, popular
+    searches).
+    """
+    terms: list[str] = []
+    phrases: list[str] = []
+    excluded: list[str] = []
+    fields: dict[str, str] = {}
+
+    for m in _CLAUSE_RE.finditer((raw or "").strip()):
+        neg, field, quoted, word = m.groups()
+        value = (quoted if quoted is not None else word or "").strip()
+
+        if field:
+            key = FIELD_OPERATORS.get(field.lower())
+            if key:
+                # Filters are positive only: a negated operator is dropped.
+                if value and not neg:
+                    fields[key] = value
+                continue
+            # Not an operator: keep the token as typed (e.g. "re:invent").
+            value = f"{field}:{value}" if value else f"{field}:"
+            quoted = None
+
+        if not value:
+            continue
+        if neg:
+            excluded.append(value)
+        elif quoted is not None:
+            phrases.append(value)
+        else:
+            terms.append(value)
+
+    return ParsedQuery(
+        terms=tuple(terms),
+        phrases=tuple(phrases),
+        excluded=tuple(excluded),
+        fields=tuple(fields.items()),
+    )
@@ -0,0 +1,111 @@
+from __future__ import annotations
+
+import re
+from functools import lru_cache
+
+DEFAULT_MAX_CHARS = 160
+PRE_TAG = "<em>"
+POST_TAG = "</em>"
+ELLIPSIS = "…"
+
+_WORD_RE = re.compile(r"\w+", re.UNICODE)
+
+
+@lru_cache(maxsize=1024)
+def query_terms(query: str) -> frozenset[str]:
+    """Casefolded query words worth highlighting (single letters are skipped)."""
+    return frozenset(
+        t.casefold() for t in _WORD_RE.findall(query or "") if len(t) > 1 or t.isdigit()
+    )
+
+
+@lru_cache(maxsize=1024)
+def _terms_pattern(terms: frozenset[str], prefix: bool = False) -> re.Pattern[str]:
+    # One alternation scanned by the regex engine beats tokenizing the whole
+    # segment in Python; longest first so overlapping terms prefer the longer.
+    alts = "|".join(re.escape(t) for t in sorted(terms, key=lambda t: (-len(t), t)))
+    tail = r"\w*" if prefix else r"\b"
+    return re.compile(rf"\b(?:{alts}){tail}", re.IGNORECASE)
+
+
+def _best_window(
+    matches: list[tuple[int, int, str]], max_chars: int
+) -> tuple[int, int]:
+    """
+    Span (start, end) of the densest run of matches fitting in `max_chars`:
+    most distinct terms first, then most matches, then earliest.
+    """
+    best = (0, 0, 0, 0)  # (distinct, count, start, end)
+    counts: dict[str, int] = {}
+    lo = 0
+    for hi, (_, end, term) in enumerate(matches):
+        counts[term] = counts.get(term, 0) + 1
+        while end - matches[lo][0] > max_chars:
+            t = matches[lo][2]
+            counts[t] -= 1
+            if not counts[t]:
+                del counts[t]
+            lo += 1
+        cand = (len(counts), hi - lo + 1)
+        if cand > best[:2]:
+            best = (*cand, matches[lo][0], end)
+    return best[2], best[3]
+
+
+def make_snippet(
+    text: str,
+    terms: frozenset[str],
+    *,
+    max_chars: int = DEFAULT_MAX_CHARS,
+    prefix: bool = False,
+) -> str | None:
+    """
+    Highlight `terms` in `text`, OpenSearch style (`<em>` tags), windowed to
+    about `max_chars` characters around the densest cluster of matches.
+
+    With `prefix`, terms also match the start of longer words (as typed in a
+    search-as-you-type box) and the whole word is highlighted.
+
+    Returns None when no term occurs in the text.
+    """
+    if not text or not terms:
+        return None
+
+    matches = [
+        (m.start(), m.end(), m.group().casefold())
+        for m in _terms_pattern(terms, prefix).finditer(text)
+    ]
+    if not matches:
+        return None
+
+    if len(text) <= max_chars:
+        lo, hi = 0, len(text)
+    else:
+        m_start, m_end = _best_window(matches, max_chars)
+        # Center the cluster in the window, then snap outwards to word edges.
+        slack = max(0, max_chars - (m_end - m_start))
+        lo = max(0, m_start - slack // 2)
+        hi = min(len(text), lo + max(max_chars, m_end - m_start))
+        lo = max(0, min(lo, hi - max_chars))
+        # Never cut a word: widen the start to its word, trim the end before it.
+        while lo > 0 and not text[lo - 1].isspace():
+            lo -= 1
+        while hi < len(text) and hi > m_end and not text[hi].isspace():
+            hi -= 1
+        while lo < m_start and text[lo].isspace():
+            lo += 1
+
+    out: list[str] = [ELLIPSIS] if lo > 0 else []
+    pos = lo
+    for s, e, _ in matches:
+        if s < lo or e > hi:
+            continue
+        out.append(text[pos:s])
+        out.append(PRE_TAG)
+        out.append(text[s:e])
+        out.append(POST_TAG)
+        pos = e
+    out.append(text[pos:hi].rstrip() if hi < len(text) else text[pos:hi])
+    if hi < len(text):
+        out.append(ELLIPSIS)
+    return "".join(out).strip()
@@ -0,0 +1,158 @@
+from __future__ import annotations
+
+import os
+import re
+import threading
+import unicodedata
+from dataclasses import dataclass
+from typing import Any
+
+from prometheus_client import Counter
+
+from ..services.ttl_cache import TTLCache
+
+SUGGEST_KINDS = ("phrase", "speaker", "video")
+SUGGEST_MAX_LIMIT = 20
+SUGGEST_DEFAULT_LIMIT = 8
+SUGGEST_MIN_CHARS = 1
+SUGGEST_NAME = "s"
+
+SUGGEST_CACHE_EVENTS = Counter(
+    "narralytica_search_suggest_cache_total",
+    "Autocomplete prefix cache lookups by result (hit, derived, miss)",
+    ["result"],
+)
+
+_WORD_RE = re.compile(r"[^\W_]+", re.UNICODE)
+
+
+def _env_float(name: str, default: float) -> float:
+    raw = (os.environ.get(name) or "").strip()
+    if not raw:
+        return default
+    try:
+        return float(raw)
+    except ValueError:
+        return default
+
+
+def normalize_prefix(text: str) -> str:
+    """
+    Approximates the suggest analyzer (standard tokenizer, lowercase,
+    asciifolding) so cached prefixes compare like the index does.
+    """
+    folded = unicodedata.normalize("NFKD", (text or "").casefold())
+    folded = "".join(c for c in folded if not unicodedata.combining(c))
+    return " ".join(_WORD_RE.findall(folded))
+
+
+@dataclass(frozen=True)
+class Suggestion:
+    text: str
+    kind: str
+    score: float
+    inputs: tuple[str, ...] = ()
+
+    def matches(self, prefix: str) -> bool:
+        return any(normalize_prefix(i).startswith(prefix) for i in self.inputs)
+
+
+def build_suggest_query(
+    prefix: str, *, kinds: tuple[str, ...], size: int = SUGGEST_MAX_LIMIT
+) -> dict[str, Any]:
+    """Completion-suggester request; no `query`, so no segment hits at all."""
+    completion: dict[str, Any] = {
+        "field": "suggest",
+        "size": size,
+        "skip_duplicates": True,
+        "contexts": {"kind": list(kinds)},
+    }
+    return {
+        "_source": ["text", "kind", "suggest.input"],
+        "suggest": {SUGGEST_NAME: {"prefix": prefix, "completion": completion}},
+    }
+
+
+def parse_suggest_response(data: dict[str, Any]) -> list[Suggestion]:
+    out: list[Suggestion] = []
+    for entry in ((data or {}).get("suggest") or {}).get(SUGGEST_NAME) or []:
+        for opt in (entry or {}).get("options") or []:
+            src = opt.get("_source") or {}
+            text = str(src.get("text") or opt.get("text") or "")
+            if not text:
+                continue
+            inputs = (src.get("suggest") or {}).get("input") or [text]
+            if isinstance(inputs, str):
+                inputs = [inputs]
+            out.append(
+                Suggestion(
+                    text=text,
+                    kind=str(src.get("kind") or ""),
+                    score=float(opt.get("_score") or 0.0),
+                    inputs=tuple(str(i) for i in inputs),
+                )
+            )
+    return out
+
+
+class SuggestPrefixCache:
+    """
+    In-memory cache of the top suggestions per (prefix, kinds).
+
+    Every lookup fetches `fetch_size` suggestions. A cached list shorter than
+    that is exhaustive for its prefix, so any longer prefix is answered by
+    filtering it locally: once "cli" is cached with 7 suggestions, "clim",
+    "clima", ... never reach OpenSearch.
+    """
+
+    def __init__(
+        self,
+        *,
+        ttl_s: float,
+        max_entries: int,
+        fetch_size: int = SUGGEST_MAX_LIMIT,
+    ) -> None:
+        self.fetch_size = fetch_size
+        self._cache: TTLCache[tuple[str, tuple[str, ...]], list[Suggestion]] = TTLCache(
+            max_entries=max_entries, ttl_s=ttl_s
+        )
+
+    def get(self, prefix: str, kinds: tuple[str, ...]) -> list[Suggestion] | None:
+        hit = self._cache.get((prefix, kinds))
+        if hit is not None:
+            SUGGEST_CACHE_EVENTS.labels(result="hit").inc()
+            return hit
+
+        for n in range(len(prefix) - 1, SUGGEST_MIN_CHARS - 1, -1):
+            shorter = self._cache.get((prefix[:n], kinds))
+            if shorter is not None and len(shorter) < self.fetch_size:
+                derived = [s for s in shorter if s.matches(prefix)]
+                self._cache.set((prefix, kinds), derived)
+                SUGGEST_CACHE_EVENTS.labels(result="derived").inc()
+                return derived
+
+        SUGGEST_CACHE_EVENTS.labels(result="miss").inc()
+        return None
+
+    def set(self, prefix: str, kinds: tuple[str, ...], items: list[Suggestion]) -> None:
+        self._cache.set((prefix, kinds), items)
+
+    def clear(self) -> None:
+        self._cache.clear()
+
+
+_cache: SuggestPrefixCache | None = None
+_cache_lock = threading.Lock()
+
+
+def get_suggest_cache() -> SuggestPrefixCache:
+    global _cache
+    if _cache is not None:
+        return _cache
+    with _cache_lock:
+        if _cache is None:
+            _cache = SuggestPrefixCache(
+                ttl_s=_env_float("SEARCH_SUGGEST_CACHE_TTL_S", 60.0),
+                max_entries=int(_env_float("SEARCH_SUGGEST_CACHE_MAX_ENTRIES", 20000)),
+            )
+        return _cache
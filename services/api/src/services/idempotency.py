@@ -2,38 +2,143 @@ from __future__ import annotations
 
 import json
 import os
+import threading
 import time
 from dataclasses import dataclass
 from typing import Any, Protocol
 
+from prometheus_client import Counter, Gauge
+
+from .redis_client import get_async_redis, redis_available
+from .ttl_cache import TTLCache
+
+IDEMPOTENCY_MEMORY_ENTRIES = Gauge(
+    "narralytica_idempotency_memory_entries",
+    "Keys held by the in-memory idempotency store",
+)
+IDEMPOTENCY_MEMORY_EVICTIONS = Counter(
+    "narralytica_idempotency_memory_evictions_total",
+    "Keys dropped from the in-memory idempotency store (expired, capacity)",
+    ["reason"],
+)
+
+
+def _env_float(name: str, default: float) -> float:
+    raw = (os.environ.get(name) or "").strip()
+    if not raw:
+        return default
+    try:
+        return float(raw)
+    except ValueError:
+        return default
+
+
+# Stored under a key while the first request for it is still being processed.
+PENDING: dict[str, Any] = {"_idempotency": "pending"}
+PENDING_TTL_SECONDS = 60
+
+
+def is_pending(value: dict[str, Any] | None) -> bool:
+    return value is not None and value.get("_idempotency") == "pending"
+
 
 class IdempotencyStore(Protocol):
-    def get(self, key: str) -> dict[str, Any] | None: ...
-    def set(self, key: str, value: dict[str, Any], ttl_seconds: int = 3600) -> None: ...
+    async def get(self, key: str) -> dict[str, Any] | None: ...
+    async def set(
+        self, key: str, value: dict[str, Any], ttl_seconds: int = 3600
+    ) -> None: ...
+
+    async def reserve(
+        self, key: str, ttl_seconds: int = PENDING_TTL_SECONDS
+    ) -> dict[str, Any] | None:
+        """
+        Atomically claim `key` with the PENDING placeholder.
+
+        Returns None when the caller now owns the key (and must `set` the
+        result or `release` it), otherwise the value already stored: a
+        finished result, or PENDING while another request is in flight.
+        """
+        ...
+
+    async def release(self, key: str) -> None: ...
 
 
 # -----------------------------------------------------------------------------
 # In-memory fallback (dev/tests)
 # -----------------------------------------------------------------------------
-@dataclass
 class MemoryIdempotencyStore:
-    _data: dict[str, tuple[float, dict[str, Any]]]
-
-    def __init__(self) -> None:
-        self._data = {}
+    """
+    Process-local store for API pods without Redis.
 
-    def get(self, key: str) -> dict[str, Any] | None:
-        item = self._data.get(key)
-        if not item:
-            return None
-        expires_at, value = item
-        if expires_at < time.time():
-            self._data.pop(key, None)
-            return None
-        return value
+    Bounded LRU with per-entry TTL (TTLCache): past `max_entries` the least
+    recently used key is dropped, and a daemon thread sweeps expired keys
+    every `sweep_interval_s`, so memory stays flat under sustained unique
+    ingest traffic even for keys that are never read again.
+    """
 
-    def set(self, key: str, value: dict[str, Any], ttl_seconds: int = 3600) -> None:
-        self._data[key] = (time.time() + ttl_seconds, value)
+    def __init__(
+        self,
+        *,
+        max_entries: int = 100000,
+        sweep_interval_s: float = 30.0,
+    ) -> None:
+        self._data: TTLCache[str, dict[str, Any]] = TTLCache(
+            max_entries=max_entries, ttl_s=3600, clock=time.time
+        )
+        self.sweep_interval_s = float(sweep_interval_s)
+        self._sweeper: threading.Thread | None = None
+        self._reported_evictions = 0
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    async def get(self, key: str) -> dict[str, Any] | None:
+        return self._data.get(key)
+
+    async def set(
+        self, key: str, value: dict[str, Any], ttl_seconds: int = 3600
+    ) -> None:
+        self._data.set(key, value, ttl_s=ttl_seconds)
+        self._start_sweeper()
+
+    async def reserve(
+        self, key: str, ttl_seconds: int = PENDING_TTL_SECONDS
+    ) -> dict[str, Any] | None:
+        # No await between the check and the write: atomic on the event loop.
+        existing = self._data.get(key)
+        if existing is not None:
+            return existing
+        self._data.set(key, PENDING, ttl_s=ttl_seconds)
+        self._start_sweeper()
+        return None
+
+    async def release(self, key: str) -> None:
+        self._data.pop(key)
+
+    def sweep(self) -> int:
+        expired = self._data.sweep()
+        IDEMPOTENCY_MEMORY_EVICTIONS.labels(reason="expired").inc(expired)
+        evictions = self._data.evictions
+        IDEMPOTENCY_MEMORY_EVICTIONS.labels(reason="capacity").inc(
+            evictions - self._reported_evictions
+        )
+        self._reported_evictions = evictions
+        return expired
+
+    def _start_sweeper(self) -> None:
+        if self._sweeper is not None:
+            return
+        with _sweeper_lock:
+            if self._sweeper is None:
+                self._sweeper = threading.Thread(
+                    target=self._sweep_loop, name="idempotency-sweep", daemon=True
+                )
+                self._sweeper.start()
+
+    def _sweep_loop(self) -> None:
+        while True:
+            time.sleep(self.sweep_interval_s)
+            self.sweep()
 
 
 # -----------------------------------------------------------------------------
@@ -41,34 +146,50 @@ class MemoryIdempotencyStore:
 # -----------------------------------------------------------------------------
 @dataclass
 class RedisIdempotencyStore:
-    redis_url: str
-
-    def _client(self):
-        import redis  # type: ignore
+    """
+    Async, on the shared pooled client (redis_client.get_async_redis): never
+    blocks the event loop and never opens a connection per call.
+    """
 
-        return redis.Redis.from_url(self.redis_url, decode_responses=True)
+    redis_url: str
 
-    def get(self, key: str) -> dict[str, Any] | None:
-        r = self._client()
-        raw = r.get(key)
+    async def get(self, key: str) -> dict[str, Any] | None:
+        raw = await get_async_redis(self.redis_url).get(key)
         if not raw:
             return None
         return json.loads(raw)
 
-    def set(self, key: str, value: dict[str, Any], ttl_seconds: int = 3600) -> None:
-        r = self._client()
-        r.setex(key, ttl_seconds, json.dumps(value))
-
+    async def set(
+        self, key: str, value: dict[str, Any], ttl_seconds: int = 3600
+    ) -> None:
+        await get_async_redis(self.redis_url).setex(key, ttl_seconds, json.dumps(value))
+
+    async def reserve(
+        self, key: str, ttl_seconds: int = PENDING_TTL_SECONDS
+    ) -> dict[str, Any] | None:
+        # SET NX + GET pipelined: one round-trip. SET NX decides atomically
+        # which of several concurrent duplicates owns the key; the GET tells
+        # the others what is stored.
+        pipe = get_async_redis(self.redis_url).pipeline(transaction=False)
+        pipe.set(key, json.dumps(PENDING), nx=True, ex=ttl_seconds)
+        pipe.get(key)
+        claimed, raw = await pipe.execute()
+        if claimed:
+            return None
+        # Expired between the two commands: report in-flight, the client retries.
+        return json.loads(raw) if raw else dict(PENDING)
 
-_memory_singleton = MemoryIdempotencyStore()
+    async def release(self, key: str) -> None:
+        await get_async_redis(self.redis_url).delete(key)
 
 
-def _redis_available() -> bool:
-    try:
-        import redis  # noqa: F401
-    except Exception:
-        return False
-    return True
+_sweeper_lock = threading.Lock()
+_memory_singleton = MemoryIdempotencyStore(
+    max_entries=int(_env_float("IDEMPOTENCY_MEMORY_MAX_ENTRIES", 100000)),
+    sweep_interval_s=_env_float("IDEMPOTENCY_SWEEP_INTERVAL_S", 30.0),
+)
+IDEMPOTENCY_MEMORY_ENTRIES.set_function(lambda: len(_memory_singleton))
+_redis_stores: dict[str, RedisIdempotencyStore] = {}
 
 
 def get_idempotency_store() -> IdempotencyStore:
@@ -77,6 +198,9 @@ def get_idempotency_store() -> IdempotencyStore:
     Otherwise, fall back to in-memory (tests/local dev).
     """
     url = os.environ.get("REDIS_URL")
-    if url and _redis_available():
-        return RedisIdempotencyStore(url)
+    if url and redis_available():
+        store = _redis_stores.get(url)
+        if store is None:
+            store = _redis_stores.setdefault(url, RedisIdempotencyStore(url))
+        return store
     return _memory_singleton
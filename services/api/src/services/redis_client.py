@@ -0,0 +1,72 @@
+from __future__ import annotations
+
+import asyncio
+import os
+import threading
+import weakref
+from typing import Any
+
+try:
+    import redis.asyncio as aioredis  # type: ignore
+except Exception:  # pragma: no cover
+    aioredis = None
+
+
+def _env_float(name: str, default: float) -> float:
+    raw = (os.environ.get(name) or "").strip()
+    if not raw:
+        return default
+    try:
+        return float(raw)
+    except ValueError:
+        return default
+
+
+def redis_available() -> bool:
+    return aioredis is not None
+
+
+# One pooled client per (event loop, url). redis.asyncio connections belong
+# to the loop that opened them, so a client is never shared across loops
+# (uvicorn has one; test clients start their own).
+_clients: weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, dict[str, Any]] = (
+    weakref.WeakKeyDictionary()
+)
+_lock = threading.Lock()
+
+
+def get_async_redis(url: str) -> Any:
+    """
+    Shared asyncio Redis client for `url` on the running event loop.
+
+    Backed by a blocking connection pool of REDIS_MAX_CONNECTIONS: under load
+    callers wait (up to REDIS_POOL_TIMEOUT_S) for a free connection instead
+    of opening new ones.
+    """
+    if aioredis is None:
+        raise RuntimeError("redis package not installed")
+    loop = asyncio.get_running_loop()
+    with _lock:
+        per_loop = _clients.setdefault(loop, {})
+        client = per_loop.get(url)
+        if client is None:
+            pool = aioredis.BlockingConnectionPool.from_url(
+                url,
+                decode_responses=True,
+                max_connections=int(_env_float("REDIS_MAX_CONNECTIONS", 50)),
+                timeout=_env_float("REDIS_POOL_TIMEOUT_S", 1.0),
+                socket_timeout=_env_float("REDIS_SOCKET_TIMEOUT_S", 1.0),
+                socket_connect_timeout=_env_float("REDIS_CONNECT_TIMEOUT_S", 1.0),
+            )
+            client = aioredis.Redis(connection_pool=pool)
+            per_loop[url] = client
+        return client
+
+
+async def close_async_redis() -> None:
+    """Close the clients of the running loop (app shutdown)."""
+    loop = asyncio.get_running_loop()
+    with _lock:
+        clients = list(_clients.pop(loop, {}).values())
+    for client in clients:
+        await client.aclose()
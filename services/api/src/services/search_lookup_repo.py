@@ -0,0 +1,158 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Protocol
+
+from packages.shared.db.postgres_pool import get_pool, normalize_dsn
+
+from .ttl_cache import TTLCache
+
+
+@dataclass(frozen=True)
+class VideoSummary:
+    video_id: str
+    title: str | None
+    source: str | None
+    published_at: str | None
+
+
+@dataclass(frozen=True)
+class SpeakerSummary:
+    speaker_id: str
+    name: str | None
+
+
+class SearchLookupRepo(Protocol):
+    def lookup(
+        self, *, video_ids: list[str], speaker_ids: list[str]
+    ) -> tuple[dict[str, VideoSummary], dict[str, SpeakerSummary]]: ...
+
+
+def _iso(v: object) -> str | None:
+    if v is None:
+        return None
+    if isinstance(v, datetime):
+        return v.isoformat()
+    return str(v)
+
+
+class PostgresSearchLookupRepo:
+    """Resolves the video/speaker blocks of a search page in one round-trip."""
+
+    def __init__(self, database_url: str) -> None:
+        self.database_url = normalize_dsn(database_url)
+
+    def lookup(
+        self, *, video_ids: list[str], speaker_ids: list[str]
+    ) -> tuple[dict[str, VideoSummary], dict[str, SpeakerSummary]]:
+        videos: dict[str, VideoSummary] = {}
+        speakers: dict[str, SpeakerSummary] = {}
+        if not video_ids and not speaker_ids:
+            return videos, speakers
+
+        q = """
+        SELECT 'video', id, title, source_type, published_at
+        FROM videos
+        WHERE id = ANY(%(video_ids)s)
+        UNION ALL
+        SELECT 'speaker', id, display_name, NULL, NULL
+        FROM speakers
+        WHERE id = ANY(%(speaker_ids)s)
+        """
+        params = {"video_ids": list(video_ids), "speaker_ids": list(speaker_ids)}
+
+        with get_pool(self.database_url).connection() as conn, conn.cursor() as cur:
+            cur.execute(q, params)
+            for kind, id_, name, source, published_at in cur.fetchall():
+                if kind == "video":
+                    videos[str(id_)] = VideoSummary(
+                        video_id=str(id_),
+                        title=str(name) if name is not None else None,
+                        source=str(source) if source is not None else None,
+                        published_at=_iso(published_at),
+                    )
+                else:
+                    speakers[str(id_)] = SpeakerSummary(
+                        speaker_id=str(id_),
+                        name=str(name) if name is not None else None,
+                    )
+
+        return videos, speakers
+
+
+class CachedSearchLookup:
+    """
+    TTL cache in front of a SearchLookupRepo.
+
+    Misses are cached too (as None, with a shorter TTL) so ids that do not
+    exist in Postgres do not trigger a lookup on every page.
+    """
+
+    def __init__(
+        self,
+        repo: SearchLookupRepo,
+        *,
+        ttl_s: float,
+        max_entries: int,
+        negative_ttl_s: float | None = None,
+    ) -> None:
+        self.repo = repo
+        self.negative_ttl_s = ttl_s / 4 if negative_ttl_s is None else negative_ttl_s
+        self._videos: TTLCache[str, VideoSummary | None] = TTLCache(
+            max_entries=max_entries, ttl_s=ttl_s
+        )
+        self._speakers: TTLCache[str, SpeakerSummary | None] = TTLCache(
+            max_entries=max_entries, ttl_s=ttl_s
+        )
+
+    def resolve(
+        self, *, video_ids: list[str], speaker_ids: list[str]
+    ) -> tuple[dict[str, VideoSummary], dict[str, SpeakerSummary]]:
+        v_hits, v_missing = self._videos.get_many(dict.fromkeys(video_ids))
+        s_hits, s_missing = self._speakers.get_many(dict.fromkeys(speaker_ids))
+
+        if v_missing or s_missing:
+            videos, speakers = self.repo.lookup(
+                video_ids=v_missing, speaker_ids=s_missing
+            )
+            self._videos.set_many(dict(videos))
+            self._speakers.set_many(dict(speakers))
+            self._videos.set_many(
+                {k: None for k in v_missing if k not in videos},
+                ttl_s=self.negative_ttl_s,
+            )
+            self._speakers.set_many(
+                {k: None for k in s_missing if k not in speakers},
+                ttl_s=self.negative_ttl_s,
+            )
+            v_hits.update(videos)
+            s_hits.update(speakers)
+
+        return (
+            {k: v for k, v in v_hits.items() if v is not None},
+            {k: s for k, s in s_hits.items() if s is not None},
+        )
+
+
+_lookup: CachedSearchLookup | None = None
+
+
+def get_search_lookup() -> CachedSearchLookup | None:
+    """Process-wide cached lookup, or None when no database is configured."""
+    global _lookup
+    if _lookup is not None:
+        return _lookup
+
+    from ..config import settings
+
+    url = settings.db_url
+    if not url:
+        return None
+
+    _lookup = CachedSearchLookup(
+        PostgresSearchLookupRepo(url),
+        ttl_s=settings.search_lookup_cache_ttl_s,
+        max_entries=settings.search_lookup_cache_max_entries,
+    )
+    return _lookup
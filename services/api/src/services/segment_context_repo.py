@@ -0,0 +1,173 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Protocol
+
+from packages.shared.db.postgres_pool import get_pool, normalize_dsn
+
+from .ttl_cache import TTLCache
+
+# (transcript_id, first segment_index, last segment_index), inclusive.
+Window = tuple[str, int, int]
+SegmentKey = tuple[str, int]
+
+
+@dataclass(frozen=True)
+class ContextSegment:
+    segment_id: str
+    transcript_id: str
+    segment_index: int
+    start_ms: int
+    end_ms: int
+    text: str
+
+
+class SegmentContextRepo(Protocol):
+    def fetch_windows(
+        self, windows: list[Window]
+    ) -> dict[SegmentKey, ContextSegment]: ...
+
+
+class PostgresSegmentContextRepo:
+    """
+    Neighbouring segments for many hits in one round-trip.
+
+    Each window becomes a range scan on segments_transcript_order_unique
+    (transcript_id, segment_index), joined from the unnested window arrays.
+    """
+
+    def __init__(self, database_url: str) -> None:
+        self.database_url = normalize_dsn(database_url)
+
+    def fetch_windows(self, windows: list[Window]) -> dict[SegmentKey, ContextSegment]:
+        out: dict[SegmentKey, ContextSegment] = {}
+        if not windows:
+            return out
+
+        q = """
+        SELECT s.id, s.transcript_id, s.segment_index, s.start_ms, s.end_ms, s.text
+        FROM unnest(%(tids)s::text[], %(los)s::int[], %(his)s::int[])
+             AS w(transcript_id, lo, hi)
+        JOIN segments s
+          ON s.transcript_id = w.transcript_id
+         AND s.segment_index BETWEEN w.lo AND w.hi
+        """
+        params = {
+            "tids": [w[0] for w in windows],
+            "los": [w[1] for w in windows],
+            "his": [w[2] for w in windows],
+        }
+
+        with get_pool(self.database_url).connection() as conn, conn.cursor() as cur:
+            cur.execute(q, params)
+            for sid, tid, idx, start_ms, end_ms, text in cur.fetchall():
+                key = (str(tid), int(idx))
+                out[key] = ContextSegment(
+                    segment_id=str(sid),
+                    transcript_id=str(tid),
+                    segment_index=int(idx),
+                    start_ms=int(start_ms),
+                    end_ms=int(end_ms),
+                    text=str(text or ""),
+                )
+
+        return out
+
+
+def _windows(keys: list[SegmentKey]) -> list[Window]:
+    """Merge missing (transcript_id, index) keys into contiguous ranges."""
+    by_tid: dict[str, list[int]] = {}
+    for tid, idx in keys:
+        by_tid.setdefault(tid, []).append(idx)
+
+    out: list[Window] = []
+    for tid, idxs in by_tid.items():
+        idxs = sorted(set(idxs))
+        lo = prev = idxs[0]
+        for i in idxs[1:]:
+            if i != prev + 1:
+                out.append((tid, lo, prev))
+                lo = i
+            prev = i
+        out.append((tid, lo, prev))
+    return out
+
+
+class CachedSegmentContext:
+    """
+    Per-segment TTL/LRU cache in front of a SegmentContextRepo.
+
+    Keys are (transcript_id, segment_index), so hot transcripts stay resident
+    and only the uncached part of each window reaches Postgres. Indexes past
+    either end of a transcript are cached as misses with a shorter TTL.
+    """
+
+    def __init__(
+        self,
+        repo: SegmentContextRepo,
+        *,
+        ttl_s: float,
+        max_entries: int,
+        negative_ttl_s: float | None = None,
+    ) -> None:
+        self.repo = repo
+        self.negative_ttl_s = ttl_s / 4 if negative_ttl_s is None else negative_ttl_s
+        self._cache: TTLCache[SegmentKey, ContextSegment | None] = TTLCache(
+            max_entries=max_entries, ttl_s=ttl_s
+        )
+
+    def neighbors(
+        self, hits: list[SegmentKey], n: int
+    ) -> dict[SegmentKey, tuple[list[ContextSegment], list[ContextSegment]]]:
+        """(before, after) segments, in transcript order, for each hit key."""
+        if n <= 0 or not hits:
+            return {}
+
+        wanted: dict[SegmentKey, None] = {}
+        for tid, idx in hits:
+            for i in range(max(0, idx - n), idx + n + 1):
+                if i != idx:
+                    wanted[(tid, i)] = None
+
+        found, missing = self._cache.get_many(wanted)
+        if missing:
+            fetched = self.repo.fetch_windows(_windows(missing))
+            self._cache.set_many(dict(fetched))
+            self._cache.set_many(
+                {k: None for k in missing if k not in fetched},
+                ttl_s=self.negative_ttl_s,
+            )
+            found.update(fetched)
+
+        out: dict[SegmentKey, tuple[list[ContextSegment], list[ContextSegment]]] = {}
+        for tid, idx in hits:
+            before = [found.get((tid, i)) for i in range(max(0, idx - n), idx)]
+            after = [found.get((tid, i)) for i in range(idx + 1, idx + n + 1)]
+            out[(tid, idx)] = (
+                [s for s in before if s is not None],
+                [s for s in after if s is not None],
+            )
+        return out
+
+
+_context: CachedSegmentContext | None = None
+
+
+def get_segment_context() -> CachedSegmentContext | None:
+    """Process-wide cached context lookup, or None without a database."""
+    global _context
+    if _context is not None:
+        return _context
+
+    from ..config import settings
+
+    url = settings.db_url
+    if not url:
+        return None
+
+    _context = CachedSegmentContext(
+        PostgresSegmentContextRepo(url),
+        ttl_s=settings.segment_context_cache_ttl_s,
+        max_entries=settings.segment_context_cache_max_entries,
+    )
+    return _context
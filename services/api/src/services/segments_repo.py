@@ -3,7 +3,7 @@ from __future__ import annotations
 from dataclasses import dataclass
 from typing import Protocol
 
-from ..services.db import get_db  # adjust if your DB helper path differs
+from ..db.aio import read_conn
 
 
 @dataclass(frozen=True)
@@ -23,7 +23,7 @@ class SegmentV1:
 
 
 class SegmentsRepo(Protocol):
-    def list_segments(
+    async def list_segments(
         self,
         *,
         video_id: str | None,
@@ -34,14 +34,14 @@ class SegmentsRepo(Protocol):
         offset: int,
     ) -> tuple[list[SegmentV1], int]: ...
 
-    def get_segment(self, segment_id: str) -> SegmentV1 | None: ...
+    async def get_segment(self, segment_id: str) -> SegmentV1 | None: ...
 
 
 class PostgresSegmentsRepo:
     def __init__(self, database_url: str):
         self.database_url = database_url
 
-    def list_segments(
+    async def list_segments(
         self,
         *,
         video_id: str | None,
@@ -80,14 +80,14 @@ class PostgresSegmentsRepo:
             LIMIT %(limit)s OFFSET %(offset)s
         """
 
-        with get_db(self.database_url) as conn:
-            with conn.cursor() as cur:
-                cur.execute(count_sql, params)
-                total = int(cur.fetchone()[0])
+        async with read_conn(self.database_url) as conn:
+            async with conn.cursor() as cur:
+                await cur.execute(count_sql, params)
+                total = int((await cur.fetchone())[0])
 
-                cur.execute(rows_sql, params)
+                await cur.execute(rows_sql, params)
                 out: list[SegmentV1] = []
-                for start_ms, end_ms, text in cur.fetchall():
+                for start_ms, end_ms, text in await cur.fetchall():
                     out.append(
                         SegmentV1(
                             start_ms=int(start_ms), end_ms=int(end_ms), text=str(text)
@@ -95,17 +95,17 @@ class PostgresSegmentsRepo:
                     )
                 return out, total
 
-    def get_segment(self, segment_id: str) -> SegmentV1 | None:
+    async def get_segment(self, segment_id: str) -> SegmentV1 | None:
         sql = """
             SELECT start_ms, end_ms, text
             FROM segments
             WHERE id = %(id)s
             LIMIT 1
         """
-        with get_db(self.database_url) as conn:
-            with conn.cursor() as cur:
-                cur.execute(sql, {"id": segment_id})
-                row = cur.fetchone()
+        async with read_conn(self.database_url) as conn:
+            async with conn.cursor() as cur:
+                await cur.execute(sql, {"id": segment_id})
+                row = await cur.fetchone()
                 if not row:
                     return None
                 start_ms, end_ms, text = row
@@ -117,6 +117,6 @@ class PostgresSegmentsRepo:
 def get_segments_repo() -> SegmentsRepo:
     from ..config import settings
 
-    if not settings.database_url:
+    if not settings.db_url:
         raise RuntimeError("DATABASE_URL not configured")
-    return PostgresSegmentsRepo(settings.database_url)
+    return PostgresSegmentsRepo(settings.db_url)
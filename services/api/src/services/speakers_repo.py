@@ -4,7 +4,7 @@ from dataclasses import asdict, dataclass
 from datetime import datetime
 from typing import Protocol
 
-from ..services.db import get_db
+from ..db.aio import read_conn
 
 
 @dataclass(frozen=True)
@@ -25,7 +25,7 @@ class SpeakerV1:
 
 
 class SpeakersRepo(Protocol):
-    def list_speakers(
+    async def list_speakers(
         self,
         *,
         video_id: str | None,
@@ -33,14 +33,14 @@ class SpeakersRepo(Protocol):
         offset: int,
     ) -> tuple[list[SpeakerV1], int]: ...
 
-    def get_speaker(self, speaker_id: str) -> SpeakerV1 | None: ...
+    async def get_speaker(self, speaker_id: str) -> SpeakerV1 | None: ...
 
 
 class PostgresSpeakersRepo:
     def __init__(self, database_url: str):
         self.database_url = database_url
 
-    def list_speakers(
+    async def list_speakers(
         self,
         *,
         video_id: str | None,
@@ -68,12 +68,12 @@ class PostgresSpeakersRepo:
             LIMIT %(limit)s OFFSET %(offset)s
         """
 
-        with get_db(self.database_url) as conn:
-            with conn.cursor() as cur:
-                cur.execute(count_sql, params)
-                total = int(cur.fetchone()[0])
+        async with read_conn(self.database_url) as conn:
+            async with conn.cursor() as cur:
+                await cur.execute(count_sql, params)
+                total = int((await cur.fetchone())[0])
 
-                cur.execute(rows_sql, params)
+                await cur.execute(rows_sql, params)
                 out: list[SpeakerV1] = []
                 for (
                     speaker_id,
@@ -83,7 +83,7 @@ class PostgresSpeakersRepo:
                     language,
                     metadata,
                     created_at,
-                ) in cur.fetchall():
+                ) in await cur.fetchall():
                     out.append(
                         SpeakerV1(
                             speaker_id=str(speaker_id),
@@ -97,7 +97,7 @@ class PostgresSpeakersRepo:
                     )
                 return out, total
 
-    def get_speaker(self, speaker_id: str) -> SpeakerV1 | None:
+    async def get_speaker(self, speaker_id: str) -> SpeakerV1 | None:
         sql = """
             SELECT sp.id, sp.video_id, sp.label, sp.name,
                    sp.language, sp.metadata, sp.created_at
@@ -105,10 +105,10 @@ class PostgresSpeakersRepo:
             WHERE sp.id = %(id)s
             LIMIT 1
         """
-        with get_db(self.database_url) as conn:
-            with conn.cursor() as cur:
-                cur.execute(sql, {"id": speaker_id})
-                row = cur.fetchone()
+        async with read_conn(self.database_url) as conn:
+            async with conn.cursor() as cur:
+                await cur.execute(sql, {"id": speaker_id})
+                row = await cur.fetchone()
                 if not row:
                     return None
                 (
@@ -134,6 +134,6 @@ class PostgresSpeakersRepo:
 def get_speakers_repo() -> SpeakersRepo:
     from ..config import settings
 
-    if not settings.database_url:
+    if not settings.db_url:
         raise RuntimeError("DATABASE_URL not configured")
-    return PostgresSpeakersRepo(settings.database_url)
+    return PostgresSpeakersRepo(settings.db_url)
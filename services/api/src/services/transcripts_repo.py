@@ -5,16 +5,16 @@ from dataclasses import dataclass
 from datetime import datetime
 from typing import Any
 
-import psycopg
+from packages.shared.db.postgres_pool import normalize_dsn
+
+from ..db.aio import read_conn
 
 
 def _database_url() -> str:
     url = os.getenv("API_DATABASE_URL") or os.getenv("DATABASE_URL")
     if not url:
         raise RuntimeError("API_DATABASE_URL not configured")
-    if url.startswith("postgresql+psycopg://"):
-        url = "postgresql://" + url[len("postgresql+psycopg://") :]
-    return url
+    return normalize_dsn(url)
 
 
 @dataclass(frozen=True)
@@ -35,10 +35,7 @@ class TranscriptsRepo:
     def __init__(self, database_url: str | None = None) -> None:
         self.database_url = database_url or _database_url()
 
-    def _connect(self) -> psycopg.Connection:
-        return psycopg.connect(self.database_url)
-
-    def get_by_id(self, transcript_id: str) -> TranscriptRecord | None:
+    async def get_by_id(self, transcript_id: str) -> TranscriptRecord | None:
         q = """
         SELECT
           id,
@@ -54,9 +51,9 @@ class TranscriptsRepo:
         FROM transcripts
         WHERE id = %s
         """
-        with self._connect() as conn, conn.cursor() as cur:
-            cur.execute(q, (transcript_id,))
-            row = cur.fetchone()
+        async with read_conn(self.database_url) as conn, conn.cursor() as cur:
+            await cur.execute(q, (transcript_id,))
+            row = await cur.fetchone()
             if not row:
                 return None
             return TranscriptRecord(
@@ -72,7 +69,7 @@ class TranscriptsRepo:
                 created_at=row[9],
             )
 
-    def latest_for_video(
+    async def latest_for_video(
         self,
         *,
         video_id: str,
@@ -120,9 +117,9 @@ class TranscriptsRepo:
             """
             params = (video_id,)
 
-        with self._connect() as conn, conn.cursor() as cur:
-            cur.execute(q, params)
-            row = cur.fetchone()
+        async with read_conn(self.database_url) as conn, conn.cursor() as cur:
+            await cur.execute(q, params)
+            row = await cur.fetchone()
             if not row:
                 return None
             return TranscriptRecord(
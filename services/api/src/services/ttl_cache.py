@@ -0,0 +1,99 @@
+from __future__ import annotations
+
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import Callable, Iterable
+
+
+class TTLCache[K, V]:
+    """
+    Small thread-safe LRU cache with per-entry TTL.
+
+    - bounded: inserting past `max_entries` evicts the least recently used
+    - expired entries are dropped lazily when read
+    - `get_many` returns hits and the list of missing keys in one pass, which
+      is what batched lookups need
+    """
+
+    def __init__(
+        self,
+        *,
+        max_entries: int,
+        ttl_s: float,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.max_entries = max(1, int(max_entries))
+        self.ttl_s = float(ttl_s)
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._data: OrderedDict[K, tuple[float, V]] = OrderedDict()
+        # entries dropped to stay under max_entries (not expiry)
+        self.evictions = 0
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._data)
+
+    def _get_locked(self, key: K, now: float) -> tuple[bool, V | None]:
+        item = self._data.get(key)
+        if item is None:
+            return False, None
+        expires_at, value = item
+        if expires_at <= now:
+            del self._data[key]
+            return False, None
+        self._data.move_to_end(key)
+        return True, value
+
+    def get(self, key: K) -> V | None:
+        with self._lock:
+            _, value = self._get_locked(key, self._clock())
+            return value
+
+    def get_many(self, keys: Iterable[K]) -> tuple[dict[K, V], list[K]]:
+        hits: dict[K, V] = {}
+        missing: list[K] = []
+        with self._lock:
+            now = self._clock()
+            for k in keys:
+                found, value = self._get_locked(k, now)
+                if found:
+                    hits[k] = value  # type: ignore[assignment]
+                else:
+                    missing.append(k)
+        return hits, missing
+
+    def set(self, key: K, value: V, ttl_s: float | None = None) -> None:
+        with self._lock:
+            self._set_locked(key, value, ttl_s)
+
+    def set_many(self, items: dict[K, V], ttl_s: float | None = None) -> None:
+        with self._lock:
+            for k, v in items.items():
+                self._set_locked(k, v, ttl_s)
+
+    def _set_locked(self, key: K, value: V, ttl_s: float | None) -> None:
+        ttl = self.ttl_s if ttl_s is None else float(ttl_s)
+        self._data[key] = (self._clock() + ttl, value)
+        self._data.move_to_end(key)
+        while len(self._data) > self.max_entries:
+            self._data.popitem(last=False)
+            self.evictions += 1
+
+    def sweep(self) -> int:
+        """Drop every expired entry; returns how many were dropped."""
+        with self._lock:
+            now = self._clock()
+            expired = [k for k, (exp, _) in self._data.items() if exp <= now]
+            for k in expired:
+                del self._data[k]
+            return len(expired)
+
+    def pop(self, key: K) -> None:
+        with self._lock:
+            self._data.pop(key, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
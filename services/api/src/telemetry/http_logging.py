@@ -2,24 +2,48 @@ from __future__ import annotations
 
 import logging
 import time
-from collections.abc import Callable
 
-from starlette.middleware.base import BaseHTTPMiddleware
 from starlette.requests import Request
-from starlette.responses import Response
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
 
 logger = logging.getLogger("http")
 
 
-class HttpLoggingMiddleware(BaseHTTPMiddleware):
-    async def dispatch(self, request: Request, call_next: Callable) -> Response:
+class HttpLoggingMiddleware:
+    """
+    One `request` log line per HTTP request.
+
+    Pure ASGI: the status code is read from `http.response.start` and the
+    line is written once the response is finished, without wrapping the
+    response like BaseHTTPMiddleware does. `duration_ms` is time to response
+    start, as before.
+    """
+
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
         start = time.time()
-        response: Response
+        status_code: int | None = None
+        duration_ms: int | None = None
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal status_code, duration_ms
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+                duration_ms = int((time.time() - start) * 1000)
+            await send(message)
+
         try:
-            response = await call_next(request)
-            return response
+            await self.app(scope, receive, send_wrapper)
         finally:
-            duration_ms = int((time.time() - start) * 1000)
+            if duration_ms is None:
+                duration_ms = int((time.time() - start) * 1000)
+            request = Request(scope)
             rid = getattr(request.state, "request_id", None)
 
             logger.info(
@@ -28,7 +52,7 @@ class HttpLoggingMiddleware(BaseHTTPMiddleware):
                     "request_id": rid,
                     "method": request.method,
                     "path": request.url.path,
-                    "status_code": getattr(response, "status_code", None),
+                    "status_code": status_code,
                     "duration_ms": duration_ms,
                 },
             )
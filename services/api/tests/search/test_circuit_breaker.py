@@ -0,0 +1,136 @@
+import pytest
+from services.api.src.search import breaker as breaker_module
+from services.api.src.search.breaker import BreakerConfig, CircuitBreaker
+from services.api.src.search.qdrant.vector_search import (
+    VectorSearchError,
+    vector_search,
+)
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 1000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def _breaker(clock: FakeClock, **overrides) -> CircuitBreaker:
+    cfg = BreakerConfig(
+        window_s=30.0,
+        min_calls=4,
+        error_rate=0.5,
+        slow_call_s=1.0,
+        slow_call_rate=0.5,
+        open_s=10.0,
+        half_open_calls=2,
+        **overrides,
+    )
+    return CircuitBreaker("test", cfg, clock=clock)
+
+
+def test_opens_on_error_rate_and_rejects():
+    clock = FakeClock()
+    b = _breaker(clock)
+
+    b.record_success(0.01)
+    b.record_success(0.01)
+    b.record_failure()
+    assert b.state == "closed"
+
+    b.record_failure()
+    assert b.state == "open"
+    assert b.allow() is False
+
+
+def test_opens_on_slow_calls():
+    clock = FakeClock()
+    b = _breaker(clock)
+
+    for _ in range(2):
+        b.record_success(0.01)
+    for _ in range(2):
+        b.record_success(5.0)
+
+    assert b.state == "open"
+
+
+def test_half_open_probes_close_breaker():
+    clock = FakeClock()
+    b = _breaker(clock)
+    for _ in range(4):
+        b.record_failure()
+    assert b.state == "open"
+
+    clock.now += 10.0
+    assert b.state == "half_open"
+
+    assert b.allow() is True
+    assert b.allow() is True
+    assert b.allow() is False  # probe budget exhausted
+
+    b.record_success(0.01)
+    b.record_success(0.01)
+    assert b.state == "closed"
+    assert b.allow() is True
+
+
+def test_half_open_failure_reopens():
+    clock = FakeClock()
+    b = _breaker(clock)
+    for _ in range(4):
+        b.record_failure()
+
+    clock.now += 10.0
+    assert b.allow() is True
+    b.record_failure()
+    assert b.state == "open"
+    assert b.allow() is False
+
+
+def test_old_outcomes_leave_the_window():
+    clock = FakeClock()
+    b = _breaker(clock)
+    b.record_failure()
+    b.record_failure()
+    b.record_failure()
+
+    clock.now += 31.0
+    b.record_success(0.01)
+    assert b.state == "closed"
+
+
+def test_adaptive_timeout_tracks_latency():
+    clock = FakeClock()
+    b = _breaker(clock, timeout_multiplier=4.0, timeout_min_s=0.05)
+
+    # Not enough samples yet: fall back to the configured ceiling.
+    assert b.timeout_s(10.0) == 10.0
+
+    for _ in range(10):
+        b.record_success(0.1)
+    assert b.timeout_s(10.0) == pytest.approx(0.4)
+    assert b.timeout_s(0.2) == pytest.approx(0.2)
+
+
+def test_vector_search_skips_embeddings_when_qdrant_open(monkeypatch):
+    monkeypatch.setenv("EMBEDDINGS_URL", "http://embeddings.invalid")
+    breaker_module.reset_breakers()
+    try:
+        qdrant = breaker_module.get_breaker("qdrant")
+        for _ in range(qdrant.config.min_calls):
+            qdrant.record_failure()
+        assert qdrant.state == "open"
+
+        import services.api.src.search.qdrant.vector_search as vs
+
+        def boom(_text):
+            raise AssertionError("embeddings must not be called")
+
+        monkeypatch.setattr(vs, "embed_text", boom)
+
+        with pytest.raises(VectorSearchError) as e:
+            vector_search(query_text="hello", filters=None, top_k=5)
+        assert "circuit open" in str(e.value)
+    finally:
+        breaker_module.reset_breakers()
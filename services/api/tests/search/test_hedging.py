@@ -0,0 +1,143 @@
+import threading
+import time
+
+import pytest
+from services.api.src.search.hedging import HedgeConfig, Hedger
+
+
+def _warm(h: Hedger, latency_s: float, n: int) -> None:
+    for _ in range(n):
+        h.policy.record_primary_latency(latency_s)
+
+
+def test_disabled_calls_primary_only():
+    h = Hedger("test", HedgeConfig(enabled=False))
+    calls: list[int] = []
+
+    def fn(attempt: int) -> str:
+        calls.append(attempt)
+        return "ok"
+
+    assert h.call(fn) == "ok"
+    assert calls == [0]
+
+
+def test_no_hedge_before_enough_samples():
+    h = Hedger("test", HedgeConfig(enabled=True, min_samples=5, max_rate=1.0))
+    calls: list[int] = []
+
+    def fn(attempt: int) -> int:
+        calls.append(attempt)
+        return attempt
+
+    assert h.call(fn) == 0
+    assert calls == [0]
+    assert h.policy.delay_s() is None
+
+
+def test_slow_primary_is_hedged_and_hedge_wins():
+    cfg = HedgeConfig(enabled=True, min_samples=5, max_rate=1.0, burst=1.0)
+    h = Hedger("test", cfg)
+    _warm(h, 0.01, 5)
+
+    release = threading.Event()
+    callers: dict[int, str] = {}
+
+    def fn(attempt: int) -> int:
+        callers[attempt] = threading.current_thread().name
+        if attempt == 0:
+            if release.wait(timeout=2.0):
+                raise ConnectionError("aborted")
+        return attempt
+
+    start = time.perf_counter()
+    try:
+        assert h.call(fn, cancel=lambda n: release.set()) == 1
+    finally:
+        release.set()
+
+    # The winning hedge aborted the primary instead of waiting it out, and
+    # only the hedge ran on the executor.
+    assert time.perf_counter() - start < 1.0
+    assert callers[0] == threading.current_thread().name
+    assert callers[1].startswith("hedge-test")
+
+
+def test_rejected_hedge_result_does_not_win():
+    cfg = HedgeConfig(enabled=True, min_samples=5, max_rate=1.0, burst=1.0)
+    h = Hedger("test", cfg)
+    _warm(h, 0.001, 5)
+
+    def fn(attempt: int) -> int:
+        if attempt == 1:
+            return 503
+        threading.Event().wait(0.05)
+        return 200
+
+    assert h.call(fn, accept=lambda status: status < 500) == 200
+
+
+def test_failed_primary_waits_for_hedge():
+    cfg = HedgeConfig(enabled=True, min_samples=5, max_rate=1.0, burst=1.0)
+    h = Hedger("test", cfg)
+    _warm(h, 0.001, 5)
+
+    def fn(attempt: int) -> int:
+        if attempt == 0:
+            threading.Event().wait(0.02)
+            return 502
+        threading.Event().wait(0.05)
+        return 200
+
+    assert h.call(fn, accept=lambda status: status < 500) == 200
+
+
+def test_budget_caps_hedge_rate():
+    cfg = HedgeConfig(enabled=True, min_samples=5, max_rate=0.5, burst=1.0)
+    h = Hedger("test", cfg)
+    _warm(h, 0.001, 5)
+
+    hedges = 0
+    lock = threading.Lock()
+
+    def fn(attempt: int) -> int:
+        nonlocal hedges
+        if attempt == 1:
+            with lock:
+                hedges += 1
+            return 1
+        threading.Event().wait(0.02)
+        return 0
+
+    for _ in range(6):
+        h.call(fn)
+
+    # 6 requests * 0.5 tokens => at most 3 hedges.
+    assert hedges <= 3
+
+
+def test_failed_hedge_falls_back_to_primary():
+    cfg = HedgeConfig(enabled=True, min_samples=5, max_rate=1.0, burst=1.0)
+    h = Hedger("test", cfg)
+    _warm(h, 0.001, 5)
+
+    def fn(attempt: int) -> int:
+        if attempt == 1:
+            raise RuntimeError("replica down")
+        threading.Event().wait(0.05)
+        return 0
+
+    assert h.call(fn) == 0
+
+
+def test_both_attempts_failing_raises():
+    cfg = HedgeConfig(enabled=True, min_samples=5, max_rate=1.0, burst=1.0)
+    h = Hedger("test", cfg)
+    _warm(h, 0.001, 5)
+
+    def fn(attempt: int) -> int:
+        threading.Event().wait(0.02)
+        raise RuntimeError(f"attempt {attempt} failed")
+
+    with pytest.raises(RuntimeError):
+        h.call(fn)
@@ -53,3 +53,46 @@ def test_limit_clamped():
     )
 
     assert q["size"] <= 100
+
+
+def test_collapse_by_video():
+    q = build_lexical_query(
+        query="x",
+        filters=None,
+        limit=10,
+        offset=0,
+        collapse_field="video_id",
+        group_size=3,
+    )
+
+    assert q["size"] == 10
+    assert q["collapse"]["field"] == "video_id"
+    assert q["collapse"]["inner_hits"]["name"] == "top"
+    assert q["collapse"]["inner_hits"]["size"] == 3
+
+
+def test_no_collapse_by_default():
+    q = build_lexical_query(query="x", filters=None, limit=10, offset=0)
+    assert "collapse" not in q
+
+
+def test_phrases_and_exclusions():
+    q = build_lexical_query(
+        query="climate",
+        filters=None,
+        limit=10,
+        offset=0,
+        phrases=["carbon tax"],
+        exclude=["opinion"],
+    )
+
+    b = q["query"]["bool"]
+    assert b["must"][1] == {"match_phrase": {"text": "carbon tax"}}
+    assert b["must_not"] == [{"match_phrase": {"text": "opinion"}}]
+
+
+def test_exclusion_only_query():
+    q = build_lexical_query(query=None, filters=None, limit=10, offset=0, exclude=["x"])
+
+    assert q["query"]["bool"]["must"] == [{"match_all": {}}]
+    assert q["query"]["bool"]["must_not"] == [{"match_phrase": {"text": "x"}}]
@@ -0,0 +1,119 @@
+from typing import Any
+
+from fastapi.testclient import TestClient
+from services.api.src.search.qdrant.vector_search import VectorHit
+from services.api.src.search.query_parser import ParsedQuery, parse_query
+
+
+def test_parse_terms_phrases_exclusions_and_fields():
+    p = parse_query('climate "carbon tax" -opinion -"op ed" speaker:spk_1 lang:en')
+
+    assert p.terms == ("climate",)
+    assert p.phrases == ("carbon tax",)
+    assert p.excluded == ("opinion", "op ed")
+    assert p.filters() == {"speaker_id": "spk_1", "language": "en"}
+    assert p.text == "climate"
+    assert p.positive_text == "climate carbon tax"
+
+
+def test_parse_edge_cases():
+    # Unknown prefixes stay text, negated operators are dropped, an
+    # unterminated quote runs to the end.
+    p = parse_query('re:invent -lang:fr "open quote')
+    assert p.terms == ("re:invent",)
+    assert p.filters() == {}
+    assert p.phrases == ("open quote",)
+
+    assert parse_query("") == ParsedQuery()
+    assert parse_query('"" -').has_text_operators is False
+
+
+def test_matches_text():
+    p = parse_query('"carbon tax" -opinion')
+
+    assert p.matches_text("A Carbon  tax, they said.")
+    assert not p.matches_text("carbon and tax")
+    assert not p.matches_text("carbon tax opinion piece")
+    # Whole words only.
+    assert p.matches_text("carbon tax opinions")
+
+
+def _make_client() -> TestClient:
+    from services.api.src.main import create_app
+
+    app = create_app()
+
+    import services.api.src.auth.deps as auth_deps
+
+    def _fake_require_api_key() -> dict[str, Any]:
+        return {"api_key_id": "k_test", "name": "tests", "scopes": None}
+
+    app.dependency_overrides[auth_deps.require_api_key] = _fake_require_api_key
+    return TestClient(app, raise_server_exceptions=True)
+
+
+def _src(sid: str, text: str) -> dict[str, Any]:
+    return {
+        "video_id": "v1",
+        "segment_id": sid,
+        "start_ms": 0,
+        "end_ms": 1000,
+        "text": text,
+    }
+
+
+def test_route_applies_operators_to_both_legs(monkeypatch):
+    import services.api.src.routes.search as search_module
+
+    bodies: list[dict] = []
+    vector_calls: list[dict] = []
+
+    def fake_search(body):
+        bodies.append(body)
+        return (
+            [{"segment_id": "s_lex", "score": 2.0}],
+            {"s_lex": _src("s_lex", "the carbon tax debate")},
+            {},
+            {},
+        )
+
+    def fake_vector(**kwargs):
+        vector_calls.append(kwargs)
+        return [VectorHit("s_ok", 0.9), VectorHit("s_bad", 0.8)]
+
+    mget_calls: list[list[str]] = []
+
+    def fake_mget(ids):
+        mget_calls.append(list(ids))
+        docs = {
+            "s_ok": _src("s_ok", "a carbon tax for all"),
+            "s_bad": _src("s_bad", "carbon tax opinion"),
+        }
+        return {i: docs[i] for i in ids if i in docs}
+
+    monkeypatch.setattr(search_module, "_opensearch_search", fake_search)
+    monkeypatch.setattr(search_module, "vector_search", fake_vector)
+    monkeypatch.setattr(search_module, "_opensearch_mget", fake_mget)
+
+    resp = _make_client().post(
+        "/api/v1/search",
+        json={
+            "query": '"carbon tax" -opinion speaker:spk_1',
+            "mode": "hybrid",
+            "filters": {"language": "en"},
+        },
+    )
+    assert resp.status_code == 200, resp.text
+    ids = [i["segment"]["id"] for i in resp.json()["items"]]
+    assert "s_bad" not in ids
+    assert {"s_lex", "s_ok"} <= set(ids)
+
+    b = bodies[0]["query"]["bool"]
+    assert {"match_phrase": {"text": "carbon tax"}} in b["must"]
+    assert b["must_not"] == [{"match_phrase": {"text": "opinion"}}]
+    assert vector_calls[0]["query_text"] == "carbon tax"
+    assert vector_calls[0]["filters"]["speaker_id"] == "spk_1"
+    assert vector_calls[0]["filters"]["language"] == "en"
+    # Vector-only sources fetched once, then reused for the page.
+    assert mget_calls[0] == ["s_ok", "s_bad"]
+    assert all(not c for c in mget_calls[1:])
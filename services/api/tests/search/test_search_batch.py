@@ -0,0 +1,164 @@
+from typing import Any
+
+from fastapi.testclient import TestClient
+
+
+def _make_client() -> TestClient:
+    from services.api.src.main import create_app
+
+    app = create_app()
+
+    import services.api.src.auth.deps as auth_deps
+
+    def _fake_require_api_key() -> dict[str, Any]:
+        return {"api_key_id": "k_test", "name": "tests", "scopes": None}
+
+    app.dependency_overrides[auth_deps.require_api_key] = _fake_require_api_key
+
+    import services.api.src.services.db as db_deps
+
+    def _fake_db():
+        yield None
+
+    app.dependency_overrides[db_deps.get_db] = _fake_db
+
+    return TestClient(app, raise_server_exceptions=True)
+
+
+def _src(video_id: str, start_ms: int) -> dict[str, Any]:
+    return {
+        "video_id": video_id,
+        "start_ms": start_ms,
+        "end_ms": start_ms + 1000,
+        "text": f"text {video_id}",
+    }
+
+
+def test_batch_uses_one_round_trip_per_backend(monkeypatch):
+    import services.api.src.routes.search as search_module
+    from services.api.src.search.qdrant.vector_search import VectorHit
+
+    calls: dict[str, int] = {"msearch": 0, "vector": 0, "mget": 0}
+
+    def fake_msearch(bodies):
+        calls["msearch"] += 1
+        out = []
+        for i, _ in enumerate(bodies):
+            sid = f"seg_{i}"
+            out.append(
+                (
+                    [{"segment_id": sid, "score": 1.0}],
+                    {sid: _src(f"vid_{i}", 0)},
+                    {sid: 1.0},
+                    {},
+                )
+            )
+        return out
+
+    def fake_vector_batch(queries):
+        calls["vector"] += 1
+        return [[VectorHit(segment_id="seg_vec", score=0.9)] for _ in queries]
+
+    def fake_mget(ids):
+        calls["mget"] += 1
+        return {sid: _src("vid_vec", 5000) for sid in ids}
+
+    monkeypatch.setattr(search_module, "_opensearch_msearch", fake_msearch)
+    monkeypatch.setattr(search_module, "vector_search_batch", fake_vector_batch)
+    monkeypatch.setattr(search_module, "_opensearch_mget", fake_mget)
+
+    client = _make_client()
+    resp = client.post(
+        "/api/v1/search/batch",
+        json={
+            "requests": [
+                {"query": "alpha", "mode": "hybrid"},
+                {"query": "beta", "mode": "lexical"},
+                {"query": "gamma", "mode": "semantic"},
+            ]
+        },
+    )
+    assert resp.status_code == 200, resp.text
+    results = resp.json()["results"]
+
+    assert calls == {"msearch": 1, "vector": 1, "mget": 1}
+    assert len(results) == 3
+    assert all(r["error"] is None for r in results)
+
+    hybrid_ids = {it["segment"]["id"] for it in results[0]["response"]["items"]}
+    assert hybrid_ids == {"seg_0", "seg_vec"}
+
+    lexical_ids = [it["segment"]["id"] for it in results[1]["response"]["items"]]
+    assert lexical_ids == ["seg_1"]
+
+    semantic_ids = [it["segment"]["id"] for it in results[2]["response"]["items"]]
+    assert semantic_ids == ["seg_vec"]
+
+
+def test_batch_reports_per_item_errors(monkeypatch):
+    import services.api.src.routes.search as search_module
+    from fastapi import HTTPException
+
+    def fake_msearch(bodies):
+        assert len(bodies) == 2
+        return [
+            ([{"segment_id": "s1", "score": 1.0}], {"s1": _src("v1", 0)}, {}, {}),
+            HTTPException(status_code=400, detail="OpenSearch query error: boom"),
+        ]
+
+    monkeypatch.setattr(search_module, "_opensearch_msearch", fake_msearch)
+    monkeypatch.setattr(search_module, "_opensearch_mget", lambda ids: {})
+    monkeypatch.setattr(search_module, "vector_search_batch", lambda q: [])
+
+    client = _make_client()
+    resp = client.post(
+        "/api/v1/search/batch",
+        json={
+            "requests": [
+                {"query": "ok", "mode": "lexical"},
+                {"mode": "semantic"},
+                {"query": "bad", "mode": "lexical"},
+            ]
+        },
+    )
+    assert resp.status_code == 200, resp.text
+    results = resp.json()["results"]
+
+    assert results[0]["response"]["items"][0]["segment"]["id"] == "s1"
+    assert results[1]["error"]["status"] == 400
+    assert "requires a query" in results[1]["error"]["detail"]
+    assert results[2]["error"]["status"] == 400
+
+
+def test_batch_size_is_capped():
+    client = _make_client()
+    resp = client.post(
+        "/api/v1/search/batch",
+        json={"requests": [{"query": "x"}] * 21},
+    )
+    assert resp.status_code == 422
+
+
+def test_msearch_parses_responses_in_order(monkeypatch):
+    import services.api.src.routes.search as search_module
+
+    seen: dict[str, Any] = {}
+
+    def fake_post(url, body=None, *, error_label, ndjson=None):
+        seen["url"] = url
+        seen["ndjson"] = ndjson
+        return {
+            "responses": [
+                {"hits": {"hits": [{"_id": "a", "_score": 2.0, "_source": {}}]}},
+                {"error": {"type": "parse_exception"}, "status": 400},
+            ]
+        }
+
+    monkeypatch.setattr(search_module, "_opensearch_post", fake_post)
+
+    out = search_module._opensearch_msearch([{"q": 1}, {"q": 2}])
+
+    assert seen["url"].endswith("/_msearch")
+    assert seen["ndjson"] == [{}, {"q": 1}, {}, {"q": 2}]
+    assert out[0][0] == [{"segment_id": "a", "score": 2.0}]
+    assert out[1].status_code == 400
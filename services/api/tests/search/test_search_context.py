@@ -0,0 +1,134 @@
+from typing import Any
+
+from fastapi.testclient import TestClient
+from services.api.src.services.segment_context_repo import (
+    CachedSegmentContext,
+    ContextSegment,
+    _windows,
+)
+
+
+class FakeContextRepo:
+    """Transcript tr_1 has segments 0..9."""
+
+    def __init__(self) -> None:
+        self.calls: list[list[tuple[str, int, int]]] = []
+
+    def fetch_windows(self, windows):
+        self.calls.append(list(windows))
+        out = {}
+        for tid, lo, hi in windows:
+            for i in range(lo, hi + 1):
+                if tid == "tr_1" and 0 <= i < 10:
+                    out[(tid, i)] = ContextSegment(
+                        segment_id=f"seg_{i}",
+                        transcript_id=tid,
+                        segment_index=i,
+                        start_ms=i * 1000,
+                        end_ms=i * 1000 + 900,
+                        text=f"text {i}",
+                    )
+        return out
+
+
+def test_windows_merge_contiguous_ranges():
+    keys = [("t", 3), ("t", 1), ("t", 2), ("t", 7), ("u", 0)]
+    assert sorted(_windows(keys)) == [("t", 1, 3), ("t", 7, 7), ("u", 0, 0)]
+
+
+def test_neighbors_batched_and_cached():
+    repo = FakeContextRepo()
+    ctx = CachedSegmentContext(repo, ttl_s=60, max_entries=1000)
+
+    out = ctx.neighbors([("tr_1", 0), ("tr_1", 5)], 2)
+    before, after = out[("tr_1", 5)]
+    assert [s.segment_index for s in before] == [3, 4]
+    assert [s.segment_index for s in after] == [6, 7]
+    assert out[("tr_1", 0)][0] == []
+    assert len(repo.calls) == 1
+    # Overlapping hits share one window per transcript.
+    assert repo.calls[0] == [("tr_1", 1, 4), ("tr_1", 6, 7)]
+
+    # Hot transcript: served from cache, including the past-the-end miss.
+    out = ctx.neighbors([("tr_1", 4), ("tr_1", 9)], 1)
+    assert [s.segment_index for s in out[("tr_1", 9)][0]] == [8]
+    assert repo.calls[-1] == [("tr_1", 5, 5), ("tr_1", 8, 8), ("tr_1", 10, 10)]
+    ctx.neighbors([("tr_1", 9)], 1)
+    assert len(repo.calls) == 2
+
+
+def _make_client() -> TestClient:
+    from services.api.src.main import create_app
+
+    app = create_app()
+
+    import services.api.src.auth.deps as auth_deps
+
+    def _fake_require_api_key() -> dict[str, Any]:
+        return {"api_key_id": "k_test", "name": "tests", "scopes": None}
+
+    app.dependency_overrides[auth_deps.require_api_key] = _fake_require_api_key
+    return TestClient(app, raise_server_exceptions=True)
+
+
+def _fake_search(body):
+    src = {
+        "video_id": "v1",
+        "transcript_id": "tr_1",
+        "segment_index": 4,
+        "start_ms": 4000,
+        "end_ms": 4900,
+        "text": "hit",
+    }
+    return [{"segment_id": "seg_4", "score": 1.0}], {"seg_4": src}, {}, {}
+
+
+def test_search_context_option(monkeypatch):
+    import services.api.src.routes.search as search_module
+
+    repo = FakeContextRepo()
+    ctx = CachedSegmentContext(repo, ttl_s=60, max_entries=1000)
+    monkeypatch.setattr(search_module, "_opensearch_search", _fake_search)
+    monkeypatch.setattr(search_module, "_opensearch_mget", lambda ids: {})
+    monkeypatch.setattr(search_module, "get_segment_context", lambda: ctx)
+    monkeypatch.setattr(
+        search_module,
+        "_opensearch_msearch",
+        lambda bodies: [_fake_search(b) for b in bodies],
+    )
+
+    client = _make_client()
+    resp = client.get("/api/v1/search", params={"q": "hit", "context": 1})
+    assert resp.status_code == 200, resp.text
+    item = resp.json()["items"][0]
+    assert [s["id"] for s in item["context"]["before"]] == ["seg_3"]
+    assert [s["id"] for s in item["context"]["after"]] == ["seg_5"]
+
+    resp = client.post(
+        "/api/v1/search/batch",
+        json={
+            "requests": [
+                {"query": "hit", "mode": "lexical", "context": 2},
+                {"query": "hit", "mode": "lexical"},
+            ]
+        },
+    )
+    results = resp.json()["results"]
+    ctx2 = results[0]["response"]["items"][0]["context"]
+    assert [s["segment_index"] for s in ctx2["before"]] == [2, 3]
+    assert results[1]["response"]["items"][0]["context"] is None
+
+
+def test_search_without_context_skips_lookup(monkeypatch):
+    import services.api.src.routes.search as search_module
+
+    def boom():
+        raise AssertionError("context lookup should not run")
+
+    monkeypatch.setattr(search_module, "_opensearch_search", _fake_search)
+    monkeypatch.setattr(search_module, "_opensearch_mget", lambda ids: {})
+    monkeypatch.setattr(search_module, "get_segment_context", boom)
+
+    resp = _make_client().post("/api/v1/search", json={"query": "hit"})
+    assert resp.status_code == 200, resp.text
+    assert resp.json()["items"][0]["context"] is None
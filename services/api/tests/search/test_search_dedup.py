@@ -0,0 +1,98 @@
+from typing import Any
+
+from fastapi.testclient import TestClient
+from packages.shared.ids.minhash import shingles
+from services.api.src.search.hybrid.dedup import (
+    collapse_near_duplicates,
+    jaccard,
+    shingle_hashes,
+)
+from services.api.src.search.hybrid.merge import HybridItem
+from services.api.src.search.qdrant.vector_search import VectorHit
+
+BASE = "we will cut carbon emissions by half before the end of this decade"
+
+
+def _item(sid: str, score: float) -> HybridItem:
+    return HybridItem(segment_id=sid, score=score, lexical_rank=None, vector_rank=None)
+
+
+def test_shingle_similarity():
+    a = shingle_hashes(BASE)
+    assert jaccard(a, shingle_hashes(BASE.upper() + "!")) == 1.0
+    assert jaccard(a, shingle_hashes(BASE + " and more")) > 0.8
+    assert jaccard(a, shingle_hashes("something else entirely was said here")) == 0
+    assert jaccard(frozenset(), frozenset()) == 0.0
+    assert len(shingle_hashes("two words")) == 1
+
+
+def test_shingles_match_stored_minhash_tokenization():
+    text = "Well — we’ll cut CARBON emissions, by half!"
+    stored = {tuple(s.decode("utf-8").split()) for s in shingles(text)}
+    assert shingle_hashes(text) == frozenset(map(hash, stored))
+
+
+def test_collapse_keeps_best_ranked_copy():
+    merged = [_item("a", 0.9), _item("b", 0.8), _item("c", 0.7), _item("d", 0.6)]
+    texts = {
+        "a": BASE,
+        "b": "totally unrelated words about the football final tonight",
+        "c": BASE + ".",
+        # "d" has no text: kept as is.
+    }
+
+    kept, dups = collapse_near_duplicates(merged, texts, threshold=0.8)
+
+    assert [x.segment_id for x in kept] == ["a", "b", "d"]
+    assert dups == {"a": 1}
+
+
+def _make_client() -> TestClient:
+    from services.api.src.main import create_app
+
+    app = create_app()
+
+    import services.api.src.auth.deps as auth_deps
+
+    def _fake_require_api_key() -> dict[str, Any]:
+        return {"api_key_id": "k_test", "name": "tests", "scopes": None}
+
+    app.dependency_overrides[auth_deps.require_api_key] = _fake_require_api_key
+    return TestClient(app, raise_server_exceptions=True)
+
+
+def test_route_dedup_across_lexical_and_vector(monkeypatch):
+    import services.api.src.routes.search as search_module
+
+    def src(vid: str, text: str) -> dict[str, Any]:
+        return {"video_id": vid, "start_ms": 0, "end_ms": 1000, "text": text}
+
+    def fake_search(body):
+        return (
+            [{"segment_id": "orig", "score": 3.0}],
+            {"orig": src("v1", BASE)},
+            {},
+            {},
+        )
+
+    def fake_vector(**kwargs):
+        return [VectorHit("orig", 0.9), VectorHit("reupload", 0.85)]
+
+    monkeypatch.setattr(search_module, "_opensearch_search", fake_search)
+    monkeypatch.setattr(search_module, "vector_search", fake_vector)
+    monkeypatch.setattr(
+        search_module, "_opensearch_mget", lambda ids: {"reupload": src("v2", BASE)}
+    )
+    client = _make_client()
+
+    resp = client.get("/api/v1/search", params={"q": "carbon", "mode": "hybrid"})
+    assert len(resp.json()["items"]) == 2
+
+    resp = client.get(
+        "/api/v1/search", params={"q": "carbon", "mode": "hybrid", "dedup": True}
+    )
+    assert resp.status_code == 200, resp.text
+    body = resp.json()
+    assert [i["segment"]["id"] for i in body["items"]] == ["orig"]
+    assert body["items"][0]["duplicates"] == 1
+    assert body["page"]["total"] == 1
@@ -0,0 +1,119 @@
+import importlib.util
+import sys
+from pathlib import Path
+from typing import Any
+
+import pytest
+import requests
+from fastapi.testclient import TestClient
+
+
+def _load_fakes():
+    root = Path(__file__).resolve().parents[4]
+    path = root / "tools" / "benchmarks" / "fake_backends.py"
+    spec = importlib.util.spec_from_file_location("fake_backends", path)
+    assert spec and spec.loader
+    mod = importlib.util.module_from_spec(spec)
+    sys.modules[spec.name] = mod
+    spec.loader.exec_module(mod)
+    return mod
+
+
+fakes = _load_fakes()
+
+
+def _doc(sid: str, video_id: str, idx: int, text: str) -> dict[str, Any]:
+    return {
+        "segment_id": sid,
+        "video_id": video_id,
+        "segment_index": idx,
+        "start_ms": idx * 1000,
+        "end_ms": idx * 1000 + 900,
+        "text": text,
+        "language": "en",
+    }
+
+
+@pytest.fixture
+def stack(monkeypatch):
+    from services.api.src.search.breaker import reset_breakers
+
+    with fakes.FakeSearchStack.create(dim=256) as s:
+        s.seed_segments(
+            [
+                _doc("s1", "v1", 0, "the climate summit opened today"),
+                _doc("s2", "v1", 1, "climate policy and energy prices"),
+                _doc("s3", "v2", 0, "football results from the weekend"),
+            ]
+        )
+        for k, v in s.env().items():
+            monkeypatch.setenv(k, v)
+        reset_breakers()
+        yield s
+    reset_breakers()
+
+
+def _client() -> TestClient:
+    from services.api.src.main import create_app
+
+    app = create_app()
+
+    import services.api.src.auth.deps as auth_deps
+
+    app.dependency_overrides[auth_deps.require_api_key] = lambda: {
+        "api_key_id": "k_test",
+        "name": "tests",
+        "scopes": None,
+    }
+    return TestClient(app, raise_server_exceptions=True)
+
+
+def test_search_routes_run_against_fakes(stack):
+    client = _client()
+
+    resp = client.post("/api/v1/search", json={"query": "climate", "mode": "hybrid"})
+    assert resp.status_code == 200, resp.text
+    ids = [it["segment"]["id"] for it in resp.json()["items"]]
+    assert {"s1", "s2"} <= set(ids)
+    assert stack.opensearch.requests["_search"] == 1
+    assert stack.qdrant.requests["search"] == 1
+
+    resp = client.post(
+        "/api/v1/search/batch",
+        json={
+            "requests": [
+                {"query": "football", "mode": "lexical"},
+                {"query": "energy", "mode": "semantic"},
+            ]
+        },
+    )
+    assert resp.status_code == 200, resp.text
+    results = resp.json()["results"]
+    assert results[0]["response"]["items"][0]["segment"]["id"] == "s3"
+    assert results[1]["response"]["items"][0]["segment"]["id"] == "s2"
+    assert stack.opensearch.requests["_msearch"] == 1
+    assert stack.qdrant.requests["batch"] == 1
+
+
+def test_fake_opensearch_bulk_and_mget(stack):
+    from services.workers.indexer.src.opensearch.client import OpenSearchClient
+
+    OpenSearchClient(stack.opensearch.url).bulk_upsert(
+        stack.index, [_doc("s4", "v3", 0, "new segment")], id_field="segment_id"
+    )
+
+    r = requests.post(
+        f"{stack.opensearch.url}/{stack.index}/_mget",
+        json={"ids": ["s4", "missing"]},
+        timeout=5,
+    )
+    docs = r.json()["docs"]
+    assert docs[0]["found"] and docs[0]["_source"]["text"] == "new segment"
+    assert docs[1]["found"] is False
+
+
+def test_injected_failures_surface_as_503(stack):
+    stack.opensearch.latency = fakes.Latency(error_rate=1.0)
+
+    resp = _client().post("/api/v1/search", json={"query": "x", "mode": "lexical"})
+    assert resp.status_code == 503
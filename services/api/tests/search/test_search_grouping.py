@@ -0,0 +1,137 @@
+from typing import Any
+
+from fastapi.testclient import TestClient
+from services.api.src.search.hybrid.grouping import group_results
+from services.api.src.search.hybrid.merge import HybridItem
+
+
+def _item(sid: str, score: float) -> HybridItem:
+    return HybridItem(segment_id=sid, score=score, lexical_rank=None, vector_rank=None)
+
+
+def test_group_results_keeps_best_n_per_group():
+    merged = [
+        _item("a1", 0.9),
+        _item("a2", 0.8),
+        _item("a3", 0.7),
+        _item("b1", 0.85),
+    ]
+    keys = {"a1": "vid_a", "a2": "vid_a", "a3": "vid_a", "b1": "vid_b"}
+
+    groups = group_results(merged, group_keys=keys, group_size=2)
+
+    assert [g.key for g in groups] == ["vid_a", "vid_b"]
+    assert [x.segment_id for x in groups[0].items] == ["a1", "a2"]
+    assert groups[0].score == 0.9
+
+
+def test_group_results_unkeyed_segments_stay_separate():
+    merged = [_item("x", 0.5), _item("y", 0.4)]
+    groups = group_results(merged, group_keys={}, group_size=3)
+
+    assert len(groups) == 2
+    assert all(g.key is None for g in groups)
+
+
+def test_parse_collapsed_hits_expands_inner_hits():
+    import services.api.src.routes.search as search_module
+
+    data = {
+        "hits": {
+            "hits": [
+                {
+                    "_id": "a1",
+                    "_score": 3.0,
+                    "inner_hits": {
+                        "top": {
+                            "hits": {
+                                "hits": [
+                                    {"_id": "a1", "_score": 3.0, "_source": {}},
+                                    {"_id": "a2", "_score": 2.0, "_source": {}},
+                                ]
+                            }
+                        }
+                    },
+                },
+                {"_id": "b1", "_score": 1.0, "_source": {}},
+            ]
+        }
+    }
+
+    lexical, sources, _, _ = search_module._parse_search_hits(data)
+    assert [x["segment_id"] for x in lexical] == ["a1", "a2", "b1"]
+    assert set(sources) == {"a1", "a2", "b1"}
+
+
+def _make_client() -> TestClient:
+    from services.api.src.main import create_app
+
+    app = create_app()
+
+    import services.api.src.auth.deps as auth_deps
+
+    def _fake_require_api_key() -> dict[str, Any]:
+        return {"api_key_id": "k_test", "name": "tests", "scopes": None}
+
+    app.dependency_overrides[auth_deps.require_api_key] = _fake_require_api_key
+    return TestClient(app, raise_server_exceptions=True)
+
+
+def test_search_group_by_video(monkeypatch):
+    import services.api.src.routes.search as search_module
+    from services.api.src.search.qdrant.vector_search import VectorHit
+
+    seen: dict[str, Any] = {}
+
+    def src(video_id: str, start_ms: int) -> dict[str, Any]:
+        return {
+            "video_id": video_id,
+            "start_ms": start_ms,
+            "end_ms": start_ms + 1000,
+            "text": "t",
+        }
+
+    def fake_opensearch_search(body):
+        seen["body"] = body
+        lexical = [
+            {"segment_id": "a1", "score": 3.0},
+            {"segment_id": "a2", "score": 2.0},
+            {"segment_id": "b1", "score": 1.0},
+        ]
+        sources = {
+            "a1": src("vid_a", 0),
+            "a2": src("vid_a", 1000),
+            "b1": src("vid_b", 0),
+        }
+        return lexical, sources, {}, {}
+
+    def fake_vector_search(**kwargs):
+        seen["vector_kwargs"] = kwargs
+        return [VectorHit(segment_id="c1", score=0.5, group_key="vid_c")]
+
+    monkeypatch.setattr(search_module, "_opensearch_search", fake_opensearch_search)
+    monkeypatch.setattr(search_module, "vector_search", fake_vector_search)
+    monkeypatch.setattr(
+        search_module, "_opensearch_mget", lambda ids: {i: src("vid_c", 0) for i in ids}
+    )
+
+    client = _make_client()
+    resp = client.post(
+        "/api/v1/search",
+        json={"query": "hello", "group_by": "video_id", "group_size": 2, "limit": 2},
+    )
+    assert resp.status_code == 200, resp.text
+    data = resp.json()
+
+    assert seen["body"]["collapse"]["field"] == "video_id"
+    assert seen["vector_kwargs"]["group_by"] == "video_id"
+
+    groups = data["groups"]
+    assert len(groups) == 2
+    assert groups[0]["key"] == "vid_a"
+    assert groups[0]["size"] == 2
+    assert data["page"]["total"] == 3
+
+    ids = [it["segment"]["id"] for it in data["items"]]
+    assert ids[:2] == ["a1", "a2"]
+    assert len(ids) == groups[0]["size"] + groups[1]["size"]
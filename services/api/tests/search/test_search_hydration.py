@@ -0,0 +1,121 @@
+from typing import Any
+
+from fastapi.testclient import TestClient
+from services.api.src.services.search_lookup_repo import (
+    CachedSearchLookup,
+    SpeakerSummary,
+    VideoSummary,
+)
+
+
+class FakeLookupRepo:
+    def __init__(self) -> None:
+        self.calls: list[tuple[list[str], list[str]]] = []
+
+    def lookup(self, *, video_ids, speaker_ids):
+        self.calls.append((list(video_ids), list(speaker_ids)))
+        videos = {
+            v: VideoSummary(
+                video_id=v, title=f"T {v}", source="youtube", published_at=None
+            )
+            for v in video_ids
+            if v != "vid_missing"
+        }
+        speakers = {s: SpeakerSummary(speaker_id=s, name=f"N {s}") for s in speaker_ids}
+        return videos, speakers
+
+
+def test_cached_lookup_batches_and_caches():
+    repo = FakeLookupRepo()
+    lookup = CachedSearchLookup(repo, ttl_s=60, max_entries=100)
+
+    videos, speakers = lookup.resolve(
+        video_ids=["v1", "v2", "v1", "vid_missing"], speaker_ids=["s1"]
+    )
+    assert set(videos) == {"v1", "v2"}
+    assert set(speakers) == {"s1"}
+    assert repo.calls == [(["v1", "v2", "vid_missing"], ["s1"])]
+
+    # Second page: hits and negative-cached misses never reach Postgres.
+    videos, _ = lookup.resolve(video_ids=["v1", "vid_missing"], speaker_ids=["s1"])
+    assert set(videos) == {"v1"}
+    assert len(repo.calls) == 1
+
+    lookup.resolve(video_ids=["v1", "v3"], speaker_ids=[])
+    assert repo.calls[-1] == (["v3"], [])
+
+
+def _make_client() -> TestClient:
+    from services.api.src.main import create_app
+
+    app = create_app()
+
+    import services.api.src.auth.deps as auth_deps
+
+    def _fake_require_api_key() -> dict[str, Any]:
+        return {"api_key_id": "k_test", "name": "tests", "scopes": None}
+
+    app.dependency_overrides[auth_deps.require_api_key] = _fake_require_api_key
+    return TestClient(app, raise_server_exceptions=True)
+
+
+def _fake_search(body):
+    lexical = [
+        {"segment_id": "seg_1", "score": 2.0},
+        {"segment_id": "seg_2", "score": 1.0},
+    ]
+    sources = {
+        "seg_1": {
+            "video_id": "v1",
+            "speaker_id": "s1",
+            "start_ms": 0,
+            "end_ms": 1000,
+            "text": "a",
+        },
+        "seg_2": {"video_id": "v2", "start_ms": 0, "end_ms": 1000, "text": "b"},
+    }
+    return lexical, sources, {}, {}
+
+
+def test_search_items_are_hydrated(monkeypatch):
+    import services.api.src.routes.search as search_module
+
+    repo = FakeLookupRepo()
+    lookup = CachedSearchLookup(repo, ttl_s=60, max_entries=100)
+
+    monkeypatch.setattr(search_module, "_opensearch_search", _fake_search)
+    monkeypatch.setattr(search_module, "_opensearch_mget", lambda ids: {})
+    monkeypatch.setattr(search_module, "get_search_lookup", lambda: lookup)
+
+    client = _make_client()
+    resp = client.post("/api/v1/search", json={"query": "x", "mode": "lexical"})
+    assert resp.status_code == 200, resp.text
+    items = resp.json()["items"]
+
+    assert items[0]["video"] == {
+        "id": "v1",
+        "title": "T v1",
+        "source": "youtube",
+        "published_at": None,
+    }
+    assert items[0]["speaker"] == {"id": "s1", "name": "N s1"}
+    assert items[1]["video"]["id"] == "v2"
+    assert items[1]["speaker"] is None
+    assert len(repo.calls) == 1
+
+
+def test_search_survives_lookup_failure(monkeypatch):
+    import services.api.src.routes.search as search_module
+
+    class Broken:
+        def resolve(self, **kwargs):
+            raise RuntimeError("db down")
+
+    monkeypatch.setattr(search_module, "_opensearch_search", _fake_search)
+    monkeypatch.setattr(search_module, "_opensearch_mget", lambda ids: {})
+    monkeypatch.setattr(search_module, "get_search_lookup", lambda: Broken())
+
+    client = _make_client()
+    resp = client.post("/api/v1/search", json={"query": "x", "mode": "lexical"})
+    assert resp.status_code == 200, resp.text
+    assert all(it["video"] is None for it in resp.json()["items"])
@@ -0,0 +1,109 @@
+from typing import Any
+
+from fastapi.testclient import TestClient
+from services.api.src.search.suggest import (
+    Suggestion,
+    SuggestPrefixCache,
+    build_suggest_query,
+    normalize_prefix,
+    parse_suggest_response,
+)
+
+
+def _make_client() -> TestClient:
+    from services.api.src.main import create_app
+
+    app = create_app()
+
+    import services.api.src.auth.deps as auth_deps
+
+    def _fake_require_api_key() -> dict[str, Any]:
+        return {"api_key_id": "k_test", "name": "tests", "scopes": None}
+
+    app.dependency_overrides[auth_deps.require_api_key] = _fake_require_api_key
+    return TestClient(app, raise_server_exceptions=True)
+
+
+def _s(text: str, kind: str = "phrase", inputs: tuple[str, ...] = ()) -> Suggestion:
+    return Suggestion(text=text, kind=kind, score=1.0, inputs=inputs or (text,))
+
+
+def test_normalize_prefix():
+    assert normalize_prefix("  Élection  Prési") == "election presi"
+    assert normalize_prefix("re:invent") == "re invent"
+
+
+def test_query_and_parse_roundtrip():
+    body = build_suggest_query("cli", kinds=("phrase", "video"))
+    completion = body["suggest"]["s"]["completion"]
+    assert body["suggest"]["s"]["prefix"] == "cli"
+    assert completion["skip_duplicates"] is True
+    assert completion["contexts"] == {"kind": ["phrase", "video"]}
+    assert "query" not in body
+
+    data = {
+        "suggest": {
+            "s": [
+                {
+                    "options": [
+                        {
+                            "_score": 5.0,
+                            "_source": {
+                                "text": "Climate Summit",
+                                "kind": "video",
+                                "suggest": {"input": ["Climate Summit", "Summit"]},
+                            },
+                        }
+                    ]
+                }
+            ]
+        }
+    }
+    (s,) = parse_suggest_response(data)
+    assert (s.text, s.kind, s.score) == ("Climate Summit", "video", 5.0)
+    assert s.matches("summ") and not s.matches("clx")
+
+
+def test_prefix_cache_derives_longer_prefixes():
+    cache = SuggestPrefixCache(ttl_s=60, max_entries=100, fetch_size=3)
+    kinds = ("phrase",)
+    cache.set("cl", kinds, [_s("climate change"), _s("close call")])
+
+    assert [s.text for s in cache.get("clim", kinds)] == ["climate change"]
+    assert cache.get("cl", ("video",)) is None
+
+    # A full page may be truncated: longer prefixes must go to OpenSearch.
+    cache.set("ca", kinds, [_s("carbon"), _s("cat"), _s("car")])
+    assert cache.get("carb", kinds) is None
+
+
+def test_suggest_route_uses_cache(monkeypatch):
+    import services.api.src.routes.search as search_module
+    from services.api.src.search import suggest
+
+    monkeypatch.setattr(
+        suggest, "_cache", SuggestPrefixCache(ttl_s=60, max_entries=100)
+    )
+    calls: list[tuple[str, tuple[str, ...]]] = []
+
+    def fake_suggest(prefix, kinds):
+        calls.append((prefix, kinds))
+        return [_s("Jane Doe", "speaker", ("Jane Doe", "Doe")), _s("jam session")]
+
+    def no_segments(body):
+        raise AssertionError("autocomplete must not query the segments index")
+
+    monkeypatch.setattr(search_module, "_opensearch_suggest", fake_suggest)
+    monkeypatch.setattr(search_module, "_opensearch_search", no_segments)
+    client = _make_client()
+
+    resp = client.get("/api/v1/search/suggest", params={"q": "Ja"})
+    assert resp.status_code == 200, resp.text
+    assert [i["text"] for i in resp.json()["items"]] == ["Jane Doe", "jam session"]
+
+    resp = client.get("/api/v1/search/suggest", params={"q": "jan", "limit": 1})
+    assert [i["text"] for i in resp.json()["items"]] == ["Jane Doe"]
+    assert calls == [("ja", ("phrase", "speaker", "video"))]
+
+    resp = client.get("/api/v1/search/suggest", params={"q": "ja", "kind": "nope"})
+    assert resp.status_code == 400
@@ -0,0 +1,76 @@
+from typing import Any
+
+from fastapi.testclient import TestClient
+from services.api.src.search.opensearch.lexical_query import (
+    TYPEAHEAD_SOURCE,
+    build_typeahead_query,
+)
+from services.api.src.search.snippets import make_snippet
+
+
+def _make_client() -> TestClient:
+    from services.api.src.main import create_app
+
+    app = create_app()
+
+    import services.api.src.auth.deps as auth_deps
+
+    def _fake_require_api_key() -> dict[str, Any]:
+        return {"api_key_id": "k_test", "name": "tests", "scopes": None}
+
+    app.dependency_overrides[auth_deps.require_api_key] = _fake_require_api_key
+    return TestClient(app, raise_server_exceptions=True)
+
+
+def test_typeahead_body_is_lightweight():
+    body = build_typeahead_query(
+        query="carbon ta", filters=[{"term": {"language": "en"}}], limit=500
+    )
+
+    assert body["size"] == 20
+    assert body["_source"] == TYPEAHEAD_SOURCE
+    assert body["track_total_hits"] is False
+    assert "sort" not in body and "highlight" not in body
+
+    should = body["query"]["bool"]["must"][0]["bool"]["should"]
+    assert should[0]["match"]["text.prefix"]["query"] == "carbon ta"
+    assert should[1]["match"]["text"]["fuzziness"] == "AUTO"
+    assert body["query"]["bool"]["filter"] == [{"term": {"language": "en"}}]
+
+
+def test_prefix_snippet_highlights_whole_word():
+    terms = frozenset({"carb"})
+    assert make_snippet("a carbon tax", terms) is None
+    assert make_snippet("a carbon tax", terms, prefix=True) == "a <em>carbon</em> tax"
+
+
+def test_typeahead_route(monkeypatch):
+    import services.api.src.routes.search as search_module
+
+    bodies: list[dict] = []
+
+    def fake_search(body):
+        bodies.append(body)
+        src = {"video_id": "v1", "start_ms": 0, "end_ms": 900, "text": "carbon tax"}
+        return [{"segment_id": "s1", "score": 1.0}], {"s1": src}, {}, {}
+
+    def no_vector(**kwargs):
+        raise AssertionError("typeahead must not run the vector leg")
+
+    monkeypatch.setattr(search_module, "_opensearch_search", fake_search)
+    monkeypatch.setattr(search_module, "vector_search", no_vector)
+    client = _make_client()
+
+    resp = client.get("/api/v1/search/typeahead", params={"q": "c"})
+    assert resp.status_code == 200, resp.text
+    assert resp.json() == {"items": []}
+    assert bodies == []
+
+    resp = client.get(
+        "/api/v1/search/typeahead", params={"q": "carb", "language": "en"}
+    )
+    assert resp.status_code == 200, resp.text
+    item = resp.json()["items"][0]
+    assert item["segment_id"] == "s1"
+    assert item["highlight"] == "<em>carbon</em> tax"
+    assert bodies[0]["query"]["bool"]["filter"] == [{"term": {"language": "en"}}]
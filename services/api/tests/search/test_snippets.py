@@ -0,0 +1,86 @@
+from typing import Any
+
+from fastapi.testclient import TestClient
+from services.api.src.search.snippets import make_snippet, query_terms
+
+
+def test_query_terms_casefold_and_skip_single_letters():
+    assert query_terms("Climate a Policy 5") == {"climate", "policy", "5"}
+
+
+def test_short_text_is_highlighted_whole():
+    out = make_snippet("Climate policy, climate action.", query_terms("climate"))
+    assert out == "<em>Climate</em> policy, <em>climate</em> action."
+
+
+def test_no_match_returns_none():
+    assert make_snippet("nothing relevant here", query_terms("climate")) is None
+    assert make_snippet("", query_terms("climate")) is None
+    assert make_snippet("climate", frozenset()) is None
+
+
+def test_long_text_is_windowed_around_densest_cluster():
+    filler = " ".join(f"word{i}" for i in range(60))
+    text = f"climate at the start. {filler} energy prices and climate policy. {filler}"
+
+    out = make_snippet(text, query_terms("climate energy"), max_chars=80)
+
+    assert out is not None
+    assert out.startswith("…") and out.endswith("…")
+    assert "<em>energy</em>" in out and "<em>climate</em> policy" in out
+    plain = out.replace("<em>", "").replace("</em>", "").strip("…")
+    assert len(plain) <= 90
+    # Window edges never split a word.
+    assert plain.split()[0] in text.split()
+    assert plain.split()[-1] in text.split()
+
+
+def _make_client() -> TestClient:
+    from services.api.src.main import create_app
+
+    app = create_app()
+
+    import services.api.src.auth.deps as auth_deps
+
+    def _fake_require_api_key() -> dict[str, Any]:
+        return {"api_key_id": "k_test", "name": "tests", "scopes": None}
+
+    app.dependency_overrides[auth_deps.require_api_key] = _fake_require_api_key
+    return TestClient(app, raise_server_exceptions=True)
+
+
+def test_vector_only_hits_get_local_highlights(monkeypatch):
+    import services.api.src.routes.search as search_module
+    from services.api.src.search.qdrant.vector_search import VectorHit
+
+    src = {"video_id": "v1", "start_ms": 0, "end_ms": 1000}
+    lexical_hl = [search_module.SearchHighlight(field="text", text="<em>x</em>")]
+
+    def fake_search(body):
+        return (
+            [{"segment_id": "lex", "score": 1.0}],
+            {"lex": {**src, "text": "lexical climate hit"}},
+            {"lex": 1.0},
+            {"lex": lexical_hl},
+        )
+
+    monkeypatch.setattr(search_module, "_opensearch_search", fake_search)
+    monkeypatch.setattr(
+        search_module,
+        "vector_search",
+        lambda **kw: [VectorHit(segment_id="vec", score=0.9)],
+    )
+    monkeypatch.setattr(
+        search_module,
+        "_opensearch_mget",
+        lambda ids: {"vec": {**src, "text": "the Climate summit"}},
+    )
+
+    resp = _make_client().post("/api/v1/search", json={"query": "climate"})
+    assert resp.status_code == 200, resp.text
+    by_id = {it["segment"]["id"]: it for it in resp.json()["items"]}
+
+    assert by_id["lex"]["highlights"] == [{"field": "text", "text": "<em>x</em>"}]
+    assert by_id["vec"]["highlights"] == [
+        {"field": "text", "text": "the <em>Climate</em> summit"}
+    ]
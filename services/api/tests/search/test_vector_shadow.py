@@ -0,0 +1,95 @@
+import services.api.src.search.qdrant.shadow as shadow_module
+import services.api.src.search.qdrant.vector_search as vs
+from services.api.src.search.qdrant.shadow import (
+    SHADOW_EVENTS,
+    ShadowConfig,
+    ShadowReader,
+    load_shadow_config,
+    overlap,
+)
+
+
+def _events(outcome: str) -> float:
+    return SHADOW_EVENTS.labels(outcome=outcome)._value.get()
+
+
+def test_overlap():
+    assert overlap(["a", "b", "c", "d"], ["b", "d", "x"]) == 0.5
+    assert overlap([], []) == 1.0
+    assert overlap([], ["a"]) == 0.0
+
+
+def test_load_shadow_config_requires_collection_and_model(monkeypatch):
+    monkeypatch.delenv("EMBEDDING_SHADOW_MODEL", raising=False)
+    monkeypatch.setenv("QDRANT_SHADOW_COLLECTION", "narralytica-segments-v2")
+    assert load_shadow_config() is None
+
+    monkeypatch.setenv("EMBEDDING_SHADOW_MODEL", "bge-m3")
+    monkeypatch.setenv("EMBEDDING_SHADOW_VECTOR_SIZE", "768")
+    monkeypatch.setenv("QDRANT_SHADOW_READ_RATE", "5")
+    cfg = load_shadow_config()
+    assert cfg == ShadowConfig(
+        collection="narralytica-segments-v2",
+        model="bge-m3",
+        vector_size=768,
+        sample_rate=1.0,
+        max_inflight=4,
+    )
+
+
+def test_shadow_reader_drops_when_saturated():
+    reader = ShadowReader(ShadowConfig("c", "m", 8, max_inflight=1))
+    assert reader._slots.acquire(blocking=False)
+    before = _events("dropped")
+
+    reader.submit([["a"]], lambda: [["a"]])
+
+    assert _events("dropped") == before + 1
+    reader._slots.release()
+    reader._pool.shutdown(wait=True)
+
+
+def test_vector_search_shadow_reads_other_collection(monkeypatch):
+    monkeypatch.setenv("QDRANT_SHADOW_COLLECTION", "narralytica-segments-v2")
+    monkeypatch.setenv("EMBEDDING_SHADOW_MODEL", "bge-m3")
+    monkeypatch.setenv("EMBEDDING_SHADOW_VECTOR_SIZE", "4")
+    monkeypatch.setenv("QDRANT_SHADOW_READ_RATE", "1")
+    shadow_module.reset_shadow_reader()
+
+    embed_models: list[str | None] = []
+    posts: list[tuple[str, str | None, str]] = []
+
+    def fake_embed_text(text):
+        embed_models.append(None)
+        return [0.1, 0.2]
+
+    def fake_embed_texts(texts, *, model=None, vector_size=None, breaker_name=""):
+        embed_models.append(model)
+        return [[0.1] * (vector_size or 2) for _ in texts]
+
+    def fake_post(path, body, *, collection=None, breaker_name="qdrant"):
+        posts.append((path, collection, breaker_name))
+        ids = ["s1", "s2"] if collection is None else ["s2", "s9"]
+        return [{"id": i, "score": 0.5, "payload": {"segment_id": i}} for i in ids]
+
+    monkeypatch.setattr(vs, "embed_text", fake_embed_text)
+    monkeypatch.setattr(vs, "embed_texts", fake_embed_texts)
+    monkeypatch.setattr(vs, "_qdrant_post", fake_post)
+
+    ok_before = _events("ok")
+    try:
+        hits = vs.vector_search(query_text="hello", filters=None, top_k=5)
+        reader = shadow_module.get_shadow_reader()
+        assert reader is not None
+        reader._pool.shutdown(wait=True)
+    finally:
+        shadow_module.reset_shadow_reader()
+
+    # Results always come from the primary collection.
+    assert [h.segment_id for h in hits] == ["s1", "s2"]
+    assert embed_models == [None, "bge-m3"]
+    assert posts == [
+        ("points/search", None, "qdrant"),
+        ("points/search", "narralytica-segments-v2", "qdrant_shadow"),
+    ]
+    assert _events("ok") == ok_before + 1
@@ -0,0 +1,188 @@
+from __future__ import annotations
+
+import asyncio
+from dataclasses import replace
+
+import pytest
+import services.api.src.auth.deps as deps
+import services.api.src.auth.key_cache as key_cache
+from fastapi import HTTPException
+from fastapi.security import HTTPAuthorizationCredentials
+from services.api.src.auth.key_cache import (
+    ApiKeyCache,
+    LastUsedWriter,
+    RevocationVersion,
+    VerifiedKey,
+)
+
+
+class FakeRedis:
+    def __init__(self) -> None:
+        self.data: dict[str, int] = {}
+
+    async def get(self, key: str) -> int | None:
+        return self.data.get(key)
+
+    async def incr(self, key: str) -> int:
+        self.data[key] = self.data.get(key, 0) + 1
+        return self.data[key]
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.t = 0.0
+
+    def __call__(self) -> float:
+        return self.t
+
+
+def _revocations(r: FakeRedis, clock: FakeClock) -> RevocationVersion:
+    return RevocationVersion(None, check_interval_s=2, clock=clock, client=r)
+
+
+def test_revocation_in_one_process_clears_cache_in_another():
+    r, clock = FakeRedis(), FakeClock()
+    a = ApiKeyCache(ttl_s=60, max_entries=10, revocations=_revocations(r, clock))
+    b = ApiKeyCache(ttl_s=60, max_entries=10, revocations=_revocations(r, clock))
+    key = VerifiedKey(id="k1", name="tests")
+    b.set("h1", key)
+    assert asyncio.run(b.get("h1")) == key
+
+    asyncio.run(a.invalidate("h1"))
+
+    # b only re-reads the counter once per check interval
+    assert asyncio.run(b.get("h1")) == key
+    clock.t += 2
+    assert asyncio.run(b.get("h1")) is None
+
+
+def test_slow_redis_keeps_cache_without_blocking():
+    class SlowRedis(FakeRedis):
+        async def get(self, key: str) -> int | None:
+            await asyncio.sleep(1.0)
+            return 99
+
+    clock = FakeClock()
+    rv = RevocationVersion(
+        None, check_interval_s=2, clock=clock, timeout_s=0.01, client=SlowRedis()
+    )
+    cache = ApiKeyCache(ttl_s=60, max_entries=10, revocations=rv)
+    key = VerifiedKey(id="k1", name="tests")
+    cache.set("h1", key)
+
+    async def run() -> tuple[VerifiedKey | None, int]:
+        ticks = 0
+
+        async def ticker() -> None:
+            nonlocal ticks
+            while True:
+                ticks += 1
+                await asyncio.sleep(0)
+
+        t = asyncio.create_task(ticker())
+        try:
+            return await cache.get("h1"), ticks
+        finally:
+            t.cancel()
+
+    hit, ticks = asyncio.run(run())
+    assert hit == key
+    # The loop kept running while the revocation check waited on Redis.
+    assert ticks > 1
+
+
+def test_last_used_writer_batches_latest_timestamp_per_key():
+    executed: list[list[dict]] = []
+
+    class FakeConn:
+        def __enter__(self):
+            return self
+
+        def __exit__(self, *exc):
+            return False
+
+        def execute(self, stmt, rows):
+            executed.append(rows)
+
+    class FakeEngine:
+        def begin(self):
+            return FakeConn()
+
+    writer = LastUsedWriter(lambda: FakeEngine(), flush_interval_s=3600)
+    for key_id in ("k1", "k2", "k1", "k1"):
+        writer.touch(key_id)
+
+    assert writer.flush() == 2
+    assert writer.flush() == 0
+    writer.stop()
+
+    assert len(executed) == 1
+    assert sorted(row["key_id"] for row in executed[0]) == ["k1", "k2"]
+
+
+def test_require_api_key_hits_database_once(monkeypatch):
+    monkeypatch.setattr(
+        deps, "settings", replace(deps.settings, api_key_pepper="pepper")
+    )
+    monkeypatch.setattr(key_cache, "settings", deps.settings)
+    key_cache.reset_api_key_state()
+
+    loads: list[str] = []
+
+    async def fake_load(key_hash):
+        loads.append(key_hash)
+        return VerifiedKey(id="k1", name="tests") if len(loads) == 1 else None
+
+    touched: list[str] = []
+    monkeypatch.setattr(deps, "load_active_key", fake_load)
+    monkeypatch.setattr(
+        key_cache.LastUsedWriter, "touch", lambda self, key_id: touched.append(key_id)
+    )
+
+    creds = HTTPAuthorizationCredentials(scheme="Bearer", credentials="secret")
+    try:
+        for _ in range(3):
+            assert asyncio.run(deps.require_api_key(creds))["api_key_id"] == "k1"
+        assert len(loads) == 1
+        assert touched == ["k1", "k1", "k1"]
+
+        # Unknown keys are never cached.
+        bad = HTTPAuthorizationCredentials(scheme="Bearer", credentials="other")
+        for _ in range(2):
+            with pytest.raises(HTTPException) as e:
+                asyncio.run(deps.require_api_key(bad))
+            assert e.value.status_code == 403
+        assert len(loads) == 3
+    finally:
+        key_cache.reset_api_key_state()
+
+
+def test_revoked_key_rejected_within_check_interval(monkeypatch):
+    monkeypatch.setattr(
+        deps, "settings", replace(deps.settings, api_key_pepper="pepper")
+    )
+    r, clock = FakeRedis(), FakeClock()
+    cache = ApiKeyCache(ttl_s=60, max_entries=10, revocations=_revocations(r, clock))
+    monkeypatch.setattr(key_cache, "_cache", cache)
+    monkeypatch.setattr(key_cache.LastUsedWriter, "touch", lambda self, key_id: None)
+
+    revoked = False
+
+    async def fake_load(key_hash):
+        return None if revoked else VerifiedKey(id="k1", name="tests")
+
+    monkeypatch.setattr(deps, "load_active_key", fake_load)
+    creds = HTTPAuthorizationCredentials(scheme="Bearer", credentials="secret")
+    try:
+        assert asyncio.run(deps.require_api_key(creds))["api_key_id"] == "k1"
+
+        # Revoked by another process: row updated, counter bumped in Redis.
+        revoked = True
+        asyncio.run(r.incr(key_cache.REVOCATION_VERSION_KEY))
+
+        clock.t += 2  # API_KEY_REVOCATION_CHECK_S, far below the 60 s TTL
+        with pytest.raises(HTTPException) as e:
+            asyncio.run(deps.require_api_key(creds))
+        assert e.value.status_code == 403
+    finally:
+        key_cache.reset_api_key_state()
@@ -0,0 +1,99 @@
+from __future__ import annotations
+
+import asyncio
+from contextlib import asynccontextmanager
+
+import pytest
+import services.api.src.db.aio as aio
+from fastapi import Depends, FastAPI
+from fastapi.testclient import TestClient
+
+
+class FakeConn:
+    def __init__(self) -> None:
+        self.read_only: bool | None = None
+        self.broken = False
+        self.events: list[str] = []
+
+    async def set_read_only(self, value: bool | None) -> None:
+        self.read_only = value
+        self.events.append(f"read_only={value}")
+
+    async def execute(self, query: str) -> None:
+        self.events.append(query)
+
+    @asynccontextmanager
+    async def transaction(self):
+        self.events.append("begin")
+        try:
+            yield
+        except Exception:
+            self.events.append("rollback")
+            raise
+        self.events.append("commit")
+
+
+class FakePool:
+    def __init__(self) -> None:
+        self.conn = FakeConn()
+
+    @asynccontextmanager
+    async def connection(self):
+        yield self.conn
+
+
+@pytest.fixture
+def pool(monkeypatch) -> FakePool:
+    pool = FakePool()
+
+    async def fake_get_async_pool(dsn, config=None):
+        return pool
+
+    monkeypatch.setattr(aio, "get_async_pool", fake_get_async_pool)
+    return pool
+
+
+def test_read_conn_wraps_a_read_only_transaction(pool):
+    async def run() -> None:
+        async with aio.read_conn("postgresql://h/db") as conn:
+            assert conn.read_only is True
+
+    asyncio.run(run())
+    assert pool.conn.events == ["read_only=True", "begin", "commit", "read_only=None"]
+
+
+def test_read_conn_resets_read_only_after_errors(pool):
+    async def run() -> None:
+        async with aio.read_conn("postgresql://h/db"):
+            raise LookupError
+
+    with pytest.raises(LookupError):
+        asyncio.run(run())
+    assert pool.conn.events[-2:] == ["rollback", "read_only=None"]
+    assert pool.conn.read_only is None
+
+
+def test_statement_timeout_is_set_local_per_request(pool):
+    app = FastAPI()
+
+    async def read() -> dict:
+        async with aio.read_conn("postgresql://h/db"):
+            return {"ok": True}
+
+    app.get("/slow", dependencies=[Depends(aio.statement_timeout(250))])(read)
+    app.get("/plain")(read)
+    c = TestClient(app)
+
+    assert c.get("/slow").status_code == 200
+    # Inside the read-only transaction, so it ends with COMMIT.
+    assert pool.conn.events == [
+        "read_only=True",
+        "begin",
+        "SET LOCAL statement_timeout = 250",
+        "commit",
+        "read_only=None",
+    ]
+
+    pool.conn.events.clear()
+    assert c.get("/plain").status_code == 200
+    assert pool.conn.events == ["read_only=True", "begin", "commit", "read_only=None"]
@@ -0,0 +1,81 @@
+from __future__ import annotations
+
+from dataclasses import replace
+
+import services.api.src.db.engine as engine_mod
+from prometheus_client import REGISTRY
+from sqlalchemy import text
+
+
+def _sample(name: str, labels: dict | None = None) -> float:
+    return REGISTRY.get_sample_value(name, labels or {}) or 0.0
+
+
+def test_pool_metrics_follow_checkouts(monkeypatch, tmp_path):
+    monkeypatch.setattr(
+        engine_mod,
+        "settings",
+        replace(
+            engine_mod.settings,
+            database_url=f"sqlite:///{tmp_path / 'db.sqlite'}",
+            db_pool_size=1,
+            db_max_overflow=1,
+            db_statement_timeout_ms=0,
+        ),
+    )
+    engine_mod.dispose_engine()
+    waits = _sample("narralytica_db_pool_wait_seconds_count")
+    checked_out = {"state": "checked_out"}
+    overflow = {"state": "overflow"}
+    try:
+        engine = engine_mod.get_engine()
+        assert engine.pool.size() == 1
+        with engine.connect() as a, engine.connect() as b:
+            a.execute(text("SELECT 1"))
+            b.execute(text("SELECT 1"))
+            assert _sample("narralytica_db_pool_connections", checked_out) == 2
+            assert _sample("narralytica_db_pool_connections", overflow) == 1
+        assert _sample("narralytica_db_pool_connections", checked_out) == 0
+        assert _sample("narralytica_db_pool_wait_seconds_count") == waits + 2
+    finally:
+        engine_mod.dispose_engine()
+    assert _sample("narralytica_db_pool_connections", checked_out) == 0
+
+
+def test_server_disconnect_sqlstates():
+    class DbError(Exception):
+        def __init__(self, sqlstate):
+            self.sqlstate = sqlstate
+
+    assert engine_mod._is_server_disconnect(DbError("08006"))
+    assert engine_mod._is_server_disconnect(DbError("57P01"))
+    assert not engine_mod._is_server_disconnect(DbError("57014"))  # query canceled
+    assert not engine_mod._is_server_disconnect(DbError(None))
+    assert not engine_mod._is_server_disconnect(ValueError())
+
+
+def test_get_conn_with_timeout_sets_timeout_inside_the_transaction(monkeypatch):
+    events: list[str] = []
+
+    class FakeConn:
+        def __enter__(self):
+            events.append("begin")
+            return self
+
+        def __exit__(self, *exc):
+            events.append("commit")
+            return False
+
+        def execute(self, stmt):
+            events.append(str(stmt))
+
+    class FakeEngine:
+        def begin(self):
+            return FakeConn()
+
+    monkeypatch.setattr(engine_mod, "get_engine", lambda: FakeEngine())
+    deps = engine_mod.get_conn_with_timeout(250)()
+    next(deps)
+    assert events == ["begin", "SET LOCAL statement_timeout = 250"]
+    deps.close()
+    assert events[-1] == "commit"
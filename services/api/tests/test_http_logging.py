@@ -0,0 +1,46 @@
+from __future__ import annotations
+
+import logging
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from services.api.src.telemetry.http_logging import HttpLoggingMiddleware
+
+
+def _make_app() -> FastAPI:
+    app = FastAPI()
+    app.add_middleware(HttpLoggingMiddleware)
+
+    @app.get("/api/ping")
+    def ping():
+        return {"ok": True}
+
+    @app.get("/api/boom")
+    def boom():
+        raise RuntimeError("boom")
+
+    return app
+
+
+def test_logs_one_line_per_request(caplog):
+    caplog.set_level(logging.INFO, logger="http")
+    r = TestClient(_make_app()).get("/api/ping")
+    assert r.status_code == 200
+
+    [rec] = [r for r in caplog.records if r.name == "http"]
+    assert rec.getMessage() == "request"
+    assert rec.method == "GET"
+    assert rec.path == "/api/ping"
+    assert rec.status_code == 200
+    assert rec.duration_ms >= 0
+
+
+def test_logs_when_app_raises(caplog):
+    caplog.set_level(logging.INFO, logger="http")
+    with pytest.raises(RuntimeError):
+        TestClient(_make_app()).get("/api/boom")
+
+    [rec] = [r for r in caplog.records if r.name == "http"]
+    assert rec.path == "/api/boom"
+    assert rec.status_code is None
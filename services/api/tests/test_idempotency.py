@@ -0,0 +1,179 @@
+from __future__ import annotations
+
+import asyncio
+import json
+from typing import Any
+
+import services.api.src.auth.deps as auth_deps
+import services.api.src.services.idempotency as idem
+from fastapi.testclient import TestClient
+from services.api.src.main import create_app
+from services.api.src.routes.ingest import get_idempotency_store
+from services.api.src.services.idempotency import (
+    MemoryIdempotencyStore,
+    RedisIdempotencyStore,
+    is_pending,
+)
+
+
+class FakeRedis:
+    def __init__(self) -> None:
+        self.data: dict[str, str] = {}
+        self.round_trips = 0
+
+    def pipeline(self, transaction: bool = True) -> FakePipeline:
+        return FakePipeline(self)
+
+
+class FakePipeline:
+    def __init__(self, r: FakeRedis) -> None:
+        self.r = r
+        self.ops: list[tuple[str, tuple]] = []
+
+    def set(self, key, value, nx=False, ex=None):
+        self.ops.append(("set", (key, value, nx)))
+
+    def get(self, key):
+        self.ops.append(("get", (key,)))
+
+    async def execute(self) -> list[Any]:
+        self.r.round_trips += 1
+        out: list[Any] = []
+        for op, args in self.ops:
+            if op == "set":
+                key, value, nx = args
+                if nx and key in self.r.data:
+                    out.append(None)
+                else:
+                    self.r.data[key] = value
+                    out.append(True)
+            else:
+                out.append(self.r.data.get(args[0]))
+        return out
+
+
+def test_memory_reserve_claims_once():
+    store = MemoryIdempotencyStore()
+
+    async def run():
+        first = await store.reserve("k")
+        second = await store.reserve("k")
+        await store.set("k", {"job_id": "j1"})
+        third = await store.reserve("k")
+        return first, second, third
+
+    first, second, third = asyncio.run(run())
+    assert first is None
+    assert is_pending(second)
+    assert third == {"job_id": "j1"}
+
+
+def test_redis_reserve_is_one_round_trip(monkeypatch):
+    r = FakeRedis()
+    monkeypatch.setattr(idem, "get_async_redis", lambda url: r)
+    store = RedisIdempotencyStore("redis://test")
+
+    async def run():
+        return await store.reserve("k"), await store.reserve("k")
+
+    first, second = asyncio.run(run())
+    assert first is None
+    assert is_pending(second)
+    assert r.round_trips == 2
+    assert json.loads(r.data["k"]) == idem.PENDING
+
+
+def test_ingest_duplicate_in_flight_returns_409():
+    store = MemoryIdempotencyStore()
+    app = create_app()
+    app.dependency_overrides[get_idempotency_store] = lambda: store
+    app.dependency_overrides[auth_deps.require_api_key] = lambda: {
+        "api_key_id": "k_test",
+        "name": "tests",
+        "scopes": None,
+    }
+    c = TestClient(app)
+
+    payload = {
+        "external_id": "ext_inflight",
+        "source": {"kind": "external_url", "url": "https://example.com/v.mp4"},
+    }
+    key = idem_key_for(payload["external_id"])
+    asyncio.run(store.reserve(key))
+
+    r = c.post("/api/v1/ingest", json=payload)
+    assert r.status_code == 409, r.text
+
+    # Once the first request finished, duplicates replay its result.
+    asyncio.run(store.release(key))
+    r1 = c.post("/api/v1/ingest", json=payload)
+    r2 = c.post("/api/v1/ingest", json=payload)
+    assert r1.status_code == 201
+    assert r2.json()["job_id"] == r1.json()["job_id"]
+    assert r2.json()["idempotent_replay"] is True
+
+
+def idem_key_for(external_id: str) -> str:
+    from services.api.src.routes.ingest import _idempotency_key
+
+    return _idempotency_key("anon", external_id)
+
+
+def test_memory_store_is_bounded_and_swept():
+    store = MemoryIdempotencyStore(max_entries=100, sweep_interval_s=3600)
+
+    async def run():
+        for i in range(1000):
+            await store.set(f"k{i}", {"job_id": str(i)})
+        await store.set("short", {"job_id": "s"}, ttl_seconds=0)
+
+    asyncio.run(run())
+    assert len(store) == 100
+    assert asyncio.run(store.get("k999")) == {"job_id": "999"}
+    assert asyncio.run(store.get("k0")) is None
+
+    assert store.sweep() == 1
+    assert len(store) == 99
+
+
+def _ingest_client(store) -> TestClient:
+    app = create_app()
+    app.dependency_overrides[get_idempotency_store] = lambda: store
+    app.dependency_overrides[auth_deps.require_api_key] = lambda: {
+        "api_key_id": "k_test",
+        "name": "tests",
+        "scopes": None,
+    }
+    return TestClient(app)
+
+
+def test_ingest_only_releases_keys_it_reserved():
+    payload = {
+        "external_id": "ext_owned",
+        "source": {"kind": "external_url", "url": "https://example.com/v.mp4"},
+    }
+
+    class DownStore(MemoryIdempotencyStore):
+        def __init__(self) -> None:
+            super().__init__()
+            self.released: list[str] = []
+
+        async def reserve(self, key, ttl_seconds=None):
+            raise ConnectionError("redis down")
+
+        async def release(self, key):
+            self.released.append(key)
+            raise ConnectionError("redis down")
+
+    down = DownStore()
+    r = _ingest_client(down).post("/api/v1/ingest", json=payload)
+    assert r.status_code == 400, r.text
+    assert down.released == []
+
+    # A stored record that fails to replay belongs to an earlier request.
+    store = MemoryIdempotencyStore()
+    key = idem_key_for(payload["external_id"])
+    asyncio.run(store.set(key, {"job_id": "j1"}))
+    r = _ingest_client(store).post("/api/v1/ingest", json=payload)
+    assert r.status_code == 400, r.text
+    assert asyncio.run(store.get(key)) == {"job_id": "j1"}
@@ -1,11 +1,24 @@
 from __future__ import annotations
 
+import asyncio
+import threading
+
 from fastapi import FastAPI
+from fastapi.responses import StreamingResponse
 from fastapi.testclient import TestClient
-from services.api.src.middleware.rate_limit import RateLimitMiddleware
+from services.api.src.auth import deps, key_cache
+from services.api.src.auth.api_keys import hash_api_key
+from services.api.src.middleware.rate_limit import (
+    FallbackStore,
+    InMemoryStore,
+    LocalPrecheckStore,
+    RateLimitMiddleware,
+    gcra,
+    parse_tiers,
+)
 
 
-def make_app(*, limit: int = 2, window_seconds: int = 60) -> FastAPI:
+def make_app(*, limit: int = 2, window_seconds: int = 60, **kwargs) -> FastAPI:
     app = FastAPI()
     app.add_middleware(
         RateLimitMiddleware,
@@ -14,6 +27,7 @@ def make_app(*, limit: int = 2, window_seconds: int = 60) -> FastAPI:
         window_seconds=window_seconds,
         redis_url=None,  # in-memory for unit tests
         path_prefix="/api/",
+        **kwargs,
     )
 
     @app.get("/api/ping")
@@ -71,3 +85,186 @@ def test_not_applied_outside_prefix():
         r = c.get("/public")
         assert r.status_code == 200
         assert "X-RateLimit-Limit" not in r.headers
+
+
+def test_gcra_has_no_window_boundary_burst():
+    # Fixed windows allowed `limit` at the end of one window and `limit` again
+    # right after the boundary; GCRA refills one request per window/limit.
+    tat = None
+    allowed = 0
+    for i in range(20):
+        ok, new_tat = gcra(tat, 59.0 + i * 0.1, limit=10, window_seconds=60)
+        if ok:
+            allowed += 1
+        tat = new_tat
+    assert allowed == 10
+
+    ok, _ = gcra(tat, 59.0 + 6.0, limit=10, window_seconds=60)
+    assert ok
+
+
+def test_parse_tiers():
+    assert parse_tiers("free:60, pro:600,bad,zero:0,:5") == {"free": 60, "pro": 600}
+
+
+def test_rate_limit_uses_tier_of_verified_key(monkeypatch):
+    async def no_key(key_hash):
+        return None
+
+    monkeypatch.setattr(deps, "load_active_key", no_key)
+    key_cache.reset_api_key_state()
+    cache = key_cache.get_api_key_cache()
+    cache.set(
+        hash_api_key("k1", "pepper"),
+        key_cache.VerifiedKey(id="id1", name="tests", rate_limit_tier="pro"),
+    )
+    app = make_app(limit=1, tiers={"pro": 3}, api_key_pepper="pepper")
+    c = TestClient(app)
+    try:
+        codes = [c.get("/api/ping", headers={"x-api-key": "k1"}) for _ in range(4)]
+        assert [r.status_code for r in codes] == [200, 200, 200, 429]
+        assert codes[0].headers["X-RateLimit-Limit"] == "3"
+
+        # Unknown keys get the default limit.
+        r = [c.get("/api/ping", headers={"x-api-key": "k2"}) for _ in range(2)]
+        assert [x.status_code for x in r] == [200, 429]
+    finally:
+        key_cache.reset_api_key_state()
+
+
+def test_rate_limit_loads_tier_on_cold_key_cache(monkeypatch):
+    loads: list[str] = []
+
+    async def fake_load(key_hash):
+        loads.append(key_hash)
+        return key_cache.VerifiedKey(id="id1", name="tests", rate_limit_tier="pro")
+
+    monkeypatch.setattr(deps, "load_active_key", fake_load)
+    key_cache.reset_api_key_state()
+    app = make_app(limit=1, tiers={"pro": 3}, api_key_pepper="pepper")
+    c = TestClient(app)
+    try:
+        # First request on a fresh process: no 429 at the default limit.
+        codes = [c.get("/api/ping", headers={"x-api-key": "k1"}) for _ in range(3)]
+        assert [r.status_code for r in codes] == [200, 200, 200]
+        assert codes[0].headers["X-RateLimit-Limit"] == "3"
+        assert len(loads) == 1
+
+        # A revocation clear drops verified keys, not the tier.
+        asyncio.run(key_cache.get_api_key_cache().invalidate())
+        r = c.get("/api/ping", headers={"x-api-key": "k1"})
+        assert r.headers["X-RateLimit-Limit"] == "3"
+        assert len(loads) == 1
+    finally:
+        key_cache.reset_api_key_state()
+
+
+def test_local_precheck_batches_shared_store_calls():
+    calls: list[int] = []
+    inner = InMemoryStore()
+
+    class CountingStore:
+        async def acquire(self, key, *, limit, window_seconds, debt=0):
+            calls.append(debt)
+            return inner.acquire(
+                key, limit=limit, window_seconds=window_seconds, debt=debt
+            )
+
+    store = LocalPrecheckStore(CountingStore(), share=0.5, sync_s=60)
+
+    async def run(n: int) -> list[bool]:
+        out = []
+        for _ in range(n):
+            allowed, _ = await store.acquire("k", limit=100, window_seconds=60)
+            out.append(allowed)
+        return out
+
+    assert all(asyncio.run(run(60)))
+    # 1 call leaves 99 -> 49 local, next call charges them, and so on.
+    assert len(calls) < 5
+    assert calls[1] == 49
+    # Every request is eventually charged to the shared store.
+    asyncio.run(run(1))
+    assert sum(calls) + len(calls) <= 61
+
+
+def test_fallback_store_uses_local_limiter_when_redis_is_slow():
+    calls: list[str] = []
+
+    class SlowStore:
+        async def acquire(self, key, *, limit, window_seconds, debt=0):
+            calls.append(key)
+            await asyncio.sleep(1)
+            return True, 0.0
+
+    store = FallbackStore(SlowStore(), InMemoryStore(), timeout_s=0.01, cooldown_s=60)
+
+    async def run() -> list[bool]:
+        return [
+            (await store.acquire("k", limit=2, window_seconds=60))[0] for _ in range(3)
+        ]
+
+    assert asyncio.run(run()) == [True, True, False]
+    # Only the first call waited for Redis; the rest skip it during cooldown.
+    assert calls == ["k"]
+
+
+def test_in_memory_store_is_bounded_under_scanning(monkeypatch):
+    import services.api.src.middleware.rate_limit as rl
+
+    store = InMemoryStore(max_keys=64, shards=4, sweep_every=10**9)
+    for i in range(1000):
+        store.acquire(f"ip:10.0.{i // 256}.{i % 256}", limit=5, window_seconds=60)
+    assert len(store) <= 64
+
+    # A refilled bucket is the same as no bucket: swept once time has passed.
+    now = rl._now()
+    monkeypatch.setattr(rl, "_now", lambda: now + 61)
+    assert store.sweep() > 0
+    assert len(store) == 0
+
+
+def test_in_memory_store_is_thread_safe():
+    store = InMemoryStore(shards=2)
+    results: list[bool] = []
+
+    def worker():
+        for _ in range(50):
+            results.append(store.acquire("k", limit=100, window_seconds=3600)[0])
+
+    threads = [threading.Thread(target=worker) for _ in range(8)]
+    for th in threads:
+        th.start()
+    for th in threads:
+        th.join()
+
+    assert results.count(True) == 100
+
+
+def test_in_memory_store_expired_bucket_starts_full(monkeypatch):
+    import services.api.src.middleware.rate_limit as rl
+
+    t = [1000.0]
+    monkeypatch.setattr(rl, "_now", lambda: t[0])
+    store = InMemoryStore()
+    assert [store.acquire("k", limit=2, window_seconds=60)[0] for _ in range(3)] == [
+        True,
+        True,
+        False,
+    ]
+    t[0] += 60
+    assert store.acquire("k", limit=2, window_seconds=60) == (True, 30.0)
+
+
+def test_rate_limit_headers_on_streaming_response():
+    app = make_app(limit=5)
+
+    @app.get("/api/stream")
+    def stream():
+        return StreamingResponse(iter([b"a", b"b", b"c"]), media_type="text/plain")
+
+    r = TestClient(app).get("/api/stream", headers={"x-api-key": "k1"})
+    assert r.status_code == 200
+    assert r.text == "abc"
+    assert r.headers["X-RateLimit-Limit"] == "5"
+    assert r.headers["X-RateLimit-Remaining"] == "4"
@@ -5,6 +5,8 @@ from dataclasses import dataclass
 from datetime import datetime
 from typing import Any
 
+from packages.shared.ids.minhash import lsh_band_keys, minhash_signature
+
 _ws_re = re.compile(r"\s+")
 
 
@@ -96,6 +98,10 @@ def build_segment_doc(
             if isinstance(metadata["layers"], dict):
                 metadata["layers"].update(layer)
 
+    # Near-duplicate detection across videos (re-uploads): MinHash signature
+    # plus its LSH band keys, see packages/shared/ids/duplicates.py.
+    minhash = minhash_signature(text)
+
     doc = {
         "id": segment_id,
         "tenant_id": tenant_id,
@@ -111,6 +117,8 @@ def build_segment_doc(
         "updated_at": updated_at,
         "text": text,
         "metadata": metadata,
+        "minhash": minhash,
+        "minhash_bands": lsh_band_keys(minhash) if minhash else [],
     }
 
     qdrant_payload = {
@@ -2,7 +2,7 @@ from __future__ import annotations
 
 import os
 
-import psycopg
+from packages.shared.db.postgres_pool import get_pool
 
 
 def update_job_status(job_id: str, status: str, error: str | None = None) -> None:
@@ -10,7 +10,7 @@ def update_job_status(job_id: str, status: str, error: str | None = None) -> Non
     if not dsn:
         raise RuntimeError("DATABASE_URL is required to update job status")
 
-    with psycopg.connect(dsn) as conn:
+    with get_pool(dsn).connection() as conn:
         with conn.cursor() as cur:
             if error is None:
                 cur.execute(
@@ -61,3 +61,15 @@ class OpenSearchClient:
         url = f"{self.base_url}/{index}/_refresh"
         r = requests.post(url, auth=self.auth, timeout=self.timeout_s)
         r.raise_for_status()
+
+    def delete_by_query(self, index: str, query: dict) -> None:
+        """Delete matching docs; a missing index is not an error."""
+        url = f"{self.base_url}/{index}/_delete_by_query"
+        r = requests.post(
+            url,
+            json={"query": query},
+            params={"conflicts": "proceed", "ignore_unavailable": "true"},
+            auth=self.auth,
+            timeout=self.timeout_s,
+        )
+        r.raise_for_status()
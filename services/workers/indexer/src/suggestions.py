@@ -0,0 +1,190 @@
+from __future__ import annotations
+
+import hashlib
+import re
+from collections import Counter
+from collections.abc import Iterable
+
+from .build_docs import normalize_text
+
+# Kinds of suggestions, also the completion `kind` context.
+KIND_PHRASE = "phrase"
+KIND_SPEAKER = "speaker"
+KIND_VIDEO = "video"
+
+PHRASE_MIN_WORDS = 2
+PHRASE_MAX_WORDS = 3
+PHRASE_MIN_COUNT = 2
+MAX_PHRASES_PER_VIDEO = 50
+MAX_WORD_INPUTS = 5
+TITLE_WEIGHT = 50
+
+_word_re = re.compile(r"[^\W_]+(?:['’][^\W_]+)*", re.UNICODE)
+
+# Phrases may contain these, but not start or end with them
+# ("state of the union" yes, "of the" no).
+STOPWORDS = frozenset(
+    """
+    a an and are as at be but by for from had has have he her his i if in into
+    is it its me my no not of on or our she so than that the their them then
+    there these they this to too us was we were what when which who will with
+    you your yeah um uh ok okay like just oh well
+    le la les un une des de du et en est il elle on ne pas que qui au aux
+    el los las y es por con para se lo
+    """.split()
+)
+
+
+def _words(text: str) -> list[str]:
+    return [w.casefold() for w in _word_re.findall(text)]
+
+
+def phrase_counts(texts: Iterable[str]) -> Counter[str]:
+    """
+    Count 2-3 word phrases over a video's segments. Phrases never span two
+    segments and must start and end with a non-stopword.
+    """
+    counts: Counter[str] = Counter()
+    for text in texts:
+        words = _words(text)
+        for n in range(PHRASE_MIN_WORDS, PHRASE_MAX_WORDS + 1):
+            for i in range(len(words) - n + 1):
+                first, last = words[i], words[i + n - 1]
+                if first in STOPWORDS or last in STOPWORDS:
+                    continue
+                if len(first) < 2 or len(last) < 2:
+                    continue
+                counts[" ".join(words[i : i + n])] += 1
+    return counts
+
+
+def _word_suffixes(text: str) -> list[str]:
+    """
+    Completion inputs for `text`: the full text plus the text from each later
+    word, so "Jane Doe" also completes from "doe".
+    """
+    words = text.split()
+    out = [text]
+    for i in range(1, min(len(words), MAX_WORD_INPUTS)):
+        if words[i].casefold() not in STOPWORDS:
+            out.append(" ".join(words[i:]))
+    return out
+
+
+def _doc_id(video_id: str, kind: str, text: str) -> str:
+    key = f"{video_id}|{kind}|{text.casefold()}"
+    return hashlib.sha1(key.encode("utf-8")).hexdigest()
+
+
+def _doc(
+    *,
+    video_id: str,
+    kind: str,
+    text: str,
+    inputs: list[str],
+    weight: int,
+    language: str | None,
+    tenant_id: str | None,
+    speaker_id: str | None = None,
+) -> dict:
+    return {
+        "id": _doc_id(video_id, kind, text),
+        "kind": kind,
+        "text": text,
+        "video_id": video_id,
+        "speaker_id": speaker_id,
+        "tenant_id": tenant_id,
+        "language": language,
+        "suggest": {"input": inputs, "weight": max(1, int(weight))},
+    }
+
+
+def build_suggestion_docs(
+    *,
+    video_id: str,
+    tenant_id: str | None,
+    segment_docs: list[dict],
+    speaker_names: dict[str, str] | None,
+    video_title: str | None,
+    language: str | None,
+) -> list[dict]:
+    """
+    Suggestion docs for one video: its most frequent phrases, its speakers'
+    names and its title. One doc per (video, kind, text); the API queries with
+    `skip_duplicates`, so the same phrase from many videos shows up once.
+    """
+    docs: list[dict] = []
+
+    counts = phrase_counts(str(d.get("text") or "") for d in segment_docs)
+    frequent = [
+        (p, c)
+        for p, c in counts.most_common(MAX_PHRASES_PER_VIDEO)
+        if c >= PHRASE_MIN_COUNT
+    ]
+    for phrase, count in frequent:
+        docs.append(
+            _doc(
+                video_id=video_id,
+                kind=KIND_PHRASE,
+                text=phrase,
+                inputs=[phrase],
+                weight=count,
+                language=language,
+                tenant_id=tenant_id,
+            )
+        )
+
+    segments_by_speaker = Counter(
+        str(d["speaker_id"]) for d in segment_docs if d.get("speaker_id")
+    )
+    for speaker_id, name in (speaker_names or {}).items():
+        name = normalize_text(name)
+        if not name:
+            continue
+        docs.append(
+            _doc(
+                video_id=video_id,
+                kind=KIND_SPEAKER,
+                text=name,
+                inputs=_word_suffixes(name),
+                weight=segments_by_speaker.get(speaker_id, 1),
+                language=language,
+                tenant_id=tenant_id,
+                speaker_id=speaker_id,
+            )
+        )
+
+    title = normalize_text(video_title or "")
+    if title:
+        docs.append(
+            _doc(
+                video_id=video_id,
+                kind=KIND_VIDEO,
+                text=title,
+                inputs=_word_suffixes(title),
+                weight=TITLE_WEIGHT,
+                language=language,
+                tenant_id=tenant_id,
+            )
+        )
+
+    return docs
+
+
+def speaker_names_from(segments: list[dict], payload: dict | None) -> dict[str, str]:
+    """speaker_id -> display name, from segment speaker blocks or a `speakers` list."""
+    out: dict[str, str] = {}
+
+    speakers = payload.get("speakers") if isinstance(payload, dict) else None
+    if isinstance(speakers, list):
+        for s in speakers:
+            if isinstance(s, dict) and s.get("id") and s.get("name"):
+                out[str(s["id"])] = str(s["name"])
+
+    for seg in segments:
+        sp = seg.get("speaker") if isinstance(seg, dict) else None
+        if isinstance(sp, dict) and sp.get("id"):
+            name = sp.get("name") or sp.get("display_name")
+            if name:
+                out.setdefault(str(sp["id"]), str(name))
+    return out
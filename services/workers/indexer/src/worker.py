@@ -11,6 +11,7 @@ from .build_docs import build_segment_doc
 from .db import update_job_status
 from .opensearch.client import OpenSearchClient
 from .qdrant.client import QdrantClient
+from .suggestions import build_suggestion_docs, speaker_names_from
 
 
 def _env(name: str, default: str | None = None) -> str | None:
@@ -49,6 +50,91 @@ def _qdrant_collection() -> str:
     return _env("QDRANT_SEGMENTS_COLLECTION", default) or default
 
 
+def _qdrant_shadow_collection() -> str | None:
+    return _env("QDRANT_SHADOW_COLLECTION")
+
+
+def _suggest_index() -> str:
+    default = "narralytica-suggest-v1"
+    return _env("OPENSEARCH_SUGGEST_INDEX", default) or default
+
+
+def _suggestions_enabled() -> bool:
+    v = (_env("INDEXER_SUGGESTIONS_ENABLED", "true") or "true").lower()
+    return v in ("1", "true", "yes", "on")
+
+
+def _index_suggestions(
+    os_client: OpenSearchClient,
+    *,
+    video_id: str,
+    tenant_id: str | None,
+    docs: list[dict],
+    segments: list,
+    segments_payload: object,
+    video_title: str | None,
+    language: str | None,
+) -> None:
+    """
+    Replace this video's autocomplete suggestions. Best effort: suggestions
+    are secondary, so a failure here never fails the indexing job.
+    """
+    try:
+        payload = segments_payload if isinstance(segments_payload, dict) else None
+        sdocs = build_suggestion_docs(
+            video_id=video_id,
+            tenant_id=tenant_id,
+            segment_docs=docs,
+            speaker_names=speaker_names_from(segments, payload),
+            video_title=video_title,
+            language=language,
+        )
+        index = _suggest_index()
+        os_client.delete_by_query(index=index, query={"term": {"video_id": video_id}})
+        if sdocs:
+            os_client.bulk_upsert(index=index, docs=sdocs)
+    except Exception as e:
+        print(f"indexer: suggestions skipped: {e}", file=sys.stderr)
+
+
+def _upsert_vectors(
+    q_client: QdrantClient,
+    *,
+    collection: str,
+    embeddings_payload: object,
+    payload_by_segment_id: dict[str, dict],
+    video_id: str,
+    expected_dim: int,
+    batch_size: int,
+) -> None:
+    points: list[dict] = []
+    for it in iter_embedding_items(embeddings_payload):
+        sid = it.get("segment_id") or it.get("id")
+        vec = it.get("vector") or it.get("embedding") or it.get("values")
+        if not sid or vec is None:
+            continue
+        sid = str(sid)
+        if not isinstance(vec, list):
+            continue
+        if len(vec) != expected_dim:
+            raise RuntimeError(
+                f"embedding dim mismatch for segment_id={sid}: "
+                f"got={len(vec)} expected={expected_dim} collection={collection}"
+            )
+        payload = payload_by_segment_id.get(sid) or {
+            "segment_id": sid,
+            "video_id": video_id,
+        }
+        points.append({"id": sid, "vector": vec, "payload": payload})
+
+        if len(points) >= batch_size:
+            q_client.upsert_points(collection=collection, points=points)
+            points = []
+
+    if points:
+        q_client.upsert_points(collection=collection, points=points)
+
+
 def main() -> int:
     job = _load_job_payload()
 
@@ -170,39 +256,69 @@ def main() -> int:
     if reindex:
         os_client.refresh(index=index)
 
+    if _suggestions_enabled():
+        video_meta = (
+            segments_payload.get("video")
+            if isinstance(segments_payload, dict)
+            and isinstance(segments_payload.get("video"), dict)
+            else {}
+        )
+        _index_suggestions(
+            os_client,
+            video_id=video_id,
+            tenant_id=str(tenant_id) if tenant_id else None,
+            docs=docs,
+            segments=segments,
+            segments_payload=segments_payload,
+            video_title=job.get("video_title") or video_meta.get("title"),
+            language=(transcript_meta or {}).get("language"),
+        )
+
     if embeddings_payload is None:
         raise RuntimeError(
             "embeddings_ref missing or embeddings artifact is null; check enrich worker"
         )
 
-    expected_dim = int(_env("EMBEDDING_VECTOR_SIZE", "1024") or "1024")
+    _upsert_vectors(
+        q_client,
+        collection=collection,
+        embeddings_payload=embeddings_payload,
+        payload_by_segment_id=payload_by_segment_id,
+        video_id=video_id,
+        expected_dim=int(_env("EMBEDDING_VECTOR_SIZE", "1024") or "1024"),
+        batch_size=batch_size,
+    )
 
-    points: list[dict] = []
-    for it in iter_embedding_items(embeddings_payload):
-        sid = it.get("segment_id") or it.get("id")
-        vec = it.get("vector") or it.get("embedding") or it.get("values")
-        if not sid or vec is None:
-            continue
-        sid = str(sid)
-        if not isinstance(vec, list):
-            continue
-        if len(vec) != expected_dim:
-            raise RuntimeError(
-                f"embedding dim mismatch for segment_id={sid}: "
-                f"got={len(vec)} expected={expected_dim}"
+    # Embedding-model upgrade: while a shadow collection is configured, the
+    # same segments are also written there with the new model's vectors.
+    shadow_collection = _qdrant_shadow_collection()
+    if shadow_collection:
+        shadow_ref = job.get("shadow_embeddings_ref")
+        shadow_payload = (
+            load_json_artifact(storage, shadow_ref, default_bucket=default_bucket)
+            if shadow_ref
+            else None
+        )
+        if shadow_payload is None:
+            print(
+                f"indexer: no shadow embeddings for video_id={video_id}; "
+                f"{shadow_collection} not updated",
+                file=sys.stderr,
+            )
+        else:
+            _upsert_vectors(
+                q_client,
+                collection=shadow_collection,
+                embeddings_payload=shadow_payload,
+                payload_by_segment_id=payload_by_segment_id,
+                video_id=video_id,
+                expected_dim=int(
+                    _env("EMBEDDING_SHADOW_VECTOR_SIZE")
+                    or _env("EMBEDDING_VECTOR_SIZE", "1024")
+                    or "1024"
+                ),
+                batch_size=batch_size,
             )
-        payload = payload_by_segment_id.get(sid) or {
-            "segment_id": sid,
-            "video_id": video_id,
-        }
-        points.append({"id": sid, "vector": vec, "payload": payload})
-
-        if len(points) >= batch_size:
-            q_client.upsert_points(collection=collection, points=points)
-            points = []
-
-    if points:
-        q_client.upsert_points(collection=collection, points=points)
 
     update_job_status(job_id, "completed")
     return 0
@@ -0,0 +1,48 @@
+from __future__ import annotations
+
+import pytest
+
+# The root test environment has no database drivers; the API and worker
+# environments do.
+pytest.importorskip("psycopg_pool")
+
+from packages.shared.db import postgres_pool  # noqa: E402
+from packages.shared.db.postgres_pool import (  # noqa: E402
+    PoolConfig,
+    get_pool,
+    normalize_dsn,
+)
+
+
+def test_normalize_dsn_strips_sqlalchemy_driver():
+    assert normalize_dsn("postgresql+psycopg://u:p@h:5432/db") == (
+        "postgresql://u:p@h:5432/db"
+    )
+    assert normalize_dsn("postgresql://h/db") == "postgresql://h/db"
+
+
+def test_pool_config_from_env(monkeypatch):
+    monkeypatch.setenv("DB_POOL_MIN_SIZE", "4")
+    monkeypatch.setenv("DB_POOL_MAX_SIZE", "2")
+    monkeypatch.setenv("DB_POOL_TIMEOUT_S", "oops")
+    monkeypatch.setenv("DB_POOL_CHECK", "yes")
+
+    cfg = PoolConfig.from_env()
+
+    assert cfg.min_size == 4
+    assert cfg.max_size == 4  # never below min_size
+    assert cfg.timeout_s == PoolConfig().timeout_s
+    assert cfg.check_on_checkout is True
+
+
+def test_get_pool_is_shared_per_dsn():
+    # min_size=0: nothing connects until a connection is requested.
+    cfg = PoolConfig(min_size=0, max_size=1)
+    try:
+        a = get_pool("postgresql+psycopg://u@127.0.0.1:1/db", cfg)
+        assert get_pool("postgresql://u@127.0.0.1:1/db") is a
+        assert get_pool("postgresql://u@127.0.0.1:1/other", cfg) is not a
+        assert len(postgres_pool._pools) == 2
+    finally:
+        postgres_pool.close_pools()
+    assert not postgres_pool._pools
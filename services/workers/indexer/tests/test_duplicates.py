@@ -0,0 +1,99 @@
+from __future__ import annotations
+
+from typing import Any
+
+from packages.shared.ids.duplicates import find_duplicate_transcripts
+from packages.shared.ids.minhash import (
+    BANDS,
+    NUM_PERM,
+    estimate_jaccard,
+    minhash_signature,
+)
+from services.workers.indexer.src.build_docs import build_segment_doc
+
+SPEECH = [
+    "we will cut carbon emissions by half before the end of this decade",
+    "the plan puts a price on carbon and returns the money to households",
+    "critics say the tax will hurt rural drivers more than city residents",
+    "the minister promised a vote on the bill before the summer recess",
+]
+OTHER = [
+    "tonight the home side scored twice in the last ten minutes of play",
+    "the coach said the squad was tired after three games in one week",
+    "fans queued for hours outside the stadium before the final whistle",
+    "the league will review the referee decisions from the weekend games",
+]
+
+
+def _doc(video_id: str, transcript_id: str, i: int, text: str) -> dict:
+    return build_segment_doc(
+        video_id=video_id,
+        transcript_id=transcript_id,
+        tenant_id=None,
+        segment={
+            "id": f"{transcript_id}_{i}",
+            "start_ms": i,
+            "end_ms": i + 1,
+            "text": text,
+        },
+        transcript_meta=None,
+        layers_by_segment_id=None,
+    ).doc
+
+
+def _fake_search(docs: list[dict]):
+    """Just enough of OpenSearch for the two queries the lookup sends."""
+
+    def search(body: dict[str, Any]) -> dict[str, Any]:
+        f = body["query"]["bool"]["filter"][0]
+        if "terms" in f:
+            keys = set(f["terms"]["minhash_bands"])
+            excluded = {
+                c["term"]["transcript_id"] for c in body["query"]["bool"]["must_not"]
+            }
+            counts: dict[str, int] = {}
+            for d in docs:
+                if d["transcript_id"] in excluded:
+                    continue
+                if keys & set(d["minhash_bands"]):
+                    counts[d["transcript_id"]] = counts.get(d["transcript_id"], 0) + 1
+            buckets = [{"key": k, "doc_count": c} for k, c in counts.items()]
+            return {"aggregations": {"transcripts": {"buckets": buckets}}}
+        tid = f["term"]["transcript_id"]
+        hits = [{"_source": d} for d in docs if d["transcript_id"] == tid]
+        return {"hits": {"hits": hits}}
+
+    return search
+
+
+def test_signatures_are_stable_and_stored():
+    doc = _doc("v1", "t1", 0, SPEECH[0])
+    assert len(doc["minhash"]) == NUM_PERM
+    assert len(doc["minhash_bands"]) == BANDS
+    # Deterministic across calls (and processes: no builtin hash).
+    assert doc["minhash"] == minhash_signature(SPEECH[0].upper() + "!")
+
+    near = minhash_signature(SPEECH[0] + " or so")
+    far = minhash_signature(OTHER[0])
+    assert estimate_jaccard(doc["minhash"], near) > 0.6
+    assert estimate_jaccard(doc["minhash"], far) < 0.2
+
+
+def test_find_duplicate_transcripts():
+    docs = [_doc("v1", "t_orig", i, t) for i, t in enumerate(SPEECH)]
+    docs += [_doc("v2", "t_sport", i, t) for i, t in enumerate(OTHER)]
+    # Half the speech re-appears in a compilation: below the coverage bar.
+    docs += [_doc("v3", "t_part", i, t) for i, t in enumerate(SPEECH[:2] + OTHER[:2])]
+    search = _fake_search(docs)
+
+    reupload = [t + "." for t in SPEECH]
+    found = find_duplicate_transcripts(reupload, search)
+    assert [(d.transcript_id, d.video_id, d.coverage) for d in found] == [
+        ("t_orig", "v1", 1.0)
+    ]
+
+    assert (
+        find_duplicate_transcripts(reupload, search, exclude_transcript_id="t_orig")
+        == []
+    )
+    assert find_duplicate_transcripts(["too short"], search) == []
@@ -0,0 +1,62 @@
+from __future__ import annotations
+
+from services.workers.indexer.src.suggestions import (
+    build_suggestion_docs,
+    phrase_counts,
+    speaker_names_from,
+)
+
+
+def test_phrase_counts_skip_stopword_edges() -> None:
+    counts = phrase_counts(
+        ["The carbon tax is back.", "A carbon tax of the state", "carbon tax"]
+    )
+    assert counts["carbon tax"] == 3
+    assert "the carbon" not in counts
+    assert "tax of" not in counts
+
+
+def test_build_suggestion_docs() -> None:
+    segs = [
+        {"text": "carbon tax now", "speaker_id": "spk_1"},
+        {"text": "the carbon tax again", "speaker_id": "spk_1"},
+        {"text": "rare words here", "speaker_id": "spk_2"},
+    ]
+    docs = build_suggestion_docs(
+        video_id="v1",
+        tenant_id=None,
+        segment_docs=segs,
+        speaker_names={"spk_1": "Jane  Doe"},
+        video_title="The Climate Summit",
+        language="en",
+    )
+    by_kind = {(d["kind"], d["text"]): d for d in docs}
+
+    phrase = by_kind[("phrase", "carbon tax")]
+    assert phrase["suggest"] == {"input": ["carbon tax"], "weight": 2}
+    assert ("phrase", "rare words") not in by_kind
+
+    speaker = by_kind[("speaker", "Jane Doe")]
+    assert speaker["suggest"]["input"] == ["Jane Doe", "Doe"]
+    assert speaker["suggest"]["weight"] == 2
+    assert speaker["speaker_id"] == "spk_1"
+
+    title = by_kind[("video", "The Climate Summit")]
+    assert "Climate Summit" in title["suggest"]["input"]
+
+    # Stable ids: reindexing a video overwrites its own docs.
+    again = build_suggestion_docs(
+        video_id="v1",
+        tenant_id=None,
+        segment_docs=segs,
+        speaker_names={"spk_1": "Jane Doe"},
+        video_title="The Climate Summit",
+        language="en",
+    )
+    assert [d["id"] for d in again] == [d["id"] for d in docs]
+
+
+def test_speaker_names_from() -> None:
+    segs = [{"speaker": {"id": "spk_2", "name": "Bob"}}, {"text": "x"}]
+    payload = {"speakers": [{"id": "spk_1", "name": "Alice"}]}
+    assert speaker_names_from(segs, payload) == {"spk_1": "Alice", "spk_2": "Bob"}
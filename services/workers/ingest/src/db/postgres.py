@@ -1,10 +1,11 @@
 import os
 
-import psycopg
+from packages.shared.db.postgres_pool import get_pool
 
 
 def get_db_conn():
+    """Pooled connection; use as `with get_db_conn() as conn:` (returned on exit)."""
     dsn = os.getenv("DATABASE_URL")
     if not dsn:
         raise RuntimeError("DATABASE_URL is required")
-    return psycopg.connect(dsn)
+    return get_pool(dsn).connection()
@@ -0,0 +1,969 @@
+#!/usr/bin/env python3
+"""
+In-process stand-ins for the search backends, for load testing the API.
+
+Each fake is a real HTTP server on 127.0.0.1 (one thread per request), so
+the API's own client code (sessions, breakers, hedging, JSON encoding) runs
+unchanged. Only the subset of each API the project uses is implemented:
+
+- FakeOpenSearch: `_search`, `_msearch`, `_mget`, `_bulk`, `_refresh`,
+  `_cluster/health`
+- FakeQdrant: `points` upsert, `points/search`, `points/search/batch`,
+  `points/search/groups`, `points/count`
+- FakeEmbeddings: `POST /embeddings` with deterministic hashed vectors, so
+  the vector leg works without a model server
+
+Every server takes a `Latency` (fixed delay, exponential jitter, error
+rate), optionally per endpoint, to emulate backend behaviour.
+
+Run standalone (seeds a synthetic corpus, prints the env to point the API at):
+  python tools/benchmarks/fake_backends.py --segments 20000 --latency-ms 5
+"""
+
+from __future__ import annotations
+
+import argparse
+import hashlib
+import json
+import math
+import random
+import re
+import threading
+import time
+from collections.abc import Callable, Iterable
+from dataclasses import dataclass
+from functools import lru_cache
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any
+
+Json = dict[str, Any]
+Handler = Callable[[re.Match[str], Any, str], tuple[int, Any]]
+
+_TOKEN_RE = re.compile(r"\w+", re.UNICODE)
+
+
+@lru_cache(maxsize=262144)
+def _tokens(text: str) -> tuple[str, ...]:
+    return tuple(_TOKEN_RE.findall(text.lower()))
+
+
+def tokenize(text: str) -> list[str]:
+    return list(_tokens(text or ""))
+
+
+@dataclass(frozen=True)
+class Latency:
+    """Injected per request: `base_ms + Exp(jitter_ms)`, failing with `error_rate`."""
+
+    base_ms: float = 0.0
+    jitter_ms: float = 0.0
+    error_rate: float = 0.0
+
+    def delay_s(self, rng: random.Random) -> float:
+        jitter = rng.expovariate(1.0 / self.jitter_ms) if self.jitter_ms > 0 else 0.0
+        return (self.base_ms + jitter) / 1000.0
+
+
+# ----------------------------
+# HTTP plumbing
+# ----------------------------
+
+
+class _FakeServer:
+    """ThreadingHTTPServer with a regex route table and latency injection."""
+
+    name = "fake"
+
+    def __init__(
+        self,
+        *,
+        latency: Latency | None = None,
+        endpoint_latency: dict[str, Latency] | None = None,
+        host: str = "127.0.0.1",
+        port: int = 0,
+        seed: int = 0,
+    ) -> None:
+        self.latency = latency or Latency()
+        self.endpoint_latency = dict(endpoint_latency or {})
+        self._rng = random.Random(seed)
+        self._rng_lock = threading.Lock()
+        self._lock = threading.RLock()
+        self._routes: list[tuple[str, re.Pattern[str], str, Handler]] = []
+        self.requests: dict[str, int] = {}
+
+        server = self
+
+        class _Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def log_message(self, format: str, *args: Any) -> None:  # noqa: A002
+                return
+
+            def _dispatch(self, method: str) -> None:
+                length = int(self.headers.get("Content-Length") or 0)
+                raw = self.rfile.read(length) if length else b""
+                status, body = server._handle(method, self.path, raw)
+                payload = json.dumps(body).encode("utf-8")
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(payload)))
+                self.end_headers()
+                self.wfile.write(payload)
+
+            def do_GET(self) -> None:  # noqa: N802
+                self._dispatch("GET")
+
+            def do_POST(self) -> None:  # noqa: N802
+                self._dispatch("POST")
+
+            def do_PUT(self) -> None:  # noqa: N802
+                self._dispatch("PUT")
+
+            def do_DELETE(self) -> None:  # noqa: N802
+                self._dispatch("DELETE")
+
+        self._httpd = ThreadingHTTPServer((host, port), _Handler)
+        self._httpd.daemon_threads = True
+        self._thread: threading.Thread | None = None
+
+    @property
+    def url(self) -> str:
+        host, port = self._httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def route(self, method: str, pattern: str, endpoint: str, fn: Handler) -> None:
+        self._routes.append((method, re.compile(pattern + r"$"), endpoint, fn))
+
+    def start(self) -> _FakeServer:
+        if self._thread is None:
+            self._thread = threading.Thread(
+                target=self._httpd.serve_forever,
+                kwargs={"poll_interval": 0.05},
+                name=self.name,
+                daemon=True,
+            )
+            self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        if self._thread is not None:
+            self._httpd.shutdown()
+            self._thread.join()
+            self._thread = None
+        self._httpd.server_close()
+
+    def __enter__(self) -> _FakeServer:
+        return self.start()
+
+    def __exit__(self, *exc: object) -> None:
+        self.stop()
+
+    def _inject(self, endpoint: str) -> bool:
+        lat = self.endpoint_latency.get(endpoint, self.latency)
+        with self._rng_lock:
+            delay = lat.delay_s(self._rng)
+            fail = lat.error_rate > 0 and self._rng.random() < lat.error_rate
+        if delay > 0:
+            time.sleep(delay)
+        return fail
+
+    def _handle(self, method: str, target: str, raw: bytes) -> tuple[int, Any]:
+        path, _, query = target.partition("?")
+        for m, pattern, endpoint, fn in self._routes:
+            if m != method:
+                continue
+            match = pattern.match(path)
+            if not match:
+                continue
+            with self._lock:
+                self.requests[endpoint] = self.requests.get(endpoint, 0) + 1
+            if self._inject(endpoint):
+                return 503, {"error": "injected failure", "status": 503}
+            text = raw.decode("utf-8") if raw else ""
+            try:
+                return fn(match, text, query)
+            except (ValueError, KeyError, TypeError) as e:
+                return 400, {"error": f"bad request: {e}", "status": 400}
+        return 404, {"error": f"no route for {method} {path}", "status": 404}
+
+
+def _json(text: str) -> Any:
+    return json.loads(text) if text.strip() else {}
+
+
+def _ndjson(text: str) -> list[Any]:
+    return [json.loads(line) for line in text.splitlines() if line.strip()]
+
+
+# ----------------------------
+# OpenSearch
+# ----------------------------
+
+
+def _field_values(doc: Json, field: str) -> list[Any]:
+    base = field.split("^", 1)[0]
+    # Subfields (text.prefix, text.ngram, ...) search their parent field.
+    if base not in doc and "." in base:
+        base = base.split(".", 1)[0]
+    v = doc.get(base)
+    if v is None:
+        return []
+    return v if isinstance(v, list) else [v]
+
+
+def _boost(field: str) -> float:
+    _, _, b = field.partition("^")
+    return float(b) if b else 1.0
+
+
+def _cmp_range(value: Any, spec: Json) -> bool:
+    if value is None:
+        return False
+    for op, bound in spec.items():
+        if op == "gte" and not value >= bound:
+            return False
+        if op == "gt" and not value > bound:
+            return False
+        if op == "lte" and not value <= bound:
+            return False
+        if op == "lt" and not value < bound:
+            return False
+    return True
+
+
+class FakeOpenSearch(_FakeServer):
+    """
+    Document store with a small query DSL: match_all, bool (must / filter /
+    should / must_not), multi_match / match (operator and|or), match_phrase,
+    term(s), range, prefix; plus `from`/`size`, `_source` includes, collapse
+    with `inner_hits` and `highlight` on matched terms.
+    """
+
+    name = "fake-opensearch"
+
+    def __init__(self, **kwargs: Any) -> None:
+        super().__init__(**kwargs)
+        self.indices: dict[str, dict[str, Json]] = {}
+        # index -> term -> ids of docs whose `text` has it; rebuilt after writes
+        self._postings: dict[str, dict[str, set[str]]] = {}
+        self.route("GET", r"/_cluster/health", "health", self._health)
+        self.route("POST", r"/([^/_][^/]*)/_search", "_search", self._search)
+        self.route("POST", r"/([^/_][^/]*)/_msearch", "_msearch", self._msearch)
+        self.route("POST", r"/([^/_][^/]*)/_mget", "_mget", self._mget)
+        self.route("POST", r"/([^/_][^/]*)/_refresh", "_refresh", self._refresh)
+        self.route("POST", r"/_bulk", "_bulk", self._bulk)
+        self.route("POST", r"/([^/_][^/]*)/_bulk", "_bulk", self._bulk)
+
+    # -- seeding (bypasses HTTP and latency) --
+
+    def seed(self, index: str, docs: Iterable[tuple[str, Json]]) -> None:
+        with self._lock:
+            store = self.indices.setdefault(index, {})
+            for doc_id, src in docs:
+                store[str(doc_id)] = dict(src)
+            self._postings.pop(index, None)
+
+    # -- handlers --
+
+    def _health(self, m: re.Match[str], text: str, query: str) -> tuple[int, Any]:
+        return 200, {"status": "green", "number_of_nodes": 1}
+
+    def _refresh(self, m: re.Match[str], text: str, query: str) -> tuple[int, Any]:
+        return 200, {"_shards": {"total": 1, "successful": 1, "failed": 0}}
+
+    def _bulk(self, m: re.Match[str], text: str, query: str) -> tuple[int, Any]:
+        default_index = m.group(1) if m.groups() else None
+        lines = _ndjson(text)
+        items: list[Json] = []
+        errors = False
+        i = 0
+        with self._lock:
+            while i < len(lines):
+                action = lines[i]
+                op, meta = next(iter(action.items()))
+                index = meta.get("_index") or default_index
+                doc_id = str(meta.get("_id"))
+                store = self.indices.setdefault(str(index), {})
+                self._postings.pop(str(index), None)
+                i += 1
+                if op == "delete":
+                    found = store.pop(doc_id, None) is not None
+                    items.append({op: {"_id": doc_id, "status": 200 if found else 404}})
+                    continue
+                body = lines[i]
+                i += 1
+                if op == "update":
+                    if doc_id not in store and not body.get("doc_as_upsert"):
+                        errors = True
+                        items.append(
+                            {
+                                op: {
+                                    "_id": doc_id,
+                                    "status": 404,
+                                    "error": {"type": "document_missing_exception"},
+                                }
+                            }
+                        )
+                        continue
+                    store.setdefault(doc_id, {}).update(body.get("doc") or {})
+                elif op == "create" and doc_id in store:
+                    errors = True
+                    items.append(
+                        {
+                            op: {
+                                "_id": doc_id,
+                                "status": 409,
+                                "error": {"type": "version_conflict_engine_exception"},
+                            }
+                        }
+                    )
+                    continue
+                else:
+                    store[doc_id] = dict(body)
+                items.append({op: {"_id": doc_id, "status": 200}})
+        return 200, {"took": 0, "errors": errors, "items": items}
+
+    def _mget(self, m: re.Match[str], text: str, query: str) -> tuple[int, Any]:
+        body = _json(text)
+        ids = body.get("ids")
+        if ids is None:
+            ids = [d.get("_id") for d in body.get("docs") or []]
+        store = self.indices.get(m.group(1)) or {}
+        docs: list[Json] = []
+        for doc_id in ids:
+            src = store.get(str(doc_id))
+            if src is None:
+                docs.append({"_id": str(doc_id), "found": False})
+            else:
+                docs.append({"_id": str(doc_id), "found": True, "_source": src})
+        return 200, {"docs": docs}
+
+    def _search(self, m: re.Match[str], text: str, query: str) -> tuple[int, Any]:
+        index = m.group(1)
+        if index not in self.indices:
+            return 404, {"error": {"type": "index_not_found_exception"}, "status": 404}
+        return 200, self.search(index, _json(text))
+
+    def _msearch(self, m: re.Match[str], text: str, query: str) -> tuple[int, Any]:
+        lines = _ndjson(text)
+        responses: list[Json] = []
+        for header, body in zip(lines[0::2], lines[1::2], strict=True):
+            index = header.get("index") or m.group(1)
+            try:
+                resp = self.search(index, body)
+                resp["status"] = 200
+            except (ValueError, KeyError, TypeError) as e:
+                resp = {"error": {"reason": str(e)}, "status": 400}
+            responses.append(resp)
+        return 200, {"took": 0, "responses": responses}
+
+    # -- query evaluation --
+
+    def search(self, index: str, body: Json) -> Json:
+        store = self.indices.get(index) or {}
+        q = body.get("query") or {"match_all": {}}
+        n_docs = max(1, len(store))
+        postings = self._text_postings(index)
+
+        def idf(term: str) -> float:
+            df = len(postings.get(term) or ())
+            return math.log(1 + (n_docs - df + 0.5) / (df + 0.5))
+
+        cand = _candidates(q, postings)
+        docs = store.items() if cand is None else ((i, store[i]) for i in cand)
+
+        scored: list[tuple[float, str, Json, set[str]]] = []
+        for doc_id, src in docs:
+            ok, score, matched = self._eval(q, src, idf)
+            if ok:
+                scored.append((score, doc_id, src, matched))
+        scored.sort(key=lambda x: (-x[0], x[1]))
+
+        from_ = int(body.get("from") or 0)
+        size = int(body.get("size") if body.get("size") is not None else 10)
+        collapse = body.get("collapse")
+        if isinstance(collapse, dict):
+            hits_all = self._collapse(scored, collapse, body)
+        else:
+            hits_all = [
+                self._hit(s, i, src, mt, body)
+                for s, i, src, mt in scored[: from_ + size]
+            ]
+
+        return {
+            "took": 0,
+            "timed_out": False,
+            "hits": {
+                "total": {"value": len(scored), "relation": "eq"},
+                "max_score": scored[0][0] if scored else None,
+                "hits": hits_all[from_ : from_ + size],
+            },
+        }
+
+    def _text_postings(self, index: str) -> dict[str, set[str]]:
+        with self._lock:
+            postings = self._postings.get(index)
+            if postings is None:
+                postings = {}
+                for doc_id, src in (self.indices.get(index) or {}).items():
+                    text = " ".join(map(str, _field_values(src, "text")))
+                    for t in set(tokenize(text)):
+                        postings.setdefault(t, set()).add(doc_id)
+                self._postings[index] = postings
+            return postings
+
+    def _hit(
+        self, score: float, doc_id: str, src: Json, matched: set[str], body: Json
+    ) -> Json:
+        hit: Json = {"_id": doc_id, "_score": score}
+        spec = body.get("_source", True)
+        if spec is not False:
+            hit["_source"] = _filter_source(src, spec)
+        hl = body.get("highlight")
+        if isinstance(hl, dict) and matched:
+            out: Json = {}
+            for f in hl.get("fields") or {}:
+                for v in _field_values(src, f):
+                    marked = re.sub(
+                        r"\w+",
+                        lambda w: (
+                            f"<em>{w.group(0)}</em>"
+                            if w.group(0).lower() in matched
+                            else w.group(0)
+                        ),
+                        str(v),
+                    )
+                    if marked != str(v):
+                        out.setdefault(f, []).append(marked)
+            if out:
+                hit["highlight"] = out
+        return hit
+
+    def _collapse(
+        self,
+        scored: list[tuple[float, str, Json, set[str]]],
+        collapse: Json,
+        body: Json,
+    ) -> list[Json]:
+        field = str(collapse.get("field"))
+        inner = collapse.get("inner_hits") or {}
+        inner_size = int(inner.get("size") or 0)
+        groups: dict[Any, list[tuple[float, str, Json, set[str]]]] = {}
+        for item in scored:
+            vals = _field_values(item[2], field)
+            groups.setdefault(vals[0] if vals else None, []).append(item)
+
+        out: list[Json] = []
+        for key, items in groups.items():
+            s, doc_id, src, matched = items[0]
+            hit = self._hit(s, doc_id, src, matched, body)
+            hit["fields"] = {field: [key]}
+            if inner_size:
+                top = [self._hit(*x, body) for x in items[:inner_size]]
+                hit["inner_hits"] = {
+                    str(inner.get("name") or field): {
+                        "hits": {"total": {"value": len(items)}, "hits": top}
+                    }
+                }
+            out.append(hit)
+        return out
+
+    def _eval(
+        self, q: Json, src: Json, idf: Callable[[str], float]
+    ) -> tuple[bool, float, set[str]]:
+        ((kind, spec),) = q.items()
+
+        if kind == "match_all":
+            return True, 1.0, set()
+
+        if kind == "bool":
+            score = 0.0
+            matched: set[str] = set()
+            for c in spec.get("must") or []:
+                ok, s, mt = self._eval(c, src, idf)
+                if not ok:
+                    return False, 0.0, set()
+                score += s
+                matched |= mt
+            for c in spec.get("filter") or []:
+                if not self._eval(c, src, idf)[0]:
+                    return False, 0.0, set()
+            for c in spec.get("must_not") or []:
+                if self._eval(c, src, idf)[0]:
+                    return False, 0.0, set()
+            should = spec.get("should") or []
+            hits = 0
+            for c in should:
+                ok, s, mt = self._eval(c, src, idf)
+                if ok:
+                    hits += 1
+                    score += s
+                    matched |= mt
+            min_should = int(
+                spec.get("minimum_should_match")
+                or (0 if spec.get("must") or spec.get("filter") else 1 if should else 0)
+            )
+            if hits < min_should:
+                return False, 0.0, set()
+            return True, score or (1.0 if not spec.get("must") else 0.0), matched
+
+        if kind in ("multi_match", "match"):
+            if kind == "match":
+                field, opts = next(iter(spec.items()))
+                opts = opts if isinstance(opts, dict) else {"query": opts}
+                fields = [field]
+            else:
+                opts = spec
+                fields = list(opts.get("fields") or ["text"])
+            terms = tokenize(str(opts.get("query") or ""))
+            if not terms:
+                return False, 0.0, set()
+            best = 0.0
+            best_matched: set[str] = set()
+            for f in fields:
+                toks: list[str] = []
+                for v in _field_values(src, f):
+                    toks.extend(tokenize(str(v)))
+                if f.split("^")[0].endswith((".prefix", ".ngram", ".edge_ngram")):
+                    present = {t for t in terms if any(x.startswith(t) for x in toks)}
+                else:
+                    present = set(terms).intersection(toks)
+                if opts.get("operator") == "and" and len(present) < len(set(terms)):
+                    continue
+                if not present:
+                    continue
+                s = _boost(f) * sum(
+                    idf(t) * toks.count(t) / (toks.count(t) + 1.2) for t in present
+                )
+                if s > best or not best_matched:
+                    best, best_matched = s, present
+            return bool(best_matched), best, best_matched
+
+        if kind == "match_phrase":
+            field, opts = next(iter(spec.items()))
+            phrase = tokenize(
+                str(opts.get("query") if isinstance(opts, dict) else opts)
+            )
+            for v in _field_values(src, field):
+                toks = tokenize(str(v))
+                n = len(phrase)
+                if n and any(toks[i : i + n] == phrase for i in range(len(toks))):
+                    return True, sum(idf(t) for t in phrase), set(phrase)
+            return False, 0.0, set()
+
+        if kind == "term":
+            field, v = next(iter(spec.items()))
+            v = v.get("value") if isinstance(v, dict) else v
+            return v in _field_values(src, field), 0.0, set()
+
+        if kind == "terms":
+            field, vs = next(iter(spec.items()))
+            return (
+                bool(set(map(str, vs)) & set(map(str, _field_values(src, field)))),
+                0.0,
+                set(),
+            )
+
+        if kind == "prefix":
+            field, v = next(iter(spec.items()))
+            v = str(v.get("value") if isinstance(v, dict) else v)
+            ok = any(str(x).startswith(v) for x in _field_values(src, field))
+            return ok, 0.0, set()
+
+        if kind == "range":
+            field, r = next(iter(spec.items()))
+            vals = _field_values(src, field)
+            return any(_cmp_range(x, r) for x in vals), 0.0, set()
+
+        raise ValueError(f"unsupported query clause: {kind}")
+
+
+def _is_text_field(field: str) -> bool:
+    return field.split("^", 1)[0].split(".", 1)[0] == "text"
+
+
+def _candidates(q: Json, postings: dict[str, set[str]]) -> set[str] | None:
+    """
+    Superset of the docs that can match `q`, from the `text` postings, or
+    None when the clause cannot be pruned that way (evaluate every doc).
+    """
+    ((kind, spec),) = q.items()
+    if kind == "bool":
+        out: set[str] | None = None
+        for c in spec.get("must") or []:
+            cand = _candidates(c, postings)
+            if cand is not None:
+                out = cand if out is None else out & cand
+        return out
+    if kind in ("multi_match", "match"):
+        if kind == "match":
+            field, opts = next(iter(spec.items()))
+            opts = opts if isinstance(opts, dict) else {"query": opts}
+            fields = [field]
+        else:
+            opts, fields = spec, list(spec.get("fields") or ["text"])
+        if not all(_is_text_field(f) for f in fields):
+            return None
+        terms = set(tokenize(str(opts.get("query") or "")))
+        prefix = any("." in f.split("^", 1)[0] for f in fields)
+        per_term: list[set[str]] = []
+        for t in terms:
+            docs: set[str] = set()
+            for term, ids in postings.items():
+                if term == t or (prefix and term.startswith(t)):
+                    docs |= ids
+            per_term.append(docs)
+        if not per_term:
+            return set()
+        if opts.get("operator") == "and":
+            return set.intersection(*per_term)
+        return set.union(*per_term)
+    if kind == "match_phrase":
+        field, opts = next(iter(spec.items()))
+        if not _is_text_field(field):
+            return None
+        phrase = tokenize(str(opts.get("query") if isinstance(opts, dict) else opts))
+        sets = [postings.get(t) or set() for t in phrase]
+        return set.intersection(*sets) if sets else set()
+    return None
+
+
+def _filter_source(src: Json, spec: Any) -> Json:
+    if spec is True or spec is None:
+        return src
+    includes = spec if isinstance(spec, list) else (spec.get("includes") or [])
+    excludes = [] if isinstance(spec, list) else (spec.get("excludes") or [])
+    out = {k: v for k, v in src.items() if not includes or k in includes}
+    for k in excludes:
+        out.pop(k, None)
+    return out
+
+
+# ----------------------------
+# Qdrant
+# ----------------------------
+
+
+def _normalize(v: list[float]) -> list[float]:
+    n = math.sqrt(sum(x * x for x in v)) or 1.0
+    return [x / n for x in v]
+
+
+def _payload_match(payload: Json, cond: Json) -> bool:
+    value = payload.get(cond.get("key"))
+    if "match" in cond:
+        m = cond["match"]
+        if "value" in m:
+            return value == m["value"]
+        if "any" in m:
+            return value in m["any"]
+        return False
+    if "range" in cond:
+        return _cmp_range(value, cond["range"])
+    raise ValueError(f"unsupported qdrant condition: {cond}")
+
+
+def _filter_ok(payload: Json, flt: Json | None) -> bool:
+    if not flt:
+        return True
+    must = flt.get("must") or []
+    should = flt.get("should") or []
+    must_not = flt.get("must_not") or []
+    if not all(_payload_match(payload, c) for c in must):
+        return False
+    if any(_payload_match(payload, c) for c in must_not):
+        return False
+    return not should or any(_payload_match(payload, c) for c in should)
+
+
+class FakeQdrant(_FakeServer):
+    """Brute-force cosine search over in-memory points (fine up to ~100k)."""
+
+    name = "fake-qdrant"
+
+    def __init__(self, **kwargs: Any) -> None:
+        super().__init__(**kwargs)
+        # collection -> point id -> (non-zero (dim, value) of the unit vector,
+        # payload); sparse so hashed test vectors score in O(non-zeros)
+        self.collections: dict[
+            str, dict[str, tuple[list[tuple[int, float]], Json]]
+        ] = {}
+        base = r"/collections/([^/]+)"
+        self.route("PUT", base, "create", self._create)
+        self.route("GET", base, "info", self._info)
+        self.route("PUT", base + r"/points", "upsert", self._upsert)
+        self.route("POST", base + r"/points/search", "search", self._search)
+        self.route("POST", base + r"/points/search/batch", "batch", self._batch)
+        self.route("POST", base + r"/points/search/groups", "groups", self._groups)
+        self.route("POST", base + r"/points/count", "count", self._count)
+
+    def seed(self, collection: str, points: Iterable[Json]) -> None:
+        with self._lock:
+            self._put(collection, points)
+
+    def _put(self, collection: str, points: Iterable[Json]) -> int:
+        store = self.collections.setdefault(collection, {})
+        n = 0
+        for p in points:
+            vec = p.get("vector")
+            if isinstance(vec, dict):  # named vectors: use the first one
+                vec = next(iter(vec.values()))
+            unit = _normalize(list(vec))
+            nonzero = [(i, x) for i, x in enumerate(unit) if x]
+            store[str(p["id"])] = (nonzero, dict(p.get("payload") or {}))
+            n += 1
+        return n
+
+    def _ok(self, result: Any) -> tuple[int, Any]:
+        return 200, {"result": result, "status": "ok", "time": 0.0}
+
+    def _missing(self, name: str) -> tuple[int, Any]:
+        return 404, {"status": {"error": f"Collection `{name}` doesn't exist!"}}
+
+    def _create(self, m: re.Match[str], text: str, query: str) -> tuple[int, Any]:
+        with self._lock:
+            self.collections.setdefault(m.group(1), {})
+        return self._ok(True)
+
+    def _info(self, m: re.Match[str], text: str, query: str) -> tuple[int, Any]:
+        store = self.collections.get(m.group(1))
+        if store is None:
+            return self._missing(m.group(1))
+        return self._ok({"status": "green", "points_count": len(store)})
+
+    def _upsert(self, m: re.Match[str], text: str, query: str) -> tuple[int, Any]:
+        with self._lock:
+            self._put(m.group(1), _json(text).get("points") or [])
+        return self._ok({"operation_id": 0, "status": "completed"})
+
+    def _count(self, m: re.Match[str], text: str, query: str) -> tuple[int, Any]:
+        store = self.collections.get(m.group(1))
+        if store is None:
+            return self._missing(m.group(1))
+        flt = _json(text).get("filter")
+        n = sum(1 for _, p in store.values() if _filter_ok(p, flt))
+        return self._ok({"count": n})
+
+    def _scored(self, collection: str, req: Json) -> list[tuple[float, str, Json]]:
+        store = self.collections.get(collection) or {}
+        vec = req.get("vector")
+        if isinstance(vec, dict):
+            vec = vec.get("vector")
+        q = _normalize(list(vec or []))
+        flt = req.get("filter")
+        threshold = req.get("score_threshold")
+        out: list[tuple[float, str, Json]] = []
+        for pid, (v, payload) in store.items():
+            if not _filter_ok(payload, flt):
+                continue
+            s = sum(q[i] * x for i, x in v if i < len(q))
+            if threshold is None or s >= threshold:
+                out.append((s, pid, payload))
+        out.sort(key=lambda x: (-x[0], x[1]))
+        return out
+
+    def _point(self, score: float, pid: str, payload: Json, req: Json) -> Json:
+        p: Json = {"id": pid, "version": 0, "score": score}
+        wp = req.get("with_payload")
+        if wp:
+            p["payload"] = payload if wp is True else _filter_source(payload, wp)
+        return p
+
+    def search(self, collection: str, req: Json) -> list[Json]:
+        offset = int(req.get("offset") or 0)
+        limit = int(req.get("limit") or 10)
+        hits = self._scored(collection, req)[offset : offset + limit]
+        return [self._point(s, pid, payload, req) for s, pid, payload in hits]
+
+    def _search(self, m: re.Match[str], text: str, query: str) -> tuple[int, Any]:
+        if m.group(1) not in self.collections:
+            return self._missing(m.group(1))
+        return self._ok(self.search(m.group(1), _json(text)))
+
+    def _batch(self, m: re.Match[str], text: str, query: str) -> tuple[int, Any]:
+        if m.group(1) not in self.collections:
+            return self._missing(m.group(1))
+        searches = _json(text).get("searches") or []
+        return self._ok([self.search(m.group(1), s) for s in searches])
+
+    def _groups(self, m: re.Match[str], text: str, query: str) -> tuple[int, Any]:
+        if m.group(1) not in self.collections:
+            return self._missing(m.group(1))
+        req = _json(text)
+        key = str(req["group_by"])
+        limit = int(req.get("limit") or 10)
+        size = int(req.get("group_size") or 1)
+        groups: dict[Any, list[Json]] = {}
+        for s, pid, payload in self._scored(m.group(1), req):
+            gid = payload.get(key)
+            if gid is None:
+                continue
+            if gid not in groups and len(groups) >= limit:
+                continue
+            hits = groups.setdefault(gid, [])
+            if len(hits) < size:
+                hits.append(self._point(s, pid, payload, req))
+        return self._ok(
+            {"groups": [{"id": gid, "hits": hits} for gid, hits in groups.items()]}
+        )
+
+
+# ----------------------------
+# Embeddings
+# ----------------------------
+
+
+@lru_cache(maxsize=65536)
+def _token_slot(token: str, dim: int) -> int:
+    h = hashlib.blake2b(token.encode("utf-8"), digest_size=8).digest()
+    return int.from_bytes(h, "big") % dim
+
+
+def hashed_embedding(text: str, dim: int) -> list[float]:
+    """
+    Deterministic bag-of-words vector: texts sharing terms are close.
+
+    Counts are unsigned so a shared term always yields a positive similarity
+    (signed feature hashing can cancel it out on collisions).
+    """
+    v = [0.0] * dim
+    for tok in tokenize(text):
+        v[_token_slot(tok, dim)] += 1.0
+    return _normalize(v)
+
+
+class FakeEmbeddings(_FakeServer):
+    """`POST /embeddings {"model", "texts"}` -> `{"vectors": [...]}`."""
+
+    name = "fake-embeddings"
+
+    def __init__(self, *, dim: int = 64, **kwargs: Any) -> None:
+        super().__init__(**kwargs)
+        self.dim = dim
+        self.route("POST", r"/embeddings", "embeddings", self._embed)
+
+    def _embed(self, m: re.Match[str], text: str, query: str) -> tuple[int, Any]:
+        texts = _json(text).get("texts") or []
+        return 200, {"vectors": [hashed_embedding(str(t), self.dim) for t in texts]}
+
+
+# ----------------------------
+# Wiring
+# ----------------------------
+
+
+@dataclass
+class FakeSearchStack:
+    """The three fakes together, seeded from the same segment documents."""
+
+    opensearch: FakeOpenSearch
+    qdrant: FakeQdrant
+    embeddings: FakeEmbeddings
+    index: str = "narralytica-segments-v1"
+    collection: str = "narralytica-segments-v1"
+
+    @classmethod
+    def create(
+        cls,
+        *,
+        latency: Latency | None = None,
+        opensearch_latency: Latency | None = None,
+        qdrant_latency: Latency | None = None,
+        embeddings_latency: Latency | None = None,
+        dim: int = 64,
+    ) -> FakeSearchStack:
+        return cls(
+            opensearch=FakeOpenSearch(latency=opensearch_latency or latency),
+            qdrant=FakeQdrant(latency=qdrant_latency or latency),
+            embeddings=FakeEmbeddings(dim=dim, latency=embeddings_latency or latency),
+        )
+
+    def seed_segments(self, docs: Iterable[Json]) -> int:
+        """Index segment docs (need `segment_id` and `text`) in both stores."""
+        os_docs: list[tuple[str, Json]] = []
+        points: list[Json] = []
+        for d in docs:
+            sid = str(d["segment_id"])
+            os_docs.append((sid, d))
+            payload = {k: v for k, v in d.items() if k != "text"}
+            points.append(
+                {
+                    "id": sid,
+                    "vector": hashed_embedding(
+                        str(d.get("text") or ""), self.embeddings.dim
+                    ),
+                    "payload": payload,
+                }
+            )
+        self.opensearch.seed(self.index, os_docs)
+        self.qdrant.seed(self.collection, points)
+        return len(os_docs)
+
+    def env(self) -> dict[str, str]:
+        """Environment variables pointing the API at this stack."""
+        return {
+            "OPENSEARCH_URL": self.opensearch.url,
+            "OPENSEARCH_SEGMENTS_INDEX": self.index,
+            "QDRANT_URL": self.qdrant.url,
+            "QDRANT_SEGMENTS_COLLECTION": self.collection,
+            "EMBEDDINGS_URL": self.embeddings.url,
+            "EMBEDDING_VECTOR_SIZE": str(self.embeddings.dim),
+        }
+
+    def start(self) -> FakeSearchStack:
+        for s in (self.opensearch, self.qdrant, self.embeddings):
+            s.start()
+        return self
+
+    def stop(self) -> None:
+        for s in (self.opensearch, self.qdrant, self.embeddings):
+            s.stop()
+
+    def __enter__(self) -> FakeSearchStack:
+        return self.start()
+
+    def __exit__(self, *exc: object) -> None:
+        self.stop()
+
+
+def main(argv: list[str] | None = None) -> int:
+    p = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    p.add_argument("--segments", type=int, default=10_000)
+    p.add_argument("--topics", type=int, default=50)
+    p.add_argument("--latency-ms", type=float, default=0.0)
+    p.add_argument("--jitter-ms", type=float, default=0.0)
+    p.add_argument("--error-rate", type=float, default=0.0)
+    p.add_argument("--dim", type=int, default=64)
+    p.add_argument("--seed", type=int, default=42)
+    args = p.parse_args(argv)
+
+    from search_bench import build_corpus  # sibling script
+
+    corpus = build_corpus(
+        segments=args.segments,
+        topics=args.topics,
+        segments_per_video=50,
+        seed=args.seed,
+    )
+    stack = FakeSearchStack.create(
+        latency=Latency(args.latency_ms, args.jitter_ms, args.error_rate), dim=args.dim
+    )
+    stack.seed_segments(corpus.sources)
+    stack.start()
+
+    print(f"seeded {len(corpus)} segments; point the API at the fakes with:\n")
+    for k, v in stack.env().items():
+        print(f"export {k}={v}")
+    print("\nCtrl-C to stop.")
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        stack.stop()
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,748 @@
+#!/usr/bin/env python3
+"""
+Offline search benchmark: throughput, per-stage latency and relevance.
+
+Seeds a synthetic segment corpus in memory, stands it in for OpenSearch and
+Qdrant by replacing the search route's backend functions, then replays a
+query log through `routes.search._run_search` in every mode and reports:
+
+- QPS per mode
+- p50 / p95 / p99 per pipeline stage (plan, lexical, vector, merge, mget,
+  build, hydrate) and end to end
+- recall@k and nDCG@k against graded labels derived from the corpus
+
+Results can be written as JSON (`--json`) and compared with a previous run
+(`--baseline`), so speed or quality regressions show up per commit.
+
+Examples:
+  python tools/benchmarks/search_bench.py
+  python tools/benchmarks/search_bench.py --segments 1000000 --queries 2000
+  python tools/benchmarks/search_bench.py --json bench.json --baseline main.json
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import math
+import os
+import random
+import subprocess
+import sys
+import threading
+import time
+from collections import Counter, defaultdict
+from collections.abc import Callable, Iterator
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any
+
+MODES = ("lexical", "semantic", "hybrid")
+
+# Stage name -> function in routes.search called by `_run_search`.
+STAGES = {
+    "plan": "_plan_search",
+    "lexical": "_opensearch_search",
+    "vector": "vector_search",
+    "merge": "_merge_page",
+    "mget": "_opensearch_mget",
+    "build": "_build_response",
+    "hydrate": "_hydrate_entities",
+}
+
+LANGUAGES = ("en", "fr", "es")
+SYLLABLES = (
+    "ka ri mo ne lu ta si vo pe da gu fi zo ha be xi ly no wa qu ".split()
+    + "ar el in on ur sta pro vel mar tor lin den cas ber".split()
+)
+
+
+def _repo_root() -> Path:
+    cur = Path(__file__).resolve()
+    for p in [cur] + list(cur.parents):
+        if (p / "services").exists() and (p / "packages").exists():
+            return p
+    raise RuntimeError("Could not locate repo root (expected services/ and packages/).")
+
+
+# ----------------------------
+# Synthetic corpus
+# ----------------------------
+
+
+def _tokenize(text: str) -> list[str]:
+    return [t for t in text.lower().split() if t]
+
+
+@dataclass
+class Corpus:
+    """
+    Segments grouped into videos; each video talks about one topic.
+
+    Texts mix topic words with common filler words, so lexical matches,
+    topical (semantic) matches and non-matches are all well defined.
+    """
+
+    ids: list[str] = field(default_factory=list)
+    sources: list[dict[str, Any]] = field(default_factory=list)
+    tokens: list[tuple[str, ...]] = field(default_factory=list)
+    topics: list[int] = field(default_factory=list)
+    topic_words: list[list[str]] = field(default_factory=list)
+    word_topic: dict[str, int] = field(default_factory=dict)
+    postings: dict[str, list[int]] = field(default_factory=dict)
+    by_topic: dict[int, list[int]] = field(default_factory=dict)
+    index_of: dict[str, int] = field(default_factory=dict)
+    avg_len: float = 0.0
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+
+def _make_words(rng: random.Random, n: int, taken: set[str]) -> list[str]:
+    out: list[str] = []
+    while len(out) < n:
+        w = "".join(rng.choice(SYLLABLES) for _ in range(rng.randint(2, 4)))
+        if w not in taken:
+            taken.add(w)
+            out.append(w)
+    return out
+
+
+def build_corpus(
+    *,
+    segments: int,
+    topics: int,
+    segments_per_video: int,
+    seed: int,
+) -> Corpus:
+    rng = random.Random(seed)
+    c = Corpus()
+
+    taken: set[str] = set()
+    common = _make_words(rng, 300, taken)
+    for t in range(topics):
+        words = _make_words(rng, 40, taken)
+        c.topic_words.append(words)
+        for w in words:
+            c.word_topic[w] = t
+
+    postings: dict[str, list[int]] = defaultdict(list)
+    by_topic: dict[int, list[int]] = defaultdict(list)
+    total_len = 0
+
+    for i in range(segments):
+        video_n = i // segments_per_video
+        seg_index = i % segments_per_video
+        topic = (video_n * 7919) % topics
+        words = c.topic_words[topic]
+
+        n = rng.randint(6, 16)
+        toks = tuple(
+            # Zipf-ish: the first topic words are the most frequent ones.
+            words[min(int(rng.expovariate(1 / 8)), len(words) - 1)]
+            if rng.random() < 0.6
+            else rng.choice(common)
+            for _ in range(n)
+        )
+        sid = f"seg_{i:08d}"
+        video_id = f"vid_{video_n:06d}"
+
+        c.ids.append(sid)
+        c.tokens.append(toks)
+        c.topics.append(topic)
+        c.index_of[sid] = i
+        c.sources.append(
+            {
+                "segment_id": sid,
+                "video_id": video_id,
+                "transcript_id": f"tr_{video_n:06d}",
+                "speaker_id": f"spk_{video_n % 997:04d}",
+                "segment_index": seg_index,
+                "start_ms": seg_index * 5000,
+                "end_ms": seg_index * 5000 + 4800,
+                "text": " ".join(toks),
+                "language": LANGUAGES[video_n % len(LANGUAGES)],
+                "source": "youtube",
+            }
+        )
+        for tok in set(toks):
+            postings[tok].append(i)
+        by_topic[topic].append(i)
+        total_len += n
+
+    c.postings = dict(postings)
+    c.by_topic = dict(by_topic)
+    c.avg_len = total_len / max(1, segments)
+    return c
+
+
+# ----------------------------
+# Backend stand-ins
+# ----------------------------
+
+
+def _term_filters(filters: list[dict[str, Any]]) -> dict[str, str]:
+    out: dict[str, str] = {}
+    for f in filters:
+        term = f.get("term") if isinstance(f, dict) else None
+        if isinstance(term, dict):
+            out.update({str(k): str(v) for k, v in term.items()})
+    return out
+
+
+def _passes(src: dict[str, Any], terms: dict[str, str]) -> bool:
+    return all(str(src.get(k)) == v for k, v in terms.items())
+
+
+class FakeLexical:
+    """BM25 over the corpus, AND semantics, answering build_lexical_query bodies."""
+
+    def __init__(self, corpus: Corpus, k1: float = 1.2, b: float = 0.75) -> None:
+        self.c = corpus
+        self.k1 = k1
+        self.b = b
+
+    def match(self, terms: list[str]) -> list[int]:
+        lists = [self.c.postings.get(t) for t in dict.fromkeys(terms)]
+        if not lists or any(x is None for x in lists):
+            return []
+        lists.sort(key=len)  # type: ignore[arg-type]
+        cand = set(lists[0])  # type: ignore[arg-type]
+        for other in lists[1:]:
+            cand.intersection_update(other)  # type: ignore[arg-type]
+        return sorted(cand)
+
+    def score(self, doc: int, terms: list[str]) -> float:
+        n = len(self.c)
+        toks = self.c.tokens[doc]
+        tf = Counter(toks)
+        norm = self.k1 * (1 - self.b + self.b * len(toks) / self.c.avg_len)
+        s = 0.0
+        for t in dict.fromkeys(terms):
+            df = len(self.c.postings.get(t) or ())
+            idf = math.log(1 + (n - df + 0.5) / (df + 0.5))
+            f = tf.get(t, 0)
+            s += idf * f * (self.k1 + 1) / (f + norm)
+        return s
+
+    def search(self, body: dict[str, Any]) -> dict[str, Any]:
+        size = int(body.get("size") or 10)
+        from_ = int(body.get("from") or 0)
+        query_text, filters = _unpack_query(body.get("query") or {})
+        terms = _term_filters(filters)
+        words = _tokenize(query_text) if query_text else []
+
+        if words:
+            scored = [
+                (self.score(d, words), d)
+                for d in self.match(words)
+                if _passes(self.c.sources[d], terms)
+            ]
+        else:
+            scored = []
+            for d, src in enumerate(self.c.sources):
+                if _passes(src, terms):
+                    scored.append((1.0, d))
+                    if len(scored) >= from_ + size:
+                        break
+
+        scored.sort(key=lambda x: (-x[0], self.c.ids[x[1]]))
+        hits = [
+            {"_id": self.c.ids[d], "_score": s, "_source": self.c.sources[d]}
+            for s, d in scored[from_ : from_ + size]
+        ]
+        return {"hits": {"total": {"value": len(scored)}, "hits": hits}}
+
+    def mget(self, ids: list[str]) -> dict[str, dict]:
+        out: dict[str, dict] = {}
+        for sid in ids:
+            i = self.c.index_of.get(sid)
+            if i is not None:
+                out[sid] = self.c.sources[i]
+        return out
+
+
+def _unpack_query(q: dict[str, Any]) -> tuple[str | None, list[dict[str, Any]]]:
+    b = q.get("bool")
+    if not isinstance(b, dict):
+        return None, []
+    text: str | None = None
+    for m in b.get("must") or []:
+        mm = m.get("multi_match") if isinstance(m, dict) else None
+        if isinstance(mm, dict):
+            text = str(mm.get("query") or "")
+    return text, list(b.get("filter") or [])
+
+
+class FakeVector:
+    """
+    Stand-in for embeddings + Qdrant: texts embed to a sparse topic histogram,
+    nearest neighbours are scored by cosine plus a small term-overlap signal.
+    """
+
+    def __init__(self, corpus: Corpus) -> None:
+        self.c = corpus
+
+    def embed(self, words: list[str]) -> dict[int, float]:
+        hist = Counter(self.c.word_topic[w] for w in words if w in self.c.word_topic)
+        norm = math.sqrt(sum(v * v for v in hist.values())) or 1.0
+        return {k: v / norm for k, v in hist.items()}
+
+    def search(
+        self, query_text: str, filters: dict | None, top_k: int
+    ) -> list[tuple[str, float]]:
+        words = _tokenize(query_text)
+        qv = self.embed(words)
+        qset = set(words)
+        terms = {k: str(v) for k, v in (filters or {}).items() if v is not None}
+
+        scored: list[tuple[float, int]] = []
+        for topic, w in qv.items():
+            for d in self.c.by_topic.get(topic, ()):
+                if terms and not _passes(self.c.sources[d], terms):
+                    continue
+                toks = self.c.tokens[d]
+                on_topic = sum(1 for t in toks if self.c.word_topic.get(t) == topic)
+                overlap = len(qset.intersection(toks)) / max(1, len(qset))
+                scored.append((w * on_topic / len(toks) + 0.1 * overlap, d))
+
+        scored.sort(key=lambda x: (-x[0], x[1]))
+        return [(self.c.ids[d], s) for s, d in scored[:top_k]]
+
+
+# ----------------------------
+# Relevance labels
+# ----------------------------
+
+
+def label(corpus: Corpus, lex: FakeLexical, query: dict[str, Any]) -> dict[str, int]:
+    """
+    Graded labels for a query: 2 = contains every query term, 1 = same topic.
+
+    Only grade-2 ids are materialised; grade-1 counts are implied by the topic
+    size and used when computing the ideal DCG.
+    """
+    words = _tokenize(query["query"])
+    terms = {k: str(v) for k, v in (query.get("filters") or {}).items()}
+    return {
+        corpus.ids[d]: 2 for d in lex.match(words) if _passes(corpus.sources[d], terms)
+    }
+
+
+def _query_topic(corpus: Corpus, words: list[str]) -> int | None:
+    hist = Counter(corpus.word_topic[w] for w in words if w in corpus.word_topic)
+    return hist.most_common(1)[0][0] if hist else None
+
+
+def grade(corpus: Corpus, query: dict[str, Any], sid: str) -> int:
+    rel = query["_labels"]
+    if sid in rel:
+        return rel[sid]
+    i = corpus.index_of.get(sid)
+    if i is not None and corpus.topics[i] == query["_topic"]:
+        return 1
+    return 0
+
+
+def quality(
+    corpus: Corpus, query: dict[str, Any], ranked: list[str], k: int
+) -> tuple[float, float]:
+    """(recall@k over grade-2 docs capped at k, nDCG@k with gains 2^g - 1)."""
+    top = ranked[:k]
+    gains = [grade(corpus, query, sid) for sid in top]
+
+    n2 = sum(1 for g in query["_labels"].values() if g == 2)
+    recall = sum(1 for g in gains if g == 2) / min(n2, k) if n2 else float(not top)
+
+    dcg = sum((2**g - 1) / math.log2(i + 2) for i, g in enumerate(gains))
+    topic_size = len(corpus.by_topic.get(query["_topic"], ()))
+    n1 = max(0, topic_size - n2)
+    ideal = ([2] * n2 + [1] * n1)[:k]
+    idcg = sum((2**g - 1) / math.log2(i + 2) for i, g in enumerate(ideal))
+    return recall, (dcg / idcg if idcg else 0.0)
+
+
+# ----------------------------
+# Query log
+# ----------------------------
+
+
+def synthetic_queries(corpus: Corpus, n: int, seed: int) -> list[dict[str, Any]]:
+    rng = random.Random(seed + 1)
+    out: list[dict[str, Any]] = []
+    for _ in range(n):
+        topic = rng.randrange(len(corpus.topic_words))
+        words = corpus.topic_words[topic]
+        picked = rng.sample(words[:20], rng.randint(1, 3))
+        q: dict[str, Any] = {"query": " ".join(picked)}
+        if rng.random() < 0.2:
+            q["filters"] = {"language": rng.choice(LANGUAGES)}
+        out.append(q)
+    return out
+
+
+def load_queries(path: Path) -> list[dict[str, Any]]:
+    """JSONL, one `{"query": ..., "filters": {...}?, "relevant": {...}?}` per line."""
+    out: list[dict[str, Any]] = []
+    for line in path.read_text(encoding="utf-8").splitlines():
+        line = line.strip()
+        if line:
+            out.append(json.loads(line))
+    return out
+
+
+# ----------------------------
+# Instrumentation
+# ----------------------------
+
+
+class StageTimer:
+    """Thread-safe per-stage latency samples (seconds)."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self.samples: dict[str, list[float]] = defaultdict(list)
+
+    def record(self, stage: str, dt: float) -> None:
+        with self._lock:
+            self.samples[stage].append(dt)
+
+    def wrap(self, stage: str, fn: Callable[..., Any]) -> Callable[..., Any]:
+        def timed(*args: Any, **kwargs: Any) -> Any:
+            start = time.perf_counter()
+            try:
+                return fn(*args, **kwargs)
+            finally:
+                self.record(stage, time.perf_counter() - start)
+
+        return timed
+
+    def reset(self) -> None:
+        with self._lock:
+            self.samples.clear()
+
+
+def percentile(values: list[float], q: float) -> float:
+    if not values:
+        return 0.0
+    s = sorted(values)
+    idx = max(0, min(len(s) - 1, math.ceil(q * len(s)) - 1))
+    return s[idx]
+
+
+@contextmanager
+def patched_backends(
+    search_module: Any, corpus: Corpus, timer: StageTimer, *, in_process: bool
+) -> Iterator[None]:
+    """
+    Time every pipeline stage. With `in_process`, backend calls are answered
+    by FakeLexical/FakeVector; otherwise they go over HTTP to whatever the
+    OPENSEARCH_URL / QDRANT_URL / EMBEDDINGS_URL env points at.
+    """
+    from services.api.src.search.qdrant.vector_search import VectorHit
+
+    lex = FakeLexical(corpus)
+    vec = FakeVector(corpus)
+
+    def opensearch_search(body: dict[str, Any]) -> Any:
+        return search_module._parse_search_hits(lex.search(body))
+
+    def vector_search(
+        *,
+        query_text: str,
+        filters: dict | None,
+        top_k: int | None,
+        group_by: str | None = None,
+        group_size: int | None = None,
+    ) -> list[VectorHit]:
+        hits = vec.search(query_text, filters, int(top_k or 10))
+        return [VectorHit(segment_id=sid, score=s) for sid, s in hits]
+
+    replacements: dict[str, Any] = {"get_search_lookup": lambda: None}
+    if in_process:
+        replacements.update(
+            {
+                "_opensearch_search": opensearch_search,
+                "_opensearch_mget": lex.mget,
+                "vector_search": vector_search,
+            }
+        )
+    saved = {
+        name: getattr(search_module, name)
+        for name in set(replacements) | set(STAGES.values())
+    }
+    try:
+        for name, fn in replacements.items():
+            setattr(search_module, name, fn)
+        for stage, name in STAGES.items():
+            setattr(
+                search_module, name, timer.wrap(stage, getattr(search_module, name))
+            )
+        yield
+    finally:
+        for name, fn in saved.items():
+            setattr(search_module, name, fn)
+
+
+# ----------------------------
+# Runner
+# ----------------------------
+
+
+def run_mode(
+    search_module: Any,
+    corpus: Corpus,
+    queries: list[dict[str, Any]],
+    *,
+    mode: str,
+    limit: int,
+    concurrency: int,
+    warmup: int,
+    in_process: bool = True,
+) -> dict[str, Any]:
+    timer = StageTimer()
+
+    def one(q: dict[str, Any]) -> tuple[dict[str, Any], list[str]]:
+        req = search_module.SearchRequestV1(
+            query=q["query"], filters=q.get("filters"), mode=mode, limit=limit
+        )
+        start = time.perf_counter()
+        resp = search_module._run_search(req)
+        timer.record("total", time.perf_counter() - start)
+        return q, [it.segment.id for it in resp.items]
+
+    with patched_backends(search_module, corpus, timer, in_process=in_process):
+        for q in queries[:warmup]:
+            one(q)
+        timer.reset()
+
+        start = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=max(1, concurrency)) as pool:
+            results = list(pool.map(one, queries))
+        wall = time.perf_counter() - start
+
+    recalls: list[float] = []
+    ndcgs: list[float] = []
+    for q, ranked in results:
+        r, n = quality(corpus, q, ranked, limit)
+        recalls.append(r)
+        ndcgs.append(n)
+
+    stages = {
+        stage: {
+            "p50_ms": percentile(v, 0.50) * 1000,
+            "p95_ms": percentile(v, 0.95) * 1000,
+            "p99_ms": percentile(v, 0.99) * 1000,
+            "mean_ms": (sum(v) / len(v)) * 1000 if v else 0.0,
+        }
+        # Pipeline order, end to end last.
+        for stage in [*STAGES, "total"]
+        if (v := timer.samples.get(stage))
+    }
+    return {
+        "queries": len(queries),
+        "qps": len(queries) / wall if wall > 0 else 0.0,
+        "stages": stages,
+        "quality": {
+            f"recall@{limit}": sum(recalls) / max(1, len(recalls)),
+            f"ndcg@{limit}": sum(ndcgs) / max(1, len(ndcgs)),
+        },
+    }
+
+
+def _git_commit(root: Path) -> str | None:
+    try:
+        out = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            cwd=root,
+            capture_output=True,
+            text=True,
+            check=True,
+        )
+    except (OSError, subprocess.CalledProcessError):
+        return None
+    return out.stdout.strip() or None
+
+
+def compare(
+    current: dict[str, Any],
+    baseline: dict[str, Any],
+    *,
+    latency_tolerance: float,
+    quality_tolerance: float,
+) -> list[str]:
+    """Human-readable regressions of `current` against `baseline`."""
+    out: list[str] = []
+    for mode, cur in current["modes"].items():
+        base = (baseline.get("modes") or {}).get(mode)
+        if not base:
+            continue
+        if cur["qps"] < base["qps"] * (1 - latency_tolerance):
+            out.append(f"{mode}: qps {cur['qps']:.1f} < baseline {base['qps']:.1f}")
+        cur_p95 = cur["stages"].get("total", {}).get("p95_ms", 0.0)
+        base_p95 = base["stages"].get("total", {}).get("p95_ms", 0.0)
+        if base_p95 and cur_p95 > base_p95 * (1 + latency_tolerance):
+            out.append(f"{mode}: total p95 {cur_p95:.2f}ms > baseline {base_p95:.2f}ms")
+        for metric, value in cur["quality"].items():
+            prev = base.get("quality", {}).get(metric)
+            if prev is not None and value < prev - quality_tolerance:
+                out.append(f"{mode}: {metric} {value:.4f} < baseline {prev:.4f}")
+    return out
+
+
+def print_report(report: dict[str, Any]) -> None:
+    cfg = report["config"]
+    print(
+        f"corpus={cfg['segments']} segments, {cfg['topics']} topics; "
+        f"queries={cfg['queries']} concurrency={cfg['concurrency']} "
+        f"commit={report.get('commit') or '-'}"
+    )
+    for mode, r in report["modes"].items():
+        q = "  ".join(f"{k}={v:.4f}" for k, v in r["quality"].items())
+        print(f"\n[{mode}] qps={r['qps']:.1f}  {q}")
+        print(f"  {'stage':<10}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}")
+        for stage, s in r["stages"].items():
+            print(
+                f"  {stage:<10}{s['p50_ms']:>10.3f}"
+                f"{s['p95_ms']:>10.3f}{s['p99_ms']:>10.3f}"
+            )
+
+
+@contextmanager
+def _backend_stack(args: argparse.Namespace, corpus: Corpus) -> Iterator[None]:
+    """For `--backend http`: serve the corpus from fake HTTP backends."""
+    if args.backend != "http":
+        yield
+        return
+
+    from fake_backends import FakeSearchStack, Latency  # sibling script
+    from services.api.src.search.breaker import reset_breakers
+
+    stack = FakeSearchStack.create(
+        latency=Latency(args.backend_latency_ms, args.backend_jitter_ms)
+    )
+    stack.seed_segments(corpus.sources)
+    saved = {k: os.environ.get(k) for k in stack.env()}
+    with stack:
+        os.environ.update(stack.env())
+        reset_breakers()
+        try:
+            yield
+        finally:
+            for k, v in saved.items():
+                if v is None:
+                    os.environ.pop(k, None)
+                else:
+                    os.environ[k] = v
+
+
+def main(argv: list[str] | None = None) -> int:
+    p = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    p.add_argument("--segments", type=int, default=100_000)
+    p.add_argument("--topics", type=int, default=200)
+    p.add_argument("--segments-per-video", type=int, default=50)
+    p.add_argument("--queries", type=int, default=300)
+    p.add_argument("--query-log", type=Path, help="JSONL query log to replay")
+    p.add_argument("--modes", default=",".join(MODES))
+    p.add_argument("--limit", type=int, default=10, help="page size and k")
+    p.add_argument("--concurrency", type=int, default=1)
+    p.add_argument(
+        "--backend",
+        choices=("inprocess", "http"),
+        default="inprocess",
+        help="http: serve the corpus from fake_backends.py HTTP servers",
+    )
+    p.add_argument("--backend-latency-ms", type=float, default=0.0)
+    p.add_argument("--backend-jitter-ms", type=float, default=0.0)
+    p.add_argument("--warmup", type=int, default=20)
+    p.add_argument("--seed", type=int, default=42)
+    p.add_argument("--json", type=Path, help="write the report as JSON")
+    p.add_argument("--baseline", type=Path, help="previous JSON report")
+    p.add_argument("--latency-tolerance", type=float, default=0.15)
+    p.add_argument("--quality-tolerance", type=float, default=0.01)
+    args = p.parse_args(argv)
+
+    root = _repo_root()
+    if str(root) not in sys.path:
+        sys.path.insert(0, str(root))
+    import services.api.src.routes.search as search_module
+
+    modes = [m.strip() for m in args.modes.split(",") if m.strip()]
+    unknown = sorted(set(modes) - set(MODES))
+    if unknown:
+        p.error(f"unknown modes: {', '.join(unknown)}")
+
+    t0 = time.perf_counter()
+    corpus = build_corpus(
+        segments=args.segments,
+        topics=args.topics,
+        segments_per_video=args.segments_per_video,
+        seed=args.seed,
+    )
+    print(f"seeded {len(corpus)} segments in {time.perf_counter() - t0:.1f}s")
+
+    if args.query_log:
+        queries = load_queries(args.query_log)
+    else:
+        queries = synthetic_queries(corpus, args.queries, args.seed)
+
+    lex = FakeLexical(corpus)
+    for q in queries:
+        q["_topic"] = _query_topic(corpus, _tokenize(q["query"]))
+        q["_labels"] = q.get("relevant") or label(corpus, lex, q)
+
+    with _backend_stack(args, corpus):
+        results = {
+            mode: run_mode(
+                search_module,
+                corpus,
+                queries,
+                mode=mode,
+                limit=args.limit,
+                concurrency=args.concurrency,
+                in_process=args.backend == "inprocess",
+                warmup=min(args.warmup, len(queries)),
+            )
+            for mode in modes
+        }
+
+    report: dict[str, Any] = {
+        "commit": _git_commit(root),
+        "config": {
+            "segments": args.segments,
+            "topics": args.topics,
+            "queries": len(queries),
+            "limit": args.limit,
+            "concurrency": args.concurrency,
+            "backend": args.backend,
+            "seed": args.seed,
+        },
+        "modes": results,
+    }
+    print_report(report)
+
+    if args.json:
+        args.json.write_text(json.dumps(report, indent=2) + "\n", encoding="utf-8")
+
+    if args.baseline:
+        baseline = json.loads(args.baseline.read_text(encoding="utf-8"))
+        regressions = compare(
+            report,
+            baseline,
+            latency_tolerance=args.latency_tolerance,
+            quality_tolerance=args.quality_tolerance,
+        )
+        if regressions:
+            print("\nREGRESSIONS vs baseline " + str(baseline.get("commit") or ""))
+            for r in regressions:
+                print(f"  - {r}")
+            return 1
+        print("\nno regressions vs baseline")
+
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
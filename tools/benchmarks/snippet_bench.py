@@ -0,0 +1,109 @@
+#!/usr/bin/env python3
+"""
+Micro-benchmark for local snippet/highlight generation (search/snippets.py).
+
+Budget: under 50µs per segment at p99, so local highlighting adds nothing
+noticeable to search p99. Exits 1 when the budget is exceeded.
+
+Segments are processed in pages, like a search response. Reports per-segment
+time for cold pages (query pattern compiled for the page) and warm pages
+(pattern cached, as for repeated queries).
+
+  python tools/benchmarks/snippet_bench.py --segments 5000 --budget-us 50
+"""
+
+from __future__ import annotations
+
+import argparse
+import math
+import random
+import sys
+import time
+from pathlib import Path
+
+
+def _repo_root() -> Path:
+    cur = Path(__file__).resolve()
+    for p in [cur] + list(cur.parents):
+        if (p / "services").exists() and (p / "packages").exists():
+            return p
+    raise RuntimeError("Could not locate repo root (expected services/ and packages/).")
+
+
+WORDS = (
+    "the a and of to in that it is was for on are as with they be at this have "
+    "from or one had by word but not what all were we when your can said there "
+    "climate energy policy election market football summit budget vaccine trade "
+    "interview speech debate economy inflation transport housing research"
+).split()
+
+
+def _segment(rng: random.Random, n_words: int) -> str:
+    words = [rng.choice(WORDS) for _ in range(n_words)]
+    words[0] = words[0].capitalize()
+    return " ".join(words) + "."
+
+
+def _pct(values: list[float], q: float) -> float:
+    s = sorted(values)
+    return s[max(0, min(len(s) - 1, math.ceil(q * len(s)) - 1))]
+
+
+def main(argv: list[str] | None = None) -> int:
+    p = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    p.add_argument("--segments", type=int, default=5000)
+    p.add_argument("--min-words", type=int, default=10)
+    p.add_argument("--max-words", type=int, default=80)
+    p.add_argument("--page-size", type=int, default=10)
+    p.add_argument("--budget-us", type=float, default=50.0)
+    p.add_argument("--seed", type=int, default=42)
+    args = p.parse_args(argv)
+
+    root = _repo_root()
+    if str(root) not in sys.path:
+        sys.path.insert(0, str(root))
+    from services.api.src.search import snippets
+
+    rng = random.Random(args.seed)
+    texts = [
+        _segment(rng, rng.randint(args.min_words, args.max_words))
+        for _ in range(args.segments)
+    ]
+    queries = ["climate policy", "energy market inflation", "football", "housing"]
+
+    n = max(1, args.page_size)
+    pages = [texts[i : i + n] for i in range(0, len(texts), n)]
+
+    results: dict[str, list[float]] = {}
+    for label in ("cold", "warm"):
+        samples: list[float] = []
+        for i, page in enumerate(pages):
+            if label == "cold":
+                snippets.query_terms.cache_clear()
+                snippets._terms_pattern.cache_clear()
+            t0 = time.perf_counter()
+            terms = snippets.query_terms(queries[i % len(queries)])
+            for text in page:
+                snippets.make_snippet(text, terms)
+            samples.append((time.perf_counter() - t0) * 1e6 / len(page))
+        results[label] = samples
+
+    print(
+        f"{args.segments} segments, {args.min_words}-{args.max_words} words, "
+        f"pages of {n} (budget {args.budget_us:.0f}µs per segment)"
+    )
+    print(f"  {'':<6}{'p50 µs':>10}{'p95 µs':>10}{'p99 µs':>10}{'max µs':>10}")
+    for label, v in results.items():
+        print(
+            f"  {label:<6}{_pct(v, 0.5):>10.2f}{_pct(v, 0.95):>10.2f}"
+            f"{_pct(v, 0.99):>10.2f}{max(v):>10.2f}"
+        )
+
+    if _pct(results["cold"], 0.99) > args.budget_us:
+        print("FAIL: cold p99 over budget")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())